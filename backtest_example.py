@@ -17,7 +17,12 @@ from nautilus_trader.model.objects import Money
 from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
 from nautilus_trader.test_kit.providers import TestInstrumentProvider
 from nautilus_trader.test_kit.strategies import EMACross
-import pandas as pd
+from datetime import datetime
+
+try:
+    from server.synthetic_data import INSTRUMENTS, SyntheticMarketData, wrangler_frame
+except ImportError:
+    from synthetic_data import INSTRUMENTS, SyntheticMarketData, wrangler_frame
 
 print("="*60)
 print("NautilusTrader Backtest Example")
@@ -62,27 +67,14 @@ engine.add_instrument(instrument)
 print("📈 Generating sample quote data (1 month, 1-minute bars)...")
 def generate_sample_quotes():
     """Generate sample quote data for testing."""
-    dates = pd.date_range("2024-01-01", "2024-01-31", freq="1min")
-    data = []
-    
-    bid = 1.1000
-    ask = 1.1002
-    
-    for i, date in enumerate(dates):
-        # Simple random walk
-        change = (hash(str(date)) % 10 - 5) * 0.0001
-        bid += change
-        ask = bid + 0.0002
-        
-        data.append({
-            "timestamp": date,
-            "bid_price": bid,
-            "ask_price": ask,
-            "bid_size": 1000000,
-            "ask_size": 1000000,
-        })
-    
-    return pd.DataFrame(data)
+    # Seeded GBM quotes from the shared generator, so every run sees the same market
+    data = SyntheticMarketData(
+        instruments=[i for i in INSTRUMENTS if i[1] == "EUR/USD.SIM"],
+        seed=42,
+        start=datetime(2024, 1, 1),
+        end=datetime(2024, 1, 31),
+    )
+    return wrangler_frame(data.quote_ticks(interval=60))
 
 # Load data
 df = generate_sample_quotes()
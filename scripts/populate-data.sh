@@ -34,9 +34,9 @@ echo "🔄 Populating database with test data..."
 echo ""
 
 if [ "$COMPOSE_FILE" = "docker-compose.dev.yml" ]; then
-    docker-compose -f docker-compose.dev.yml exec web python3 server/populate_database.py
+    docker-compose -f docker-compose.dev.yml exec web python3 server/populate_database.py "$@"
 else
-    docker-compose exec web python3 server/populate_database.py
+    docker-compose exec web python3 server/populate_database.py "$@"
 fi
 
 echo ""
@@ -10,6 +10,7 @@ import { createContext } from "./context";
 import { serveStatic, setupVite } from "./vite";
 import { applySecurityMiddleware, sanitizeInput } from "../security_middleware";
 import { generalRateLimit } from "../rate_limit_middleware";
+import { warmUpPythonWorkers } from "./pythonWorker";
 
 function isPortAvailable(port: number): Promise<boolean> {
   return new Promise(resolve => {
@@ -121,6 +122,11 @@ async function startServer() {
   server.listen(port, () => {
     console.log(`Server running on http://localhost:${port}/`);
   });
+
+  // Import the Python managers once up front instead of on the first admin query
+  warmUpPythonWorkers().catch(error => {
+    console.error("Python worker warm-up failed:", error.message);
+  });
 }
 
 startServer().catch(console.error);
@@ -0,0 +1,288 @@
+/**
+ * Pool of long-lived Python workers (server/python_worker.py).
+ *
+ * Each worker imports nautilus_bridge, redis_manager, postgres_manager,
+ * parquet_manager and feature_manager once and serves calls over its own
+ * Unix socket, so an admin query costs a function call instead of an
+ * interpreter startup.
+ *
+ * Quick example:
+ *   const status = await callPython("nautilus_bridge", "get_system_status");
+ *   const rows = await callPython("postgres_manager", "query_postgres_table", ["orders", 50]);
+ */
+import { spawn, type ChildProcess } from "child_process";
+import net from "net";
+import os from "os";
+import path from "path";
+import { fileURLToPath } from "url";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+const projectRoot = path.resolve(__dirname, "../..");
+
+const PYTHON_PATH = process.env.PYTHON_PATH ?? "python3.11";
+const POOL_SIZE = Math.max(1, parseInt(process.env.PYTHON_WORKERS ?? "2", 10) || 2);
+const STARTUP_TIMEOUT_MS = 30_000;
+const DEFAULT_CALL_TIMEOUT_MS = 5_000;
+const HEADER_BYTES = 4;
+
+export type PythonModule =
+  | "nautilus_bridge"
+  | "redis_manager"
+  | "postgres_manager"
+  | "parquet_manager"
+  | "feature_manager"
+  | "nautilus_api"
+  | "backtest_sweep";
+
+export type PythonCallOptions = {
+  kwargs?: Record<string, unknown>;
+  timeoutMs?: number;
+};
+
+type PendingCall = {
+  id: number;
+  payload: Buffer;
+  timeoutMs: number;
+  resolve: (value: unknown) => void;
+  reject: (error: Error) => void;
+};
+
+type WorkerResponse = {
+  id: number | null;
+  ok: boolean;
+  result?: unknown;
+  error?: string;
+};
+
+class PythonWorker {
+  private proc: ChildProcess | null = null;
+  private socket: net.Socket | null = null;
+  private ready: Promise<void> | null = null;
+  private buffer = Buffer.alloc(0);
+  private current: PendingCall | null = null;
+  private timer: NodeJS.Timeout | null = null;
+
+  constructor(private readonly socketPath: string) {}
+
+  get busy(): boolean {
+    return this.current !== null;
+  }
+
+  /** Spawn the worker (once) and connect to its socket. */
+  start(): Promise<void> {
+    if (this.ready) return this.ready;
+
+    this.ready = new Promise<void>((resolve, reject) => {
+      const proc = spawn(PYTHON_PATH, ["-m", "server.python_worker", "--socket", this.socketPath], {
+        cwd: projectRoot,
+        env: { ...process.env, PYTHONUNBUFFERED: "1" },
+        stdio: ["ignore", "pipe", "pipe"],
+      });
+      this.proc = proc;
+
+      const startupTimer = setTimeout(() => {
+        reject(new Error(`Python worker did not start within ${STARTUP_TIMEOUT_MS}ms`));
+        this.reset();
+      }, STARTUP_TIMEOUT_MS);
+
+      let pending = "";
+      let connected = false;
+      proc.stdout?.on("data", (data: Buffer) => {
+        pending += data.toString();
+        const lines = pending.split("\n");
+        pending = lines.pop() ?? "";
+        for (const line of lines) {
+          if (connected || !line.includes('"ready"')) {
+            // Managers print warnings to stdout; keep draining so the pipe never fills
+            if (line.trim()) console.log(`[python_worker ${path.basename(this.socketPath)}] ${line}`);
+            continue;
+          }
+          connected = true;
+          clearTimeout(startupTimer);
+
+          const socket = net.createConnection(this.socketPath);
+          socket.on("connect", () => {
+            this.socket = socket;
+            resolve();
+          });
+          socket.on("data", chunk => this.onData(chunk));
+          socket.on("error", err => {
+            reject(err);
+            this.fail(err);
+          });
+          socket.on("close", () => this.fail(new Error("Python worker connection closed")));
+        }
+      });
+      proc.stderr?.on("data", data => {
+        console.error(`[python_worker ${path.basename(this.socketPath)}] ${data.toString().trimEnd()}`);
+      });
+      proc.on("exit", code => {
+        clearTimeout(startupTimer);
+        reject(new Error(`Python worker exited with code ${code}`));
+        this.fail(new Error(`Python worker exited with code ${code}`));
+      });
+    });
+
+    return this.ready;
+  }
+
+  /** Send one request; the pool guarantees at most one in flight per worker. */
+  async send(call: PendingCall): Promise<void> {
+    // Claim the worker before awaiting so drain() cannot double-book it
+    this.current = call;
+    try {
+      await this.start();
+    } catch (err) {
+      if (this.current === call) this.current = null;
+      throw err;
+    }
+    if (!this.socket) {
+      this.fail(new Error("Python worker is not connected"));
+      return;
+    }
+    this.timer = setTimeout(() => {
+      // A stuck call poisons the connection ordering, so recycle the worker
+      this.fail(new Error(`Python call timed out after ${call.timeoutMs}ms`));
+    }, call.timeoutMs);
+
+    const header = Buffer.alloc(HEADER_BYTES);
+    header.writeUInt32BE(call.payload.length, 0);
+    this.socket.write(Buffer.concat([header, call.payload]));
+  }
+
+  private onData(chunk: Buffer) {
+    this.buffer = Buffer.concat([this.buffer, chunk]);
+    while (this.buffer.length >= HEADER_BYTES) {
+      const length = this.buffer.readUInt32BE(0);
+      if (this.buffer.length < HEADER_BYTES + length) return;
+
+      const body = this.buffer.subarray(HEADER_BYTES, HEADER_BYTES + length);
+      this.buffer = this.buffer.subarray(HEADER_BYTES + length);
+      let response: WorkerResponse;
+      try {
+        response = JSON.parse(body.toString("utf-8")) as WorkerResponse;
+      } catch (err) {
+        // A corrupt or truncated frame: the stream is no longer trustworthy, so fail
+        // the in-flight call and recycle this worker
+        this.fail(new Error(`Malformed response from Python worker: ${(err as Error).message}`));
+        return;
+      }
+      this.settle(response);
+    }
+  }
+
+  private settle(response: WorkerResponse) {
+    const call = this.current;
+    if (!call || response.id !== call.id) return;
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = null;
+    this.current = null;
+
+    if (response.ok) {
+      call.resolve(response.result);
+    } else {
+      call.reject(new Error(response.error ?? "Python worker error"));
+    }
+    pool.drain();
+  }
+
+  private fail(error: Error) {
+    const call = this.current;
+    this.current = null;
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = null;
+    this.reset();
+    call?.reject(error);
+    pool.drain();
+  }
+
+  private reset() {
+    this.socket?.removeAllListeners();
+    this.socket?.destroy();
+    this.socket = null;
+    this.proc?.removeAllListeners();
+    this.proc?.kill();
+    this.proc = null;
+    this.ready = null;
+    this.buffer = Buffer.alloc(0);
+  }
+
+  stop() {
+    this.reset();
+  }
+}
+
+class PythonWorkerPool {
+  private readonly workers: PythonWorker[];
+  private readonly queue: PendingCall[] = [];
+  private nextId = 1;
+
+  constructor(size: number) {
+    const prefix = path.join(os.tmpdir(), `nautilus-worker-${process.pid}`);
+    this.workers = Array.from({ length: size }, (_, i) => new PythonWorker(`${prefix}-${i}.sock`));
+  }
+
+  call<T>(module: PythonModule, fn: string, args: unknown[] = [], options: PythonCallOptions = {}): Promise<T> {
+    return new Promise<T>((resolve, reject) => {
+      const id = this.nextId++;
+      const payload = Buffer.from(
+        JSON.stringify({ id, module, fn, args, kwargs: options.kwargs ?? {} }),
+        "utf-8"
+      );
+      this.queue.push({
+        id,
+        payload,
+        timeoutMs: options.timeoutMs ?? DEFAULT_CALL_TIMEOUT_MS,
+        resolve: resolve as (value: unknown) => void,
+        reject,
+      });
+      this.drain();
+    });
+  }
+
+  /** Hand queued calls to idle workers. */
+  drain() {
+    for (const worker of this.workers) {
+      if (this.queue.length === 0) return;
+      if (worker.busy) continue;
+      const call = this.queue.shift()!;
+      worker.send(call).catch(err => call.reject(err));
+    }
+  }
+
+  /** Start all workers ahead of the first request. */
+  async warmUp(): Promise<void> {
+    await Promise.all(this.workers.map(worker => worker.start()));
+  }
+
+  stop() {
+    for (const worker of this.workers) worker.stop();
+  }
+}
+
+const pool = new PythonWorkerPool(POOL_SIZE);
+
+for (const signal of ["exit", "SIGINT", "SIGTERM"] as const) {
+  process.once(signal, () => {
+    pool.stop();
+    if (signal !== "exit") process.exit(0);
+  });
+}
+
+/**
+ * Call a public function from one of the Python manager modules.
+ * Rejects with the Python error message if the call raises.
+ */
+export function callPython<T = any>(
+  module: PythonModule,
+  fn: string,
+  args: unknown[] = [],
+  options: PythonCallOptions = {}
+): Promise<T> {
+  return pool.call<T>(module, fn, args, options);
+}
+
+export function warmUpPythonWorkers(): Promise<void> {
+  return pool.warmUp();
+}
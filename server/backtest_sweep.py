@@ -0,0 +1,559 @@
+"""
+Backtest Parameter Sweep
+Runs one strategy over a grid or random sample of parameters on a process pool
+"""
+
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from server.synthetic_data import INSTRUMENTS, SyntheticMarketData, wrangler_frame
+except ImportError:
+    from synthetic_data import INSTRUMENTS, SyntheticMarketData, wrangler_frame
+
+DEFAULT_GRID = {
+    "fast_ema_period": [5, 10, 15, 20],
+    "slow_ema_period": [20, 30, 40, 50, 60],
+}
+
+DEFAULT_START = datetime(2024, 1, 1)
+DEFAULT_END = datetime(2024, 1, 31)
+
+DEFAULT_BASE_PATH = '/home/ubuntu/nautilus-data'
+
+# Finished sweep jobs kept on disk for status queries
+MAX_FINISHED_SWEEPS = 20
+
+JOB_ID_RE = re.compile(r"^[0-9a-f]{12}$")
+
+# Per-process state of a pool worker: instrument and ticks, wrangled once
+_worker: Dict[str, Any] = {}
+
+
+def valid_ema_cross(params: Dict[str, Any]) -> bool:
+    """EMACross needs the fast period strictly below the slow one"""
+    fast, slow = params.get("fast_ema_period"), params.get("slow_ema_period")
+    return fast is None or slow is None or fast < slow
+
+
+def parameter_grid(grid: Dict[str, Sequence[Any]],
+                   constraint: Optional[Callable[[Dict[str, Any]], bool]] = valid_ema_cross) -> List[Dict[str, Any]]:
+    """Every combination of the grid values that passes constraint"""
+    names = list(grid)
+    combos = (dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names)))
+    return [params for params in combos if constraint is None or constraint(params)]
+
+
+def random_parameters(space: Dict[str, Any], samples: int, seed: Optional[int] = None,
+                      constraint: Optional[Callable[[Dict[str, Any]], bool]] = valid_ema_cross,
+                      max_attempts: int = 100) -> List[Dict[str, Any]]:
+    """
+    samples distinct parameter sets drawn from space
+
+    A list value is a set of choices; {"min": a, "max": b} is a range, integer when
+    both bounds are ints. Draws failing constraint or repeating are discarded.
+    """
+    rng = random.Random(seed)
+
+    def draw(value):
+        if isinstance(value, dict):
+            low, high = value["min"], value["max"]
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return rng.uniform(low, high)
+        return rng.choice(list(value))
+
+    seen, results = set(), []
+    for _ in range(samples * max_attempts):
+        if len(results) >= samples:
+            break
+        params = {name: draw(value) for name, value in space.items()}
+        key = tuple(sorted(params.items()))
+        if key in seen or (constraint is not None and not constraint(params)):
+            continue
+        seen.add(key)
+        results.append(params)
+    return results
+
+
+def _stat_name(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _numeric_stats(stats: Optional[Dict[str, Any]], prefix: str) -> Dict[str, float]:
+    values = {}
+    for name, value in (stats or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            values[f"{prefix}{_stat_name(name)}"] = float(value)
+    return values
+
+
+def results_table(rows: Sequence[Dict[str, Any]]) -> pa.Table:
+    """Rows as a table over the union of their keys; failed runs carry no stats, and vice versa"""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return pa.Table.from_pylist([{name: row.get(name) for name in columns} for row in rows])
+
+
+def _init_sweep_worker(data_path: str, instrument_symbol: str, starting_balance: int, trade_size: str):
+    """Pool initializer: memory-map the shared quotes and wrangle them once for this process"""
+    # The python worker speaks a framed protocol on stdout; engine output goes to stderr instead
+    os.dup2(2, 1)
+    _worker["starting_balance"] = starting_balance
+    _worker["trade_size"] = Decimal(trade_size)
+    try:
+        from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+        from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+        # Zero-copy: every worker maps the same page-cached file
+        with pa.memory_map(data_path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        instrument = TestInstrumentProvider.default_fx_ccy(instrument_symbol)
+        _worker["instrument"] = instrument
+        _worker["ticks"] = QuoteTickDataWrangler(instrument=instrument).process(wrangler_frame([table]))
+    except Exception as e:
+        # Raising here would make the pool respawn the worker forever; fail its runs instead
+        _worker["error"] = f"Worker setup failed: {e}"
+
+
+def _ema_cross(instrument, bar_type: str, trade_size: Decimal, params: Dict[str, Any]):
+    try:
+        from nautilus_trader.examples.strategies.ema_cross import EMACross, EMACrossConfig
+        from nautilus_trader.model.data import BarType
+        return EMACross(config=EMACrossConfig(
+            instrument_id=instrument.id,
+            bar_type=BarType.from_str(bar_type),
+            trade_size=trade_size,
+            **params,
+        ))
+    except ImportError:
+        # Older releases ship it with keyword arguments in the test kit
+        from nautilus_trader.test_kit.strategies import EMACross
+        return EMACross(instrument_id=instrument.id, bar_type=bar_type, trade_size=trade_size, **params)
+
+
+def _run_one(task: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """One backtest on the worker's preloaded ticks; failures are reported, not raised"""
+    run_id, params = task
+    result: Dict[str, Any] = {"run": run_id, **params}
+    started = time.perf_counter()
+    engine = None
+    try:
+        if "error" in _worker:
+            raise RuntimeError(_worker["error"])
+        from nautilus_trader.backtest.engine import BacktestEngine
+        from nautilus_trader.config import BacktestEngineConfig, LoggingConfig
+        from nautilus_trader.model.currencies import USD
+        from nautilus_trader.model.enums import AccountType, OmsType
+        from nautilus_trader.model.identifiers import TraderId, Venue
+        from nautilus_trader.model.objects import Money
+
+        instrument = _worker["instrument"]
+        engine = BacktestEngine(config=BacktestEngineConfig(
+            trader_id=TraderId(f"SWEEP-{run_id:03d}"),
+            logging=LoggingConfig(log_level="ERROR"),
+        ))
+        venue = Venue("SIM")
+        engine.add_venue(
+            venue=venue,
+            oms_type=OmsType.NETTING,
+            account_type=AccountType.MARGIN,
+            base_currency=USD,
+            starting_balances=[Money(_worker["starting_balance"], USD)],
+        )
+        engine.add_instrument(instrument)
+        engine.add_data(_worker["ticks"])
+        engine.add_strategy(_ema_cross(
+            instrument, f"{instrument.id}-1-MINUTE-BID-INTERNAL", _worker["trade_size"], params
+        ))
+        engine.run()
+
+        balance = engine.portfolio.account(venue).balance_total(USD).as_double()
+        analyzer = engine.portfolio.analyzer
+        result.update({
+            "success": True,
+            "final_balance": balance,
+            "pnl": balance - _worker["starting_balance"],
+            "pnl_pct": (balance / _worker["starting_balance"] - 1) * 100,
+            "fills": len(engine.trader.generate_order_fills_report()),
+            "positions": len(engine.trader.generate_positions_report()),
+        })
+        result.update(_numeric_stats(analyzer.get_performance_stats_returns(), "returns_"))
+        result.update(_numeric_stats(analyzer.get_performance_stats_general(), ""))
+    except Exception as e:
+        result.update({"success": False, "error": str(e), "traceback": traceback.format_exc()})
+    finally:
+        if engine is not None:
+            engine.dispose()
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+class ParameterSweep:
+    """
+    EMACross over many parameter sets, one backtest per pool task.
+
+    The quotes are generated once into an Arrow IPC file under base_path/sweeps
+    (reused by later sweeps over the same window). Each worker memory-maps that file
+    and wrangles it into QuoteTicks once when it starts, so a run only pays for the
+    engine itself.
+    """
+
+    def __init__(self, instrument_id: str = "EUR/USD.SIM", start: datetime = DEFAULT_START,
+                 end: datetime = DEFAULT_END, quote_interval: int = 60, seed: int = 42,
+                 base_path: str = DEFAULT_BASE_PATH, workers: Optional[int] = None,
+                 starting_balance: int = 1_000_000, trade_size: str = "100000"):
+        self.instruments = [i for i in INSTRUMENTS if i[1] == instrument_id]
+        if not self.instruments:
+            raise ValueError(f"Unknown instrument: {instrument_id}")
+        self.instrument_id = instrument_id
+        self.start = start
+        self.end = end
+        self.quote_interval = quote_interval
+        self.seed = seed
+        self.base_path = base_path
+        self.workers = workers or os.cpu_count() or 1
+        self.starting_balance = starting_balance
+        self.trade_size = trade_size
+
+    @property
+    def data_path(self) -> str:
+        name = "{}_{:%Y%m%d%H%M}_{:%Y%m%d%H%M}_{}s_seed{}.arrow".format(
+            self.instrument_id.replace("/", "").replace(".", "-"),
+            self.start, self.end, self.quote_interval, self.seed,
+        )
+        return os.path.join(self.base_path, "sweeps", name)
+
+    def prepare_data(self) -> str:
+        """Write the quotes the workers share, unless an earlier sweep already did"""
+        path = self.data_path
+        if os.path.exists(path):
+            return path
+        data = SyntheticMarketData(instruments=self.instruments, seed=self.seed, start=self.start, end=self.end)
+        table = pa.concat_tables(list(data.quote_ticks(interval=self.quote_interval)))
+        # Floats on disk so the workers' wrangler frames stay views over the mapped pages
+        table = pa.table({
+            "timestamp": table.column("timestamp"),
+            **{name: table.column(name).cast(pa.float64())
+               for name in ("bid_price", "ask_price", "bid_size", "ask_size")},
+        })
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + ".tmp"
+        with pa.OSFile(partial, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(partial, path)
+        return path
+
+    def run(self, configs: Sequence[Dict[str, Any]],
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+            cancelled: Optional[Callable[[], bool]] = None) -> pa.Table:
+        """
+        Backtest every parameter set; one results row per run, in run order
+
+        on_result is called with each row as it finishes. When cancelled() turns true
+        (checked after every finished run) the pool is terminated and the rows so far
+        are returned.
+        """
+        if not configs:
+            return pa.table({})
+        data_path = self.prepare_data()
+        symbol = self.instrument_id.split(".")[0]
+        workers = min(self.workers, len(configs))
+        # spawn: the parent may already hold nautilus' native runtime, which does not survive fork
+        context = multiprocessing.get_context("spawn")
+        rows = []
+        # Leaving the block terminates the pool, including runs still in flight
+        with context.Pool(workers, initializer=_init_sweep_worker,
+                          initargs=(data_path, symbol, self.starting_balance, self.trade_size)) as pool:
+            for row in pool.imap_unordered(_run_one, list(enumerate(configs))):
+                rows.append(row)
+                if on_result is not None:
+                    on_result(row)
+                if cancelled is not None and cancelled():
+                    break
+        rows.sort(key=lambda row: row["run"])
+        return results_table(rows)
+
+    def save(self, results: pa.Table) -> str:
+        """Write results under base_path/backtests, next to the other backtest Parquet files"""
+        directory = os.path.join(self.base_path, "backtests")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"sweep_{datetime.now():%Y%m%d_%H%M%S}.parquet")
+        pq.write_table(results.drop_columns(
+            [c for c in ("traceback",) if c in results.column_names]
+        ), path)
+        return path
+
+
+def _sweep_and_configs(grid: Optional[Dict[str, Sequence[Any]]], space: Optional[Dict[str, Any]],
+                       samples: int, workers: Optional[int], instrument_id: str, start: Optional[str],
+                       end: Optional[str], seed: int,
+                       base_path: Optional[str]) -> Tuple[ParameterSweep, List[Dict[str, Any]]]:
+    sweep = ParameterSweep(
+        instrument_id=instrument_id,
+        start=datetime.fromisoformat(start) if start else DEFAULT_START,
+        end=datetime.fromisoformat(end) if end else DEFAULT_END,
+        seed=seed,
+        base_path=base_path or DEFAULT_BASE_PATH,
+        workers=workers,
+    )
+    configs = random_parameters(space, samples, seed) if space else parameter_grid(grid or DEFAULT_GRID)
+    return sweep, configs
+
+
+def _summary(sweep: ParameterSweep, configs: Sequence[Dict[str, Any]], results: pa.Table,
+             sort_by: str, save: bool, seconds: float) -> Dict[str, Any]:
+    ordered = results
+    if sort_by in results.column_names:
+        ordered = results.sort_by([(sort_by, "descending")])
+    rows = [{k: v for k, v in row.items() if k != "traceback"} for row in ordered.to_pylist()]
+    succeeded = [row for row in rows if row.get("success")]
+    return {
+        "success": True,
+        "runs": len(rows),
+        "failed": len(rows) - len(succeeded),
+        "workers": min(sweep.workers, len(configs)) if configs else 0,
+        "seconds": round(seconds, 3),
+        "best": succeeded[0] if succeeded else None,
+        "results": rows,
+        "path": sweep.save(results) if save and succeeded else None,
+    }
+
+
+def run_parameter_sweep(grid: Optional[Dict[str, Sequence[Any]]] = None,
+                        space: Optional[Dict[str, Any]] = None, samples: int = 50,
+                        workers: Optional[int] = None, instrument_id: str = "EUR/USD.SIM",
+                        start: Optional[str] = None, end: Optional[str] = None,
+                        seed: int = 42, sort_by: str = "pnl", save: bool = True,
+                        base_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    EMACross sweep over grid (default DEFAULT_GRID) or `samples` draws from space,
+    run to completion in the calling process (see start_parameter_sweep for the API)
+
+    Returns the results table as rows sorted by sort_by (descending), with the
+    Parquet path when saved.
+    """
+    try:
+        started = time.perf_counter()
+        sweep, configs = _sweep_and_configs(grid, space, samples, workers, instrument_id, start, end, seed, base_path)
+        results = sweep.run(configs)
+        return _summary(sweep, configs, results, sort_by, save, time.perf_counter() - started)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def _jobs_dir(base_path: Optional[str] = None) -> str:
+    return os.path.join(base_path or DEFAULT_BASE_PATH, "sweeps", "jobs")
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+class SweepJob:
+    """
+    One sweep running on a background thread of the worker process that started it.
+
+    A sweep can run for an hour, far longer than any call to the shared worker pool
+    should, so the API starts it and returns at once. The status is written to
+    base_path/sweeps/jobs/<id>.json after every finished run, which lets any worker
+    process answer a poll; an <id>.cancel file next to it stops the sweep.
+    """
+
+    def __init__(self, sweep: ParameterSweep, configs: List[Dict[str, Any]], sort_by: str, save: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.sweep = sweep
+        self.configs = configs
+        self.sort_by = sort_by
+        self.save = save
+        self.state = "pending"
+        self.completed = 0
+        self.failed = 0
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"parameter-sweep-{self.id}", daemon=True)
+
+    @property
+    def status_path(self) -> str:
+        return os.path.join(_jobs_dir(self.sweep.base_path), f"{self.id}.json")
+
+    @property
+    def cancel_path(self) -> str:
+        return os.path.join(_jobs_dir(self.sweep.base_path), f"{self.id}.cancel")
+
+    def start(self):
+        self.started_at = time.time()
+        self._publish()
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def status(self) -> Dict[str, Any]:
+        now = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "state": self.state,
+            "pid": os.getpid(),
+            "runs": len(self.configs),
+            "completed": self.completed,
+            "failed": self.failed,
+            "progress": self.completed / len(self.configs) if self.configs else 1.0,
+            "workers": min(self.sweep.workers, len(self.configs)),
+            "elapsed_seconds": round(now - self.started_at, 2) if self.started_at else 0.0,
+            "started_at": datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat() if self.started_at else None,
+            "error": self.error,
+            "result": self.result,
+        }
+
+    def _cancelled(self) -> bool:
+        if not self._cancel.is_set() and os.path.exists(self.cancel_path):
+            self._cancel.set()
+        return self._cancel.is_set()
+
+    def _on_result(self, row: Dict[str, Any]):
+        self.completed += 1
+        if not row.get("success"):
+            self.failed += 1
+        self._publish()
+
+    def _run(self):
+        self.state = "running"
+        started = time.perf_counter()
+        try:
+            results = self.sweep.run(self.configs, on_result=self._on_result, cancelled=self._cancelled)
+            self.result = _summary(self.sweep, self.configs, results, self.sort_by, self.save,
+                                   time.perf_counter() - started)
+            self.state = "cancelled" if self._cancel.is_set() and self.completed < len(self.configs) else "completed"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+            self._publish()
+            try:
+                os.remove(self.cancel_path)
+            except OSError:
+                pass
+
+    def _publish(self):
+        # Replaced atomically so a concurrent poll never reads half a file
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.status_path), exist_ok=True)
+                partial = self.status_path + ".tmp"
+                with open(partial, "w") as f:
+                    json.dump(self.status(), f, default=str)
+                os.replace(partial, self.status_path)
+            except OSError as e:
+                print(f"Parameter sweep {self.id}: cannot write status: {e}")
+
+
+# Jobs started by this process; other processes read their status files
+_jobs: Dict[str, SweepJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def _read_status(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if status["state"] in ("pending", "running") and status["id"] not in _jobs and not _pid_alive(status.get("pid")):
+        # The worker process running it was recycled or killed
+        status.update(state="failed", error=status.get("error") or "Worker process exited during the sweep")
+    return status
+
+
+def _prune_jobs(base_path: Optional[str] = None):
+    directory = _jobs_dir(base_path)
+    if not os.path.isdir(directory):
+        return
+    statuses = [status for status in (_read_status(os.path.join(directory, name))
+                                      for name in os.listdir(directory) if name.endswith(".json")) if status]
+    finished = sorted((s for s in statuses if s["state"] in ("completed", "cancelled", "failed")),
+                      key=lambda s: s["started_at"] or "")
+    for status in finished[:max(0, len(finished) - MAX_FINISHED_SWEEPS + 1)]:
+        _jobs.pop(status["id"], None)
+        try:
+            os.remove(os.path.join(directory, f"{status['id']}.json"))
+        except OSError:
+            pass
+
+
+def start_parameter_sweep(grid: Optional[Dict[str, Sequence[Any]]] = None,
+                          space: Optional[Dict[str, Any]] = None, samples: int = 50,
+                          workers: Optional[int] = None, instrument_id: str = "EUR/USD.SIM",
+                          start: Optional[str] = None, end: Optional[str] = None,
+                          seed: int = 42, sort_by: str = "pnl", save: bool = True,
+                          base_path: Optional[str] = None) -> Dict[str, Any]:
+    """Start a sweep in the background (arguments as run_parameter_sweep) and return its status"""
+    try:
+        sweep, configs = _sweep_and_configs(grid, space, samples, workers, instrument_id, start, end, seed, base_path)
+        if not configs:
+            raise ValueError("No parameter sets to run")
+        job = SweepJob(sweep, configs, sort_by, save)
+        with _jobs_lock:
+            _prune_jobs(base_path)
+            _jobs[job.id] = job
+        job.start()
+        return job.status()
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def get_parameter_sweep_status(job_id: Optional[str] = None, base_path: Optional[str] = None) -> Any:
+    """One sweep's status and, once finished, its results; or every recent sweep without results"""
+    directory = _jobs_dir(base_path)
+    if job_id is None:
+        if not os.path.isdir(directory):
+            return []
+        statuses = [status for status in (_read_status(os.path.join(directory, name))
+                                          for name in os.listdir(directory) if name.endswith(".json")) if status]
+        return sorted(({k: v for k, v in s.items() if k != "result"} for s in statuses),
+                      key=lambda s: s["started_at"] or "", reverse=True)
+    job = _jobs.get(job_id)
+    if job is not None:
+        return job.status()
+    status = _read_status(os.path.join(directory, f"{job_id}.json")) if JOB_ID_RE.match(job_id) else None
+    return status or {"error": f"Sweep '{job_id}' not found"}
+
+
+def cancel_parameter_sweep(job_id: str, base_path: Optional[str] = None) -> Dict[str, Any]:
+    """Stop a sweep after its next finished run; runs in flight are abandoned"""
+    job = _jobs.get(job_id)
+    if job is not None:
+        job.cancel()
+        return job.status()
+    status = get_parameter_sweep_status(job_id, base_path)
+    if status.get("state") not in ("pending", "running"):
+        return status
+    # Started by another worker process: it checks for this file after every run
+    with open(os.path.join(_jobs_dir(base_path), f"{job_id}.cancel"), "w"):
+        pass
+    return {**status, "cancel_requested": True}
@@ -0,0 +1,264 @@
+"""
+Response Compression
+ASGI middleware compressing bridge responses with zstd, brotli or gzip per Accept-Encoding
+"""
+
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Server preference when the client accepts several encodings with the same q-value
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Content types worth compressing; anything else (images, archives) passes through
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "application/vnd.apache.arrow.stream",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush(zlib.Z_FINISH)
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+ENCODERS = {"gzip": _GzipEncoder}
+if ZSTD_AVAILABLE:
+    ENCODERS["zstd"] = _ZstdEncoder
+if BROTLI_AVAILABLE:
+    ENCODERS["br"] = _BrotliEncoder
+
+
+def choose_encoding(accept_encoding: Optional[str], allowed: Optional[Dict[str, int]] = None) -> Optional[str]:
+    """Best encoding we support from an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+
+    quality: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        quality[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in ENCODERS or (allowed is not None and coding not in allowed):
+            continue
+        q = quality.get(coding, quality.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _with_vary(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Response start message with Accept-Encoding added to its Vary header"""
+    headers = []
+    vary = None
+    for name, value in message.get("headers", []):
+        if name.lower() == b"vary":
+            vary = value
+        else:
+            headers.append((name, value))
+    if vary is None:
+        vary = b"Accept-Encoding"
+    elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+        vary += b", Accept-Encoding"
+    headers.append((b"vary", vary))
+    return {**message, "headers": headers}
+
+
+class CompressionMiddleware:
+    """
+    Compresses HTTP responses above minimum_size.
+
+    A single-message body below the threshold is sent as is. Streaming bodies
+    (StreamingResponse NDJSON / Arrow exports) are compressed chunk by chunk and
+    flushed after each chunk, so the client can decode rows as they arrive instead of
+    waiting for the end of the stream.
+
+    route_levels maps a path prefix to per-encoding levels, overriding `levels` for
+    that route (longest prefix wins); an empty dict turns compression off there.
+    Every response on a route that may be compressed carries Vary: Accept-Encoding,
+    including identity ones, so shared caches keep the variants apart.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, levels: Optional[Dict[str, int]] = None,
+                 route_levels: Optional[Dict[str, Dict[str, int]]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        # Longest prefix first so the most specific route wins
+        self.route_levels: List[Tuple[str, Dict[str, int]]] = sorted(
+            (route_levels or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        levels = self._levels_for(scope["path"])
+        accept_encoding = None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        if not levels:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(accept_encoding, levels)
+        if encoding is None:
+            async def send_with_vary(message):
+                if message["type"] == "http.response.start":
+                    message = _with_vary(message)
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        responder = _CompressingSender(send, encoding, levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder)
+
+    def _levels_for(self, path: str) -> Dict[str, int]:
+        for prefix, levels in self.route_levels:
+            if path.startswith(prefix):
+                return {**self.levels, **levels} if levels else {}
+        return self.levels
+
+
+class _CompressingSender:
+    """Wraps the ASGI send callable for one response"""
+
+    def __init__(self, send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Dict[str, Any]] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether compression is worth it
+            self.start_message = message
+            if not self._compressible(message):
+                self.passthrough = True
+                await self.send(_with_vary(message))
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            declared = self._header(self.start_message, b"content-length")
+            small = len(body) < self.minimum_size if not more_body else (
+                declared is not None and int(declared) < self.minimum_size
+            )
+            if small:
+                self.passthrough = True
+                await self.send(_with_vary(self.start_message))
+                await self.send(message)
+                return
+            self.encoder = ENCODERS[self.encoding](self.level)
+            await self.send(self._compressed_start())
+
+        data = self.encoder.compress(body)
+        data += self.encoder.flush() if more_body else self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compressible(self, message) -> bool:
+        if message.get("status") != 200:
+            return False
+        if self._header(message, b"content-encoding") is not None:
+            return False
+        content_type = (self._header(message, b"content-type") or "").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compressed_start(self) -> Dict[str, Any]:
+        headers = []
+        for name, value in self.start_message.get("headers", []):
+            lname = name.lower()
+            if lname == b"content-length":
+                continue
+            if lname == b"etag" and not value.startswith(b"W/"):
+                # The encoded bytes differ from the identity representation
+                value = b"W/" + value
+            headers.append((name, value))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        return _with_vary({**self.start_message, "headers": headers})
+
+    @staticmethod
+    def _header(message, name: bytes) -> Optional[str]:
+        for key, value in message.get("headers", []):
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return None
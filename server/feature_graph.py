@@ -0,0 +1,280 @@
+"""
+Feature Dependency Graph
+Adjacency arrays, topological order and precomputed transitive closures over features and components
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Dependencies written like "Redis (optional)" do not break their dependents when missing
+OPTIONAL_SUFFIX = "(optional)"
+
+
+def _parse_dependency(name: str) -> Tuple[str, bool]:
+    """Dependency name without the optional marker, and whether it was optional"""
+    name = name.strip()
+    if name.lower().endswith(OPTIONAL_SUFFIX):
+        return name[:-len(OPTIONAL_SUFFIX)].strip(), True
+    return name, False
+
+
+def _bits(indices: Iterable[int]) -> int:
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+
+class DependencyGraph:
+    """
+    Dependency graph over named nodes (features, components, external dependencies).
+
+    Nodes are numbered once and edges kept as adjacency lists of ints. Strongly
+    connected components give the cycles; the condensation is ordered topologically
+    and the transitive closure of every node, both directions, is computed in one
+    pass over that order as int bitsets. Queries then cost a dict lookup plus
+    decoding the k nodes in the answer, and decoded lists are memoized.
+
+    Optional dependencies ("Redis (optional)") are kept as edges but left out of
+    the closures, so they never block a toggle or show up as impact.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[str, str, bool]], nodes: Iterable[Tuple[str, str]] = ()):
+        """edges are (dependent, dependency, optional); nodes are (name, kind) for known nodes"""
+        self.names: List[str] = []
+        self.kinds: List[str] = []
+        self.index: Dict[str, int] = {}
+        for name, kind in nodes:
+            self._node(name, kind)
+
+        hard: List[Tuple[int, int]] = []
+        optional: List[Tuple[int, int]] = []
+        for dependent, dependency, is_optional in edges:
+            edge = (self._node(dependent), self._node(dependency))
+            if edge[0] != edge[1] or not is_optional:
+                (optional if is_optional else hard).append(edge)
+
+        n = len(self.names)
+        self.depends_on: List[List[int]] = [[] for _ in range(n)]
+        self.dependents: List[List[int]] = [[] for _ in range(n)]
+        self.optional_depends_on: List[List[int]] = [[] for _ in range(n)]
+        for a, b in set(hard):
+            self.depends_on[a].append(b)
+            self.dependents[b].append(a)
+        for a, b in set(optional):
+            self.optional_depends_on[a].append(b)
+
+        self._components, self._component_of = self._strongly_connected()
+        self.cycles: List[List[str]] = [
+            sorted(self.names[i] for i in members)
+            for members in self._components
+            if len(members) > 1 or members[0] in self.depends_on[members[0]]
+        ]
+        self.order: List[int] = self._topological_order()
+        self.rank: List[int] = [0] * n
+        for position, i in enumerate(self.order):
+            self.rank[i] = position
+        self._requires, self._required_by = self._closures()
+        self._memo: Dict[Tuple[str, int], List[str]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def requirements(self, name: str) -> List[str]:
+        """Everything name needs, transitively, in startup order"""
+        return self._decode("requires", self._requires, name)
+
+    def impact(self, name: str) -> List[str]:
+        """Everything that breaks, transitively, if name goes away; in startup order"""
+        return self._decode("required_by", self._required_by, name)
+
+    def direct_dependencies(self, name: str) -> List[str]:
+        i = self.index.get(name)
+        return [self.names[j] for j in self.depends_on[i]] if i is not None else []
+
+    def direct_dependents(self, name: str) -> List[str]:
+        i = self.index.get(name)
+        return [self.names[j] for j in self.dependents[i]] if i is not None else []
+
+    def startup_order(self, names: Optional[Sequence[str]] = None) -> List[str]:
+        """Dependencies before dependents: the whole graph, or names plus what they need"""
+        if names is None:
+            return [self.names[i] for i in self.order]
+        mask = 0
+        for name in names:
+            i = self.index.get(name)
+            if i is not None:
+                mask |= self._requires[i] | (1 << i)
+        return [self.names[i] for i in sorted(self._decode_bits(mask), key=self.rank.__getitem__)]
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Bitset of the given node names; unknown names are ignored"""
+        return _bits(self.index[name] for name in names if name in self.index)
+
+    def impact_within(self, name: str, mask: int) -> List[str]:
+        """Transitive dependents of name restricted to the nodes in mask"""
+        i = self.index.get(name)
+        if i is None:
+            return []
+        return self._ordered(self._required_by[i] & mask)
+
+    def requirements_within(self, name: str, mask: int) -> List[str]:
+        """Transitive requirements of name restricted to the nodes in mask"""
+        i = self.index.get(name)
+        if i is None:
+            return []
+        return self._ordered(self._requires[i] & mask)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self.names),
+            "edges": sum(len(deps) for deps in self.depends_on),
+            "optional_edges": sum(len(deps) for deps in self.optional_depends_on),
+            "cycle_count": len(self.cycles),
+        }
+
+    def _node(self, name: str, kind: str = "external") -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = len(self.names)
+            self.index[name] = i
+            self.names.append(name)
+            self.kinds.append(kind)
+        elif kind != "external" and self.kinds[i] != kind:
+            # A name that is both a feature and a component (e.g. MessageBus)
+            self.kinds[i] = kind if self.kinds[i] == "external" else "feature+component"
+        return i
+
+    def _decode(self, direction: str, closures: List[int], name: str) -> List[str]:
+        i = self.index.get(name)
+        if i is None:
+            return []
+        key = (direction, i)
+        if key not in self._memo:
+            self._memo[key] = self._ordered(closures[i])
+        return self._memo[key]
+
+    def _ordered(self, mask: int) -> List[str]:
+        return [self.names[i] for i in sorted(self._decode_bits(mask), key=self.rank.__getitem__)]
+
+    @staticmethod
+    def _decode_bits(mask: int) -> List[int]:
+        indices = []
+        while mask:
+            low = mask & -mask
+            indices.append(low.bit_length() - 1)
+            mask ^= low
+        return indices
+
+    def _strongly_connected(self) -> Tuple[List[List[int]], List[int]]:
+        """Tarjan's algorithm, iterative so deep chains do not hit the recursion limit"""
+        n = len(self.names)
+        index_of = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        component_of = [-1] * n
+        counter = 0
+
+        for root in range(n):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work[-1]
+                if child == 0:
+                    index_of[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                if child < len(self.depends_on[node]):
+                    work[-1] = (node, child + 1)
+                    nxt = self.depends_on[node][child]
+                    if index_of[nxt] == -1:
+                        work.append((nxt, 0))
+                    elif on_stack[nxt]:
+                        low[node] = min(low[node], index_of[nxt])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        members.append(member)
+                        if member == node:
+                            break
+                    components.append(members)
+        return components, component_of
+
+    def _topological_order(self) -> List[int]:
+        # Tarjan emits components dependencies-first, which is already a valid startup order
+        return [i for members in self._components for i in sorted(members)]
+
+    def _closures(self) -> Tuple[List[int], List[int]]:
+        """Transitive requires / required_by bitsets for every node"""
+        n = len(self.names)
+        component_bits = [_bits(members) for members in self._components]
+        requires = [0] * len(self._components)
+        for c, members in enumerate(self._components):
+            # Components come dependencies-first, so every target's closure is final already
+            mask = 0
+            for i in members:
+                for j in self.depends_on[i]:
+                    target = self._component_of[j]
+                    if target != c:
+                        mask |= component_bits[target] | requires[target]
+            if len(members) > 1 or members[0] in self.depends_on[members[0]]:
+                mask |= component_bits[c]
+            requires[c] = mask
+
+        required_by = [0] * len(self._components)
+        for c in range(len(self._components) - 1, -1, -1):
+            members = self._components[c]
+            mask = 0
+            for i in members:
+                for j in self.dependents[i]:
+                    source = self._component_of[j]
+                    if source != c:
+                        mask |= component_bits[source] | required_by[source]
+            if len(members) > 1 or members[0] in self.depends_on[members[0]]:
+                mask |= component_bits[c]
+            required_by[c] = mask
+
+        node_requires = [0] * n
+        node_required_by = [0] * n
+        for i in range(n):
+            c = self._component_of[i]
+            # A node is never its own requirement, even inside a cycle
+            node_requires[i] = requires[c] & ~(1 << i)
+            node_required_by[i] = required_by[c] & ~(1 << i)
+        return node_requires, node_required_by
+
+
+def build_feature_graph(features: Iterable[Dict[str, Any]], components: Iterable[Dict[str, Any]]) -> DependencyGraph:
+    """Graph from feature records (dependencies / required_for) and core components (dependencies)"""
+    nodes: List[Tuple[str, str]] = []
+    edges: List[Tuple[str, str, bool]] = []
+    for feature in features:
+        name = feature["name"]
+        nodes.append((name, "feature"))
+        for dependency in feature.get("dependencies", []) or []:
+            target, optional = _parse_dependency(dependency)
+            edges.append((name, target, optional))
+        for dependent in feature.get("required_for", []) or []:
+            source, optional = _parse_dependency(dependent)
+            edges.append((source, name, optional))
+    for component in components:
+        name = component["name"]
+        nodes.append((name, "component"))
+        for dependency in component.get("dependencies", []) or []:
+            target, optional = _parse_dependency(dependency)
+            edges.append((name, target, optional))
+    return DependencyGraph(edges, nodes)
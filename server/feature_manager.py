@@ -4,8 +4,12 @@ Backend module for managing Nautilus features, components, and services
 Updated to use nautilus_bridge as primary data source with JSON fallback
 """
 
+import hashlib
 import json
-from typing import Dict, List, Any
+import os
+import tempfile
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 
 # Import from nautilus_bridge for real data
 try:
@@ -13,121 +17,410 @@ try:
         get_all_features as _get_all_features_real,
         get_all_services as _get_all_services_real,
         get_all_components as _get_all_components_real,
+        toggle_feature as _toggle_feature_real,
     )
     BRIDGE_AVAILABLE = True
 except ImportError:
     BRIDGE_AVAILABLE = False
     print("Warning: nautilus_bridge not available, using fallback data")
 
+try:
+    from server.feature_graph import DependencyGraph, build_feature_graph
+except ImportError:
+    from feature_graph import DependencyGraph, build_feature_graph
+
+# Dependency analysis used when nautilus_bridge is unavailable
+FEATURE_DEPENDENCIES_PATH = os.getenv(
+    "NAUTILUS_FEATURE_DEPENDENCIES", "/home/ubuntu/nautilus_feature_dependencies.json"
+)
+
+# Enabled/disabled toggles, shared by every worker process that serves feature calls.
+# The default is in the system temp dir, so toggles reset on reboot; it is keyed by this
+# checkout's path so two deployments on one host keep separate toggles. Point
+# NAUTILUS_FEATURE_OVERRIDES somewhere persistent to keep them across reboots.
+_DEPLOYMENT_KEY = hashlib.sha1(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))).encode()
+).hexdigest()[:8]
+FEATURE_OVERRIDES_PATH = os.getenv(
+    "NAUTILUS_FEATURE_OVERRIDES",
+    os.path.join(tempfile.gettempdir(), f"nautilus-feature-overrides-{_DEPLOYMENT_KEY}.json"),
+)
+
 # Load feature dependencies from analysis (fallback)
-def load_feature_dependencies() -> Dict:
+def load_feature_dependencies(path: str = FEATURE_DEPENDENCIES_PATH) -> Dict:
     """Load feature dependencies from JSON file"""
     try:
-        with open('/home/ubuntu/nautilus_feature_dependencies.json', 'r') as f:
+        with open(path, 'r') as f:
             return json.load(f)
     except Exception as e:
         print(f"Error loading feature dependencies: {e}")
         return {}
 
-# Feature management functions
-def get_all_features() -> Dict[str, Any]:
-    """Get all Nautilus Core features with their status and dependencies"""
-    # Try to get real data from nautilus_bridge first
-    if BRIDGE_AVAILABLE:
+
+class FeatureRegistry:
+    """
+    Features loaded once and indexed by id, name, category and status.
+
+    The list payload, category grouping and status summary are built at load time,
+    so every read is a dict lookup. The registry reloads when the fallback JSON
+    file's mtime changes or after toggle_feature. Toggles are written to an
+    overrides file whose mtime is checked too, so other worker processes pick them
+    up. Returned objects are shared and must be treated as read-only.
+
+    The dependency graph over features and core components is rebuilt only when the
+    set of features or the dependency file changes; a toggle just recomputes the
+    disabled-feature bitset, so validating it against the graph stays O(k).
+    """
+
+    def __init__(self, dependencies_path: str = FEATURE_DEPENDENCIES_PATH,
+                 overrides_path: str = FEATURE_OVERRIDES_PATH):
+        self.dependencies_path = dependencies_path
+        self.overrides_path = overrides_path
+        self.source: Optional[str] = None  # "bridge" or "file"
+        self._lock = threading.Lock()
+        self._stale = True
+        self._mtimes: Tuple[Optional[int], Optional[int]] = (None, None)
+        self._enabled_overrides: Dict[str, bool] = {}
+        self._dependencies: Dict[str, Any] = {}
+        self._features: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_status: Dict[str, List[Dict[str, Any]]] = {}
+        self._payload: Dict[str, Any] = {}
+        self._summary: Dict[str, int] = {}
+        self._services_payload: Optional[Dict[str, Any]] = None
+        self._services_by_feature: Dict[str, List[str]] = {}
+        self._graph: Optional[DependencyGraph] = None
+        self._graph_key: Optional[Tuple[Any, ...]] = None
+        self._disabled_mask = 0
+
+    def all(self) -> Dict[str, Any]:
+        self._ensure_fresh()
+        return self._payload
+
+    def get(self, feature_id: str) -> Dict[str, Any]:
+        self._ensure_fresh()
+        return self._by_id.get(feature_id, {})
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        self._ensure_fresh()
+        return self._by_category.get(category, [])
+
+    def by_status(self, status: str) -> List[Dict[str, Any]]:
+        self._ensure_fresh()
+        return self._by_status.get(status, [])
+
+    def by_name(self, name: str) -> Dict[str, Any]:
+        self._ensure_fresh()
+        return self._by_name.get(name, {})
+
+    def summary(self) -> Dict[str, int]:
+        self._ensure_fresh()
+        return self._summary
+
+    def dependencies(self) -> Dict[str, Any]:
+        """The fallback JSON document, re-read only when its mtime changes"""
+        self._ensure_fresh()
+        return self._dependencies
+
+    def services_for(self, feature_name: str) -> List[str]:
+        self._ensure_fresh()
+        return self._services_by_feature.get(feature_name, [])
+
+    def graph(self) -> DependencyGraph:
+        self._ensure_fresh()
+        return self._graph
+
+    def resolve(self, feature: str) -> str:
+        """Graph node name for a feature id or name"""
+        self._ensure_fresh()
+        record = self._by_id.get(feature)
+        return record["name"] if record else feature
+
+    def impact(self, feature: str) -> Dict[str, Any]:
+        """What a feature needs and what depends on it, split by current enabled state"""
+        self._ensure_fresh()
+        graph, disabled = self._graph, self._disabled_mask
+        name = self.resolve(feature)
+        return {
+            "feature": name,
+            "known": name in graph,
+            "direct_dependencies": graph.direct_dependencies(name),
+            "direct_dependents": graph.direct_dependents(name),
+            "requires": graph.requirements(name),
+            "dependents": graph.impact(name),
+            "active_dependents": graph.impact_within(name, ~disabled),
+            "missing_requirements": graph.requirements_within(name, disabled),
+        }
+
+    def validate_toggle(self, feature_id: str, enabled: bool) -> Dict[str, Any]:
+        """
+        Check a toggle against the dependency graph without applying it
+
+        Disabling is blocked by active transitive dependents, enabling by disabled
+        transitive requirements.
+        """
+        self._ensure_fresh()
+        graph, disabled = self._graph, self._disabled_mask
+        name = self.resolve(feature_id)
+        if enabled:
+            blocking = graph.requirements_within(name, disabled)
+        else:
+            blocking = graph.impact_within(name, ~disabled)
+        return {
+            "feature_id": feature_id,
+            "feature": name,
+            "enabled": enabled,
+            "allowed": not blocking,
+            "blocked_by": blocking,
+        }
+
+    def fallback_services(self) -> Dict[str, Any]:
+        """Unique services named in the dependency file, built once per load"""
+        self._ensure_fresh()
+        if self._services_payload is None:
+            services_map = {}
+            for category, features in self._dependencies.items():
+                for feature_name, feature_info in features.items():
+                    for service in feature_info.get("services", []):
+                        if service not in services_map:
+                            services_map[service] = {
+                                "id": service,
+                                "name": service.replace("_", " ").title(),
+                                "provided_by": [],
+                                "category": category,
+                            }
+                        services_map[service]["provided_by"].append(feature_name)
+            services_list = list(services_map.values())
+            self._services_payload = {"services": services_list, "total": len(services_list)}
+        return self._services_payload
+
+    def toggle(self, feature_id: str, enabled: bool, force: bool = False) -> Dict[str, Any]:
+        """Enable or disable a feature and invalidate the cached views
+
+        Refused when the dependency graph says it would break an active dependent
+        (or, when enabling, that a requirement is disabled), unless force is set.
+        Unknown ids are refused too, so they never reach the overrides file.
+        """
+        if not self.get(feature_id):
+            return {
+                "success": False,
+                "feature_id": feature_id,
+                "enabled": enabled,
+                "error": f"Unknown feature: {feature_id}",
+            }
+        check = self.validate_toggle(feature_id, enabled)
+        if not check["allowed"] and not force:
+            action = "enable" if enabled else "disable"
+            reason = "requires disabled" if enabled else "is required by"
+            return {
+                "success": False,
+                "feature_id": feature_id,
+                "enabled": enabled,
+                "blocked_by": check["blocked_by"],
+                "error": f"Cannot {action} {check['feature']}: {reason} {', '.join(check['blocked_by'])}",
+            }
+
+        if BRIDGE_AVAILABLE:
+            result = _toggle_feature_real(feature_id, enabled)
+        else:
+            result = {"success": True, "feature_id": feature_id, "enabled": enabled}
+        if result.get("success"):
+            with self._lock:
+                overrides = {**self._read_overrides(), feature_id: enabled}
+                tmp_path = f"{self.overrides_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(overrides, f)
+                os.replace(tmp_path, self.overrides_path)
+                self._stale = True
+            result = {**result, "blocked_by": check["blocked_by"]}
+        return result
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
         try:
-            features = _get_all_features_real()
-            
-            # Group by category
-            categories = {}
-            for feature in features:
-                category = feature["category"]
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append(feature)
-            
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_overrides(self) -> Dict[str, bool]:
+        try:
+            with open(self.overrides_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _ensure_fresh(self):
+        # Two stats per read; files are only parsed again when they actually changed
+        mtimes = (self._mtime(self.dependencies_path), self._mtime(self.overrides_path))
+        if not self._stale and mtimes == self._mtimes:
+            return
+        with self._lock:
+            if self._stale or mtimes != self._mtimes:
+                self._load_locked(mtimes)
+
+    def _load_locked(self, mtimes: Tuple[Optional[int], Optional[int]]):
+        dependencies_mtime, overrides_mtime = mtimes
+        if dependencies_mtime != self._mtimes[0] or not self._dependencies:
+            self._dependencies = load_feature_dependencies(self.dependencies_path) if dependencies_mtime else {}
+            self._services_payload = None
+            self._services_by_feature = {
+                feature_name: feature_info.get("services", [])
+                for features in self._dependencies.values()
+                for feature_name, feature_info in features.items()
+            }
+        self._enabled_overrides = self._read_overrides() if overrides_mtime else {}
+        self._mtimes = mtimes
+
+        features = None
+        if BRIDGE_AVAILABLE:
+            try:
+                features = [dict(f) for f in _get_all_features_real()]
+                self.source = "bridge"
+            except Exception as e:
+                print(f"Error getting features from bridge: {e}")
+
+        if features is None:
+            self.source = "file"
+            features = self._file_features()
+
+        for feature in features:
+            if feature["id"] in self._enabled_overrides:
+                feature["enabled"] = self._enabled_overrides[feature["id"]]
+
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        by_status: Dict[str, List[Dict[str, Any]]] = {}
+        for feature in features:
+            by_category.setdefault(feature["category"], []).append(feature)
+            by_status.setdefault(self._status_of(feature), []).append(feature)
+
+        self._features = features
+        self._by_id = {f["id"]: f for f in features}
+        self._by_name = {f["name"]: f for f in features}
+        self._by_category = by_category
+        self._by_status = by_status
+
+        self._payload = {
+            "features": features,
+            "total": len(features),
+            "categories": list(by_category.keys()) if self.source == "bridge" else list(self._dependencies.keys()),
+        }
+        if self.source == "bridge":
+            self._payload["by_category"] = by_category
+        self._summary = self._build_summary()
+        self._refresh_graph()
+        self._stale = False
+
+    def _file_features(self) -> List[Dict[str, Any]]:
+        """Feature records from the dependency file, flattened for easier frontend consumption"""
+        features = []
+        for category, category_features in self._dependencies.items():
+            for feature_name, feature_info in category_features.items():
+                features.append({
+                    "id": f"{category}_{feature_name}".replace(" ", "_").lower(),
+                    "name": feature_name,
+                    "category": category,
+                    "status": feature_info.get("status", "unknown"),
+                    "dependencies": feature_info.get("dependencies", []),
+                    "services": feature_info.get("services", []),
+                    "required_for": feature_info.get("required_for", []),
+                })
+        return features
+
+    def _refresh_graph(self):
+        graph_key = (self.source, self._mtimes[0], tuple(self._by_name))
+        if self._graph is None or graph_key != self._graph_key:
+            # Bridge features carry no dependency lists; the dependency file still
+            # describes them by name, so its edges apply whichever source is active
+            records = self._features
+            if self.source == "bridge":
+                records = records + self._file_features()
+            self._graph = build_feature_graph(records, CORE_COMPONENTS)
+            self._graph_key = graph_key
+        self._disabled_mask = self._graph.mask(
+            f["name"] for f in self._features if not f.get("enabled", True)
+        )
+
+    def _status_of(self, feature: Dict[str, Any]) -> str:
+        if self.source == "bridge":
+            return "enabled" if feature.get("enabled", False) else "disabled"
+        return feature.get("status", "unknown")
+
+    def _build_summary(self) -> Dict[str, int]:
+        total = len(self._features)
+        if self.source == "bridge":
+            enabled_count = len(self._by_status.get("enabled", []))
             return {
-                "features": features,
-                "total": len(features),
-                "categories": list(categories.keys()),
-                "by_category": categories
+                "total": total,
+                "enabled": enabled_count,
+                "disabled": total - enabled_count,
+                "available": total,
+                "configured": enabled_count,
+                "requires_config": 0,
+                "requires_data": 0
             }
-        except Exception as e:
-            print(f"Error getting features from bridge: {e}")
-    
-    # Fallback to JSON file
-    dependencies = load_feature_dependencies()
-    
-    # Flatten the structure for easier frontend consumption
-    all_features = []
-    for category, features in dependencies.items():
-        for feature_name, feature_info in features.items():
-            all_features.append({
-                "id": f"{category}_{feature_name}".replace(" ", "_").lower(),
-                "name": feature_name,
-                "category": category,
-                "status": feature_info.get("status", "unknown"),
-                "dependencies": feature_info.get("dependencies", []),
-                "services": feature_info.get("services", []),
-                "required_for": feature_info.get("required_for", []),
-            })
-    
-    return {
-        "features": all_features,
-        "total": len(all_features),
-        "categories": list(dependencies.keys()),
-    }
+
+        status_counts = {
+            "available": 0,
+            "configured": 0,
+            "requires_config": 0,
+            "requires_data": 0,
+            "unknown": 0,
+        }
+        for status, features in self._by_status.items():
+            key = status if status in status_counts else "unknown"
+            status_counts[key] += len(features)
+        return status_counts
+
+
+feature_registry = FeatureRegistry()
+
+# Feature management functions
+def get_all_features() -> Dict[str, Any]:
+    """Get all Nautilus Core features with their status and dependencies"""
+    return feature_registry.all()
 
 def get_features_by_category(category: str) -> List[Dict]:
     """Get features filtered by category"""
-    all_data = get_all_features()
-    if "by_category" in all_data and category in all_data["by_category"]:
-        return all_data["by_category"][category]
-    return [f for f in all_data["features"] if f["category"] == category]
+    return feature_registry.by_category(category)
 
 def get_feature_by_id(feature_id: str) -> Dict:
     """Get a specific feature by ID"""
-    all_data = get_all_features()
-    for feature in all_data["features"]:
-        if feature["id"] == feature_id:
-            return feature
-    return {}
+    return feature_registry.get(feature_id)
 
 def get_feature_status_summary() -> Dict[str, int]:
     """Get summary of feature statuses"""
-    all_data = get_all_features()
-    
-    # If using nautilus_bridge data
-    if BRIDGE_AVAILABLE and "features" in all_data:
-        enabled_count = sum(1 for f in all_data["features"] if f.get("enabled", False))
-        disabled_count = all_data["total"] - enabled_count
-        
-        return {
-            "total": all_data["total"],
-            "enabled": enabled_count,
-            "disabled": disabled_count,
-            "available": all_data["total"],
-            "configured": enabled_count,
-            "requires_config": 0,
-            "requires_data": 0
-        }
-    
-    # Fallback to JSON data
-    status_counts = {
-        "available": 0,
-        "configured": 0,
-        "requires_config": 0,
-        "requires_data": 0,
-        "unknown": 0,
-    }
-    
-    for feature in all_data["features"]:
-        status = feature.get("status", "unknown")
-        if status in status_counts:
-            status_counts[status] += 1
-        else:
-            status_counts["unknown"] += 1
-    
-    return status_counts
+    return feature_registry.summary()
+
+def toggle_feature(feature_id: str, enabled: bool, force: bool = False) -> Dict[str, Any]:
+    """Enable or disable a feature; refused if it breaks dependents unless force is set"""
+    return feature_registry.toggle(feature_id, enabled, force)
+
+def validate_feature_toggle(feature_id: str, enabled: bool) -> Dict[str, Any]:
+    """Check a toggle against the dependency graph without applying it"""
+    return feature_registry.validate_toggle(feature_id, enabled)
+
+# Dependency graph queries
+def get_feature_impact(feature: str) -> Dict[str, Any]:
+    """Transitive requirements and dependents of a feature or component (id or name)"""
+    return feature_registry.impact(feature)
+
+def get_startup_order(features: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Dependencies-first start order of the whole graph, or of the given features and their requirements"""
+    graph = feature_registry.graph()
+    names = [feature_registry.resolve(f) for f in features] if features else None
+    order = graph.startup_order(names)
+    return {"order": order, "total": len(order), "cycles": graph.cycles}
+
+def get_dependency_cycles() -> Dict[str, Any]:
+    """Dependency cycles (strongly connected components) plus graph size"""
+    graph = feature_registry.graph()
+    return {**graph.stats(), "cycles": graph.cycles}
 
 # Service management functions
 def get_all_services() -> Dict[str, Any]:
@@ -160,41 +453,79 @@ def get_all_services() -> Dict[str, Any]:
         except Exception as e:
             print(f"Error getting services from bridge: {e}")
     
-    # Fallback to JSON file
-    dependencies = load_feature_dependencies()
-    
-    # Extract all unique services
-    services_map = {}
-    for category, features in dependencies.items():
-        for feature_name, feature_info in features.items():
-            for service in feature_info.get("services", []):
-                if service not in services_map:
-                    services_map[service] = {
-                        "id": service,
-                        "name": service.replace("_", " ").title(),
-                        "provided_by": [],
-                        "category": category,
-                    }
-                services_map[service]["provided_by"].append(feature_name)
-    
-    services_list = list(services_map.values())
-    
-    return {
-        "services": services_list,
-        "total": len(services_list),
-    }
+    # Fallback to the cached JSON file
+    return feature_registry.fallback_services()
 
 def get_services_by_feature(feature_name: str) -> List[str]:
     """Get services provided by a specific feature"""
-    dependencies = load_feature_dependencies()
-    
-    for category, features in dependencies.items():
-        if feature_name in features:
-            return features[feature_name].get("services", [])
-    
-    return []
+    return feature_registry.services_for(feature_name)
 
 # Component management functions
+# Core components and what each one needs. The bridge reports live component status
+# without dependencies, so the dependency graph always takes its edges from here.
+CORE_COMPONENTS: List[Dict[str, Any]] = [
+    {
+        "id": "kernel",
+        "name": "Kernel",
+        "type": "core",
+        "status": "running",
+        "health": "healthy",
+        "uptime": "2h 15m",
+        "description": "Central orchestration and lifecycle management",
+        "dependencies": ["Clock", "Logger", "MessageBus"],
+    },
+    {
+        "id": "message_bus",
+        "name": "MessageBus",
+        "type": "core",
+        "status": "running",
+        "health": "healthy",
+        "uptime": "2h 15m",
+        "description": "Inter-component communication and event routing",
+        "dependencies": ["Logger"],
+    },
+    {
+        "id": "cache",
+        "name": "Cache",
+        "type": "core",
+        "status": "running",
+        "health": "healthy",
+        "uptime": "2h 15m",
+        "description": "High-performance in-memory data storage",
+        "dependencies": ["Redis (optional)"],
+    },
+    {
+        "id": "data_engine",
+        "name": "DataEngine",
+        "type": "engine",
+        "status": "running",
+        "health": "healthy",
+        "uptime": "2h 15m",
+        "description": "Market data processing and distribution",
+        "dependencies": ["MessageBus", "Cache", "Clock"],
+    },
+    {
+        "id": "execution_engine",
+        "name": "ExecutionEngine",
+        "type": "engine",
+        "status": "running",
+        "health": "healthy",
+        "uptime": "2h 15m",
+        "description": "Order lifecycle management and execution",
+        "dependencies": ["MessageBus", "Cache", "Clock", "RiskEngine"],
+    },
+    {
+        "id": "risk_engine",
+        "name": "RiskEngine",
+        "type": "engine",
+        "status": "running",
+        "health": "healthy",
+        "uptime": "2h 15m",
+        "description": "Pre-trade and post-trade risk management",
+        "dependencies": ["MessageBus", "Cache", "PortfolioEngine"],
+    },
+]
+
 def get_core_components() -> List[Dict]:
     """Get all core components with their status"""
     # Try to get real data from nautilus_bridge first
@@ -205,70 +536,7 @@ def get_core_components() -> List[Dict]:
             print(f"Error getting components from bridge: {e}")
     
     # Fallback to hardcoded data
-    components = [
-        {
-            "id": "kernel",
-            "name": "Kernel",
-            "type": "core",
-            "status": "running",
-            "health": "healthy",
-            "uptime": "2h 15m",
-            "description": "Central orchestration and lifecycle management",
-            "dependencies": ["Clock", "Logger", "MessageBus"],
-        },
-        {
-            "id": "message_bus",
-            "name": "MessageBus",
-            "type": "core",
-            "status": "running",
-            "health": "healthy",
-            "uptime": "2h 15m",
-            "description": "Inter-component communication and event routing",
-            "dependencies": ["Logger"],
-        },
-        {
-            "id": "cache",
-            "name": "Cache",
-            "type": "core",
-            "status": "running",
-            "health": "healthy",
-            "uptime": "2h 15m",
-            "description": "High-performance in-memory data storage",
-            "dependencies": ["Redis (optional)"],
-        },
-        {
-            "id": "data_engine",
-            "name": "DataEngine",
-            "type": "engine",
-            "status": "running",
-            "health": "healthy",
-            "uptime": "2h 15m",
-            "description": "Market data processing and distribution",
-            "dependencies": ["MessageBus", "Cache", "Clock"],
-        },
-        {
-            "id": "execution_engine",
-            "name": "ExecutionEngine",
-            "type": "engine",
-            "status": "running",
-            "health": "healthy",
-            "uptime": "2h 15m",
-            "description": "Order lifecycle management and execution",
-            "dependencies": ["MessageBus", "Cache", "Clock", "RiskEngine"],
-        },
-        {
-            "id": "risk_engine",
-            "name": "RiskEngine",
-            "type": "engine",
-            "status": "running",
-            "health": "healthy",
-            "uptime": "2h 15m",
-            "description": "Pre-trade and post-trade risk management",
-            "dependencies": ["MessageBus", "Cache", "PortfolioEngine"],
-        },
-    ]
-    
-    return components
+    return CORE_COMPONENTS
 
 def get_component_by_id(component_id: str) -> Dict:
     """Get a specific component by ID"""
@@ -306,6 +574,11 @@ __all__ = [
     "get_features_by_category",
     "get_feature_by_id",
     "get_feature_status_summary",
+    "toggle_feature",
+    "validate_feature_toggle",
+    "get_feature_impact",
+    "get_startup_order",
+    "get_dependency_cycles",
     "get_all_services",
     "get_services_by_feature",
     "get_core_components",
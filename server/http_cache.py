@@ -0,0 +1,172 @@
+"""
+HTTP Cache
+ETags, conditional GET and a small rendered-response cache for the FastAPI bridge
+"""
+
+import hashlib
+import inspect
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    from server.wire_format import NegotiatedResponse, current_format
+except ImportError:
+    from wire_format import NegotiatedResponse, current_format
+
+# Mixed into version-based ETags so a restarted process never reuses an old tag for new content
+_EPOCH = os.urandom(8).hex()
+
+# Headers copied from the rendered response into cached replays
+_REPLAYED_HEADERS = ("vary", "x-next-cursor", "x-has-more", "x-total-count")
+
+CacheKey = Tuple[str, str, str]
+
+
+class _Entry:
+    __slots__ = ("version", "etag", "body", "status_code", "media_type", "headers", "expires_at")
+
+    def __init__(self, version, etag, body, status_code, media_type, headers, expires_at):
+        self.version = version
+        self.etag = etag
+        self.body = body
+        self.status_code = status_code
+        self.media_type = media_type
+        self.headers = headers
+        self.expires_at = expires_at
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison; weak comparison as RFC 9110 requires for GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Serves GET endpoints through ETags and an LRU of rendered bodies.
+
+    With a version (a state-change counter) the ETag is derived from the version
+    alone, so an unchanged If-None-Match is answered with 304 before the payload is
+    built, and a changed version rebuilds once for every poller. Without one, the
+    rendered body is reused for `ttl` seconds and the ETag is a hash of the body.
+    Entries are keyed by path, query string and negotiated wire format.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 2.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    async def respond(self, request: Request,
+                      build: Callable[[], Union[Any, Awaitable[Any]]],
+                      version: Optional[Any] = None, ttl: Optional[float] = None) -> Response:
+        """
+        Answer a GET from cache or by calling build()
+
+        build returns content for NegotiatedResponse or a ready Response; it may be async.
+        Only 200 responses are cached.
+        """
+        key = (request.url.path, request.url.query, current_format())
+        if_none_match = request.headers.get("if-none-match")
+        ttl = self.ttl if ttl is None else ttl
+        cache_control = "no-cache" if version is not None else f"private, max-age={int(ttl)}"
+
+        if version is not None:
+            etag = self._version_etag(key, version)
+            if _etag_matches(if_none_match, etag):
+                return self._not_modified(etag, cache_control)
+
+        entry = self._lookup(key, version)
+        if entry is None:
+            self.misses += 1
+            entry, response = await self._render(key, build, version, ttl)
+            if entry is None:
+                # Not cacheable (non-200 or streaming): pass the built response through
+                return response
+        else:
+            self.hits += 1
+
+        if _etag_matches(if_none_match, entry.etag):
+            return self._not_modified(entry.etag, cache_control)
+
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": cache_control}
+        return Response(entry.body, status_code=entry.status_code, headers=headers, media_type=entry.media_type)
+
+    def invalidate(self, path_prefix: str = ""):
+        """Drop entries whose path starts with path_prefix (all entries by default)"""
+        for key in [k for k in self._entries if k[0].startswith(path_prefix)]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else None,
+        }
+
+    def _not_modified(self, etag: str, cache_control: str) -> Response:
+        # Entries are keyed by wire format, so the 304 varies on Accept like the 200 does
+        self.not_modified += 1
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept"})
+
+    def _version_etag(self, key: CacheKey, version: Any) -> str:
+        digest = hashlib.blake2b(f"{_EPOCH}|{key}|{version}".encode("utf-8"), digest_size=12).hexdigest()
+        return f'"{digest}"'
+
+    def _lookup(self, key: CacheKey, version: Optional[Any]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        fresh = entry.version == version if version is not None else entry.expires_at > time.monotonic()
+        if not fresh:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def _render(self, key: CacheKey, build, version: Optional[Any],
+                      ttl: float) -> Tuple[Optional[_Entry], Response]:
+        result = build()
+        if inspect.isawaitable(result):
+            result = await result
+        response = result if isinstance(result, Response) else NegotiatedResponse(result)
+
+        body = getattr(response, "body", None)
+        if response.status_code != 200 or body is None:
+            return None, response
+
+        if version is not None:
+            etag = self._version_etag(key, version)
+        else:
+            etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+        headers = {name: response.headers[name] for name in _REPLAYED_HEADERS if name in response.headers}
+        entry = _Entry(version, etag, body, response.status_code, response.media_type, headers,
+                       time.monotonic() + ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry, response
@@ -0,0 +1,159 @@
+"""
+System Metrics Sampler
+Background thread that polls host CPU, memory, disk and network counters into a ring buffer
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import psutil
+
+
+class SystemMetricsSampler:
+    """
+    Samples host metrics on a fixed interval so readers never block.
+
+    psutil.cpu_percent(interval=None) measures CPU time since the previous call,
+    so one call per tick gives overall and per-CPU readings over the same window.
+    """
+
+    def __init__(self, interval: float = 1.0, history_seconds: int = 900, disk_path: str = '/'):
+        self.interval = interval
+        self.disk_path = disk_path
+        self._samples: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(history_seconds / interval)))
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._prev_net = None
+        self._prev_time = None
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def start(self):
+        """Start the sampler thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            # Prime the CPU counters; _run waits one interval before its first sample, so
+            # every sample it takes covers a full interval
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call `callback(sample)` on the sampler thread after every sample"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def latest(self) -> Dict[str, Any]:
+        """Return the most recent sample, taking one synchronously if none exist yet"""
+        self.start()
+        with self._lock:
+            if self._samples:
+                return self._samples[-1]
+        # Only during the first interval; its CPU reading covers the time since start()
+        return self._take_sample()
+
+    def history(self, seconds: Optional[float] = None, step: int = 1) -> List[Dict[str, Any]]:
+        """Return samples from the last `seconds` (all retained if None), every `step`-th sample"""
+        self.start()
+        with self._lock:
+            samples = list(self._samples)
+
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            samples = [s for s in samples if s["sampled_at"] >= cutoff]
+
+        if step > 1:
+            samples = samples[::step]
+        return samples
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.wait(delay):
+            started = time.monotonic()
+            try:
+                self._take_sample()
+            except Exception as e:
+                print(f"Metrics sampler error: {e}")
+            delay = max(0.0, self.interval - (time.monotonic() - started))
+
+    def _take_sample(self) -> Dict[str, Any]:
+        # Serialise samplers so CPU and network deltas are never split between two callers
+        with self._sample_lock:
+            return self._take_sample_locked()
+
+    def _take_sample_locked(self) -> Dict[str, Any]:
+        now = time.time()
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        net_io = psutil.net_io_counters()
+
+        sample = {
+            "cpu": {
+                "percent": round(sum(per_cpu) / len(per_cpu), 1) if per_cpu else 0.0,
+                "count": len(per_cpu) or psutil.cpu_count(),
+                "per_cpu": per_cpu,
+            },
+            "memory": {
+                "total_gb": memory.total / (1024**3),
+                "used_gb": memory.used / (1024**3),
+                "available_gb": memory.available / (1024**3),
+                "percent": memory.percent
+            },
+            "disk": {
+                "total_gb": disk.total / (1024**3),
+                "used_gb": disk.used / (1024**3),
+                "free_gb": disk.free / (1024**3),
+                "percent": disk.percent
+            },
+            "network": self._network_stats(net_io, now),
+            "sampled_at": now,
+            "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+        }
+
+        with self._lock:
+            self._samples.append(sample)
+
+        for callback in self._listeners:
+            try:
+                callback(sample)
+            except Exception as e:
+                print(f"Metrics sampler listener error: {e}")
+        return sample
+
+    def _network_stats(self, net_io, now: float) -> Dict[str, Any]:
+        """Cumulative counters plus bytes/sec derived from the previous sample"""
+        sent_rate = 0.0
+        recv_rate = 0.0
+        if self._prev_net is not None and now > self._prev_time:
+            elapsed = now - self._prev_time
+            # Counters can wrap or reset when an interface goes away
+            sent_rate = max(0, net_io.bytes_sent - self._prev_net.bytes_sent) / elapsed
+            recv_rate = max(0, net_io.bytes_recv - self._prev_net.bytes_recv) / elapsed
+        self._prev_net = net_io
+        self._prev_time = now
+
+        return {
+            "bytes_sent_mb": net_io.bytes_sent / (1024**2),
+            "bytes_recv_mb": net_io.bytes_recv / (1024**2),
+            "packets_sent": net_io.packets_sent,
+            "packets_recv": net_io.packets_recv,
+            "bytes_sent_per_sec": round(sent_rate, 1),
+            "bytes_recv_per_sec": round(recv_rate, 1),
+        }
@@ -1,14 +1,7 @@
 import { z } from "zod";
-import { exec as execCallback } from "child_process";
-import { promisify } from "util";
-import path from "path";
-import { fileURLToPath } from "url";
+import { callPython } from "../../../_core/pythonWorker";
 import { publicProcedure, router } from "../../../_core/trpc";
 
-const exec = promisify(execCallback);
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
-
 /**
  * Nautilus Core Router
  * Handles Nautilus Core system management and monitoring
@@ -19,9 +12,7 @@ export const nautilusCoreRouter = router({
    */
   getSystemStatus: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_system_status; import json; print(json.dumps(get_system_status()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("nautilus_bridge", "get_system_status");
     } catch (error: any) {
       return { status: "error", message: error.message };
     }
@@ -34,9 +25,7 @@ export const nautilusCoreRouter = router({
     .input(z.object({ component: z.string() }))
     .query(async ({ input }) => {
       try {
-        const projectRoot = path.join(__dirname, "../../../..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_component_status; import json; print(json.dumps(get_component_status('${input.component}')))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "get_component_status", [input.component]);
       } catch (error: any) {
         return { error: error.message };
       }
@@ -47,9 +36,7 @@ export const nautilusCoreRouter = router({
    */
   getAllComponents: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_all_components; import json; print(json.dumps(get_all_components()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("nautilus_bridge", "get_all_components");
     } catch (error: any) {
       return [];
     }
@@ -60,22 +47,34 @@ export const nautilusCoreRouter = router({
    */
   getSystemMetrics: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_system_metrics; import json; print(json.dumps(get_system_metrics()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("nautilus_bridge", "get_system_metrics");
     } catch (error: any) {
       return { error: error.message };
     }
   }),
 
+  /**
+   * Get sampled system metrics history
+   */
+  getMetricsHistory: publicProcedure
+    .input(z.object({
+      minutes: z.number().min(1).max(15).default(5),
+      step: z.number().int().min(1).default(1),
+    }))
+    .query(async ({ input }) => {
+      try {
+        return await callPython("nautilus_bridge", "get_metrics_history", [input.minutes, input.step]);
+      } catch (error: any) {
+        return { interval_seconds: 1, count: 0, samples: [] };
+      }
+    }),
+
   /**
    * Get trading metrics
    */
   getTradingMetrics: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_trading_metrics; import json; print(json.dumps(get_trading_metrics()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("nautilus_bridge", "get_trading_metrics");
     } catch (error: any) {
       return { error: error.message };
     }
@@ -92,10 +91,7 @@ export const nautilusCoreRouter = router({
     }))
     .query(async ({ input }) => {
       try {
-        const projectRoot = path.join(__dirname, "../../../..");
-        const component = input.component ? `'${input.component}'` : "None";
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_logs; import json; print(json.dumps(get_logs(${component}, '${input.level}', ${input.limit})))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "get_logs", [input.component ?? null, input.level, input.limit]);
       } catch (error: any) {
         return [];
       }
@@ -108,9 +104,7 @@ export const nautilusCoreRouter = router({
     .input(z.object({ component: z.string() }))
     .mutation(async ({ input }) => {
       try {
-        const projectRoot = path.join(__dirname, "../../../..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import restart_component; import json; print(json.dumps(restart_component('${input.component}')))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "restart_component", [input.component]);
       } catch (error: any) {
         return { success: false, message: error.message };
       }
@@ -121,9 +115,7 @@ export const nautilusCoreRouter = router({
    */
   emergencyStopAll: publicProcedure.mutation(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import emergency_stop_all; import json; print(json.dumps(emergency_stop_all()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("nautilus_bridge", "emergency_stop_all");
     } catch (error: any) {
       return { success: false, message: error.message };
     }
@@ -134,9 +126,7 @@ export const nautilusCoreRouter = router({
    */
   getAllFeatures: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_all_features; import json; print(json.dumps(get_all_features()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("feature_manager", "get_all_features");
     } catch (error: any) {
       return { features: [], total: 0, categories: [] };
     }
@@ -149,9 +139,7 @@ export const nautilusCoreRouter = router({
     .input(z.object({ category: z.string() }))
     .query(async ({ input }) => {
       try {
-        const projectRoot = path.join(__dirname, "../../../..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_features_by_category; import json; print(json.dumps(get_features_by_category('${input.category}')))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("feature_manager", "get_features_by_category", [input.category]);
       } catch (error: any) {
         return [];
       }
@@ -162,9 +150,7 @@ export const nautilusCoreRouter = router({
    */
   getFeatureStatusSummary: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_feature_status_summary; import json; print(json.dumps(get_feature_status_summary()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("feature_manager", "get_feature_status_summary");
     } catch (error: any) {
       return { available: 0, configured: 0, requires_config: 0, requires_data: 0 };
     }
@@ -175,22 +161,41 @@ export const nautilusCoreRouter = router({
    */
   getAllServices: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_all_services; import json; print(json.dumps(get_all_services()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("feature_manager", "get_all_services");
     } catch (error: any) {
       return { services: [], total: 0 };
     }
   }),
 
+  /**
+   * Query services with category/state filters and pagination
+   */
+  queryServices: publicProcedure
+    .input(z.object({
+      category: z.string().optional(),
+      state: z.string().optional(),
+      offset: z.number().int().min(0).default(0),
+      limit: z.number().int().min(1).max(1000).default(50),
+    }))
+    .query(async ({ input }) => {
+      try {
+        return await callPython("nautilus_bridge", "query_services", [
+          input.category ?? null,
+          input.state ?? null,
+          input.offset,
+          input.limit,
+        ]);
+      } catch (error: any) {
+        return { services: [], total: 0, offset: input.offset, limit: input.limit };
+      }
+    }),
+
   /**
    * Get core components
    */
   getCoreComponents: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_core_components; import json; print(json.dumps(get_core_components()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("feature_manager", "get_core_components");
     } catch (error: any) {
       return [];
     }
@@ -201,9 +206,7 @@ export const nautilusCoreRouter = router({
    */
   getComponentHealthSummary: publicProcedure.query(async () => {
     try {
-      const projectRoot = path.join(__dirname, "../../../..");
-      const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_component_health_summary; import json; print(json.dumps(get_component_health_summary()))"`);
-      return JSON.parse(stdout.trim());
+      return await callPython("feature_manager", "get_component_health_summary");
     } catch (error: any) {
       return { healthy: 0, degraded: 0, unhealthy: 0, stopped: 0 };
     }
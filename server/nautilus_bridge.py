@@ -1,12 +1,18 @@
 """
 Nautilus Core Bridge - Python interface to interact with NautilusTrader core components
 """
-import psutil
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import json
 
+try:
+    from server.metrics_sampler import SystemMetricsSampler
+    from server.service_registry import ServiceRegistry
+except ImportError:
+    from metrics_sampler import SystemMetricsSampler
+    from service_registry import ServiceRegistry
+
 # Try to import nautilus_trader components
 try:
     import nautilus_trader
@@ -27,6 +33,9 @@ class NautilusCoreManager:
         self.start_time = time.time()
         self._kernel = None
         self._components = {}
+        self.metrics_sampler = SystemMetricsSampler(interval=1.0, history_seconds=900)
+        self.service_registry = ServiceRegistry(self.metrics_sampler)
+        self._register_default_services()
         
     def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status"""
@@ -128,31 +137,27 @@ class NautilusCoreManager:
         return [self.get_component_status(name) for name in component_names]
     
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get system-level metrics (CPU, memory, etc.)"""
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
+        """Get system-level metrics (CPU, memory, etc.) from the latest background sample"""
+        sample = self.metrics_sampler.latest()
+        return {key: value for key, value in sample.items() if key != "sampled_at"}
+    
+    def get_metrics_history(self, minutes: float = 5, step: int = 1) -> Dict[str, Any]:
+        """Get sampled system metrics for the last N minutes (1 s resolution by default)"""
+        samples = self.metrics_sampler.history(seconds=minutes * 60, step=step)
         return {
-            "cpu": {
-                "percent": cpu_percent,
-                "count": psutil.cpu_count(),
-                "per_cpu": psutil.cpu_percent(interval=0.1, percpu=True)
-            },
-            "memory": {
-                "total_gb": memory.total / (1024**3),
-                "used_gb": memory.used / (1024**3),
-                "available_gb": memory.available / (1024**3),
-                "percent": memory.percent
-            },
-            "disk": {
-                "total_gb": disk.total / (1024**3),
-                "used_gb": disk.used / (1024**3),
-                "free_gb": disk.free / (1024**3),
-                "percent": disk.percent
-            },
-            "network": self._get_network_stats(),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "interval_seconds": self.metrics_sampler.interval * max(1, step),
+            "count": len(samples),
+            "samples": [
+                {
+                    "timestamp": s["timestamp"],
+                    "cpu_percent": s["cpu"]["percent"],
+                    "memory_percent": s["memory"]["percent"],
+                    "disk_percent": s["disk"]["percent"],
+                    "bytes_sent_per_sec": s["network"]["bytes_sent_per_sec"],
+                    "bytes_recv_per_sec": s["network"]["bytes_recv_per_sec"],
+                }
+                for s in samples
+            ],
         }
     
     def get_trading_metrics(self) -> Dict[str, Any]:
@@ -303,16 +308,6 @@ class NautilusCoreManager:
         minutes = int((seconds % 3600) // 60)
         return f"{days}d {hours}h {minutes}m"
     
-    def _get_network_stats(self) -> Dict[str, Any]:
-        """Get network statistics"""
-        net_io = psutil.net_io_counters()
-        return {
-            "bytes_sent_mb": net_io.bytes_sent / (1024**2),
-            "bytes_recv_mb": net_io.bytes_recv / (1024**2),
-            "packets_sent": net_io.packets_sent,
-            "packets_recv": net_io.packets_recv
-        }
-
     def get_all_features(self) -> List[Dict[str, Any]]:
         """
         Get all 64 Nautilus features categorized by type
@@ -406,14 +401,11 @@ class NautilusCoreManager:
         
         return features
     
-    def get_all_services(self) -> List[Dict[str, Any]]:
+    def _register_default_services(self):
         """
-        Get all 126 services distributed across components
-        In real implementation, this would query actual running services
+        Register the 126 simulated services distributed across components
+        In real implementation, services would register with their PIDs as they start
         """
-        services = []
-        
-        # Generate 126 services across different categories
         service_categories = [
             ("Execution", 25),
             ("Data", 20),
@@ -428,19 +420,35 @@ class NautilusCoreManager:
         service_id = 1
         for category, count in service_categories:
             for i in range(count):
-                services.append({
-                    "id": f"service_{service_id}",
-                    "name": f"{category}Service{i+1}",
-                    "category": category,
-                    "state": "running",
-                    "health": "healthy",
-                    "uptime": time.time() - self.start_time,
-                    "cpu_percent": psutil.cpu_percent(interval=0.1) / psutil.cpu_count(),
-                    "memory_mb": 50 + (i * 5),  # Simulated memory usage
-                })
+                self.service_registry.register(
+                    service_id=f"service_{service_id}",
+                    name=f"{category}Service{i+1}",
+                    category=category,
+                    memory_mb=50 + (i * 5),  # Simulated memory usage
+                    started_at=self.start_time,
+                )
                 service_id += 1
-        
-        return services
+    
+    def get_all_services(self, category: Optional[str] = None, state: Optional[str] = None,
+                         offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get services, optionally filtered by category/state and paginated
+        Resource readings come from the shared sampler snapshot, so no call blocks on psutil
+        """
+        self.metrics_sampler.start()
+        return self.service_registry.query(category, state, offset, limit)["services"]
+    
+    def query_services(self, category: Optional[str] = None, state: Optional[str] = None,
+                       offset: int = 0, limit: Optional[int] = 50) -> Dict[str, Any]:
+        """
+        Get one page of services with the total match count and per-category/state counts
+        """
+        self.metrics_sampler.start()
+        page = self.service_registry.query(category, state, offset, limit)
+        summary = self.service_registry.summary()
+        page["by_category"] = summary["by_category"]
+        page["by_state"] = summary["by_state"]
+        return page
     
     def toggle_feature(self, feature_id: str, enabled: bool) -> Dict[str, Any]:
         """
@@ -490,6 +498,8 @@ class NautilusCoreManager:
         """
         Start a service
         """
+        if self.service_registry.set_state(service_id, "running") is None:
+            return {"success": False, "service_id": service_id, "message": f"Service {service_id} not found"}
         return {
             "success": True,
             "service_id": service_id,
@@ -502,6 +512,8 @@ class NautilusCoreManager:
         """
         Stop a service
         """
+        if self.service_registry.set_state(service_id, "stopped") is None:
+            return {"success": False, "service_id": service_id, "message": f"Service {service_id} not found"}
         return {
             "success": True,
             "service_id": service_id,
@@ -514,14 +526,19 @@ class NautilusCoreManager:
         """
         Get status of a specific service
         """
+        self.metrics_sampler.start()
+        service = self.service_registry.get(service_id)
+        if service is None:
+            return {"service_id": service_id, "state": "unknown", "health": "unknown", "error": "Service not found"}
+        
         return {
             "service_id": service_id,
-            "state": "running",
-            "health": "healthy",
-            "uptime": time.time() - self.start_time,
-            "cpu_percent": psutil.cpu_percent(interval=0.1) / psutil.cpu_count(),
-            "memory_mb": 75,
-            "threads": 4,
+            "state": service["state"],
+            "health": service["health"],
+            "uptime": service["uptime"],
+            "cpu_percent": service["cpu_percent"],
+            "memory_mb": service["memory_mb"],
+            "threads": service["threads"] or 4,
             "connections": 12,
             "requests_per_sec": 234,
             "errors_per_min": 0,
@@ -575,6 +592,9 @@ def get_all_components():
 def get_system_metrics():
     return nautilus_manager.get_system_metrics()
 
+def get_metrics_history(minutes: float = 5, step: int = 1):
+    return nautilus_manager.get_metrics_history(minutes, step)
+
 def get_trading_metrics():
     return nautilus_manager.get_trading_metrics()
 
@@ -602,8 +622,13 @@ def emergency_stop_all():
 def get_all_features():
     return nautilus_manager.get_all_features()
 
-def get_all_services():
-    return nautilus_manager.get_all_services()
+def get_all_services(category: Optional[str] = None, state: Optional[str] = None,
+                     offset: int = 0, limit: Optional[int] = None):
+    return nautilus_manager.get_all_services(category, state, offset, limit)
+
+def query_services(category: Optional[str] = None, state: Optional[str] = None,
+                   offset: int = 0, limit: Optional[int] = 50):
+    return nautilus_manager.query_services(category, state, offset, limit)
 
 def toggle_feature(feature_id: str, enabled: bool):
     return nautilus_manager.toggle_feature(feature_id, enabled)
@@ -3,20 +3,60 @@ Nautilus Trader FastAPI Bridge
 Provides REST API and WebSocket endpoints for Nautilus Trader integration
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import asyncio
-import json
+import os
 from datetime import datetime
 from enum import Enum
 
+try:
+    from server.ws_broadcaster import Broadcaster
+    from server.ws_topics import TOPIC_FAMILIES, TopicHub
+    from server.trading_store import TradingStore
+    from server.http_cache import ResponseCache
+    from server.compression import CompressionMiddleware
+    from server import nautilus_bridge
+    from server.wire_format import (
+        JSON, WS_SUBPROTOCOLS, NegotiatedResponse, WireFormatMiddleware, encoder_info, loads, negotiate_subprotocol
+    )
+except ImportError:
+    from ws_broadcaster import Broadcaster
+    from ws_topics import TOPIC_FAMILIES, TopicHub
+    from trading_store import TradingStore
+    from http_cache import ResponseCache
+    from compression import CompressionMiddleware
+    import nautilus_bridge
+    from wire_format import (
+        JSON, WS_SUBPROTOCOLS, NegotiatedResponse, WireFormatMiddleware, encoder_info, loads, negotiate_subprotocol
+    )
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Nautilus Trader API",
     description="REST API and WebSocket bridge for Nautilus Trader",
-    version="1.0.0"
+    version="1.0.0",
+    # JSON via orjson, or MessagePack for clients sending "Accept: application/msgpack"
+    default_response_class=NegotiatedResponse,
+)
+
+app.add_middleware(WireFormatMiddleware)
+
+# zstd / br / gzip by Accept-Encoding for bodies over HTTP_COMPRESSION_MIN_SIZE bytes.
+# Exports stream for minutes, so they get cheaper levels; small polled status calls
+# rarely cross the threshold anyway.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("HTTP_COMPRESSION_MIN_SIZE", "1024")),
+    route_levels={
+        "/api/admin/postgres/tables": {"zstd": 1, "br": 1, "gzip": 1},
+        "/api/admin/parquet": {"zstd": 1, "br": 1, "gzip": 1},
+        "/api/nautilus/trades": {"zstd": 6, "br": 5},
+    },
 )
 
 # CORS middleware
@@ -26,11 +66,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination metadata for the order / position / trade lists
+    expose_headers=["X-Next-Cursor", "X-Has-More", "X-Total-Count"],
 )
 
 # Global state
 nautilus_node = None
-websocket_clients: List[WebSocket] = []
+broadcaster = Broadcaster(
+    max_queue=int(os.getenv("WS_MAX_QUEUE", "256")),
+    policy=os.getenv("WS_OVERFLOW_POLICY", "drop_oldest"),
+    send_timeout=float(os.getenv("WS_SEND_TIMEOUT", "10")),
+)
+topic_hub = TopicHub(broadcaster)
+topic_publisher_task: Optional[asyncio.Task] = None
+metrics_loop: Optional[asyncio.AbstractEventLoop] = None  # Loop the sampler thread publishes into
+async_redis = None  # AsyncRedisManager, created on first use
+async_postgres = None  # AsyncPostgreSQLManager, created on first use
+trading_store: Optional[TradingStore] = None  # Indexed orders/positions/trades, loaded on first use
+# ETag / 304 handling and rendered bodies for polled GET endpoints
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("HTTP_CACHE_ENTRIES", "512")),
+    ttl=float(os.getenv("HTTP_CACHE_TTL", "2")),
+)
+
+# Seconds between topic state refreshes
+TOPIC_PUBLISH_INTERVAL = float(os.getenv("WS_TOPIC_INTERVAL", "1"))
 
 # ============================================================================
 # Pydantic Models
@@ -71,6 +131,7 @@ class OrderInfo(BaseModel):
 
 class PositionInfo(BaseModel):
     id: str
+    strategy_id: Optional[str] = None
     instrument_id: str
     side: str
     quantity: float
@@ -110,6 +171,10 @@ class DeployStrategyRequest(BaseModel):
     strategy_name: str
     config: Dict[str, Any]
 
+def _model_rows(models: List[BaseModel]) -> List[Dict[str, Any]]:
+    """Plain dicts from already-validated models, skipping response_model re-validation"""
+    return [m.model_dump() if hasattr(m, "model_dump") else m.dict() for m in models]
+
 # ============================================================================
 # Mock Data Functions (for initial testing)
 # ============================================================================
@@ -211,6 +276,7 @@ def get_mock_positions() -> List[PositionInfo]:
     return [
         PositionInfo(
             id="position-001",
+            strategy_id="strategy-001",
             instrument_id="BTCUSDT.BINANCE",
             side="LONG",
             quantity=0.5,
@@ -221,6 +287,7 @@ def get_mock_positions() -> List[PositionInfo]:
         ),
         PositionInfo(
             id="position-002",
+            strategy_id="strategy-001",
             instrument_id="ETHUSDT.BINANCE",
             side="SHORT",
             quantity=2.0,
@@ -267,7 +334,8 @@ async def root():
         "name": "Nautilus Trader API",
         "version": "1.0.0",
         "status": "running",
-        "mode": "mock"  # Will change to "live" when real integration is complete
+        "mode": "mock",  # Will change to "live" when real integration is complete
+        "encoders": encoder_info(),
     }
 
 @app.get("/health")
@@ -282,50 +350,118 @@ async def health_check():
 
 @app.get("/api/nautilus/status", response_model=SystemStatus)
 async def get_system_status():
-    """Get Nautilus system status"""
+    """Get Nautilus system status (not cached: it carries the current timestamp)"""
     try:
         return get_mock_system_status()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/nautilus/strategies", response_model=List[StrategyInfo])
-async def get_strategies():
+async def get_strategies(request: Request):
     """Get all strategies"""
     try:
-        return get_mock_strategies()
+        strategies = get_trading_store().strategies
+        return await response_cache.respond(request, strategies.rows, version=strategies.version)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def get_trading_store() -> TradingStore:
+    """Shared TradingStore, filled from the mock data until a live node feeds it"""
+    global trading_store
+    if trading_store is None:
+        trading_store = TradingStore()
+        trading_store.load(
+            _model_rows(get_mock_orders()), _model_rows(get_mock_positions()), _model_rows(get_mock_trades()),
+            _model_rows(get_mock_strategies()),
+        )
+    return trading_store
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query parameter as a list"""
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+def _page_response(collection, filters: Dict[str, Optional[str]], start: Optional[str], end: Optional[str],
+                   sort: Optional[str], limit: int, cursor: Optional[str], fields: Optional[str]):
+    """
+    Query an indexed collection and return the rows as the body
+    
+    The body stays a plain list for existing clients; X-Next-Cursor, X-Has-More and
+    X-Total-Count (when known without scanning) carry the pagination state.
+    """
+    try:
+        page = collection.query(
+            {field: _split(value) for field, value in filters.items()},
+            start, end, sort, min(max(limit, 1), 1000), cursor, _split(fields),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"X-Has-More": "true" if page["has_more"] else "false"}
+    if page["next_cursor"]:
+        headers["X-Next-Cursor"] = page["next_cursor"]
+    if page["total"] is not None:
+        headers["X-Total-Count"] = str(page["total"])
+    return NegotiatedResponse(page["rows"], headers=headers)
+
 @app.get("/api/nautilus/orders", response_model=List[OrderInfo])
-async def get_orders(strategy_id: Optional[str] = None):
-    """Get all orders, optionally filtered by strategy"""
+async def get_orders(request: Request, strategy_id: Optional[str] = None, instrument_id: Optional[str] = None,
+                     status: Optional[str] = None, side: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None,
+                     sort: str = "-created_at", limit: int = 100, cursor: Optional[str] = None,
+                     fields: Optional[str] = None):
+    """
+    Get one page of orders, newest first
+    
+    Filters accept comma-separated values; start/end bound created_at as [start, end).
+    `sort` is a field name, "-" prefixed for descending; `fields` is a comma-separated
+    projection. Pass X-Next-Cursor back as `cursor` for the next page.
+    """
+    filters = {"strategy_id": strategy_id, "instrument_id": instrument_id, "status": status, "side": side}
     try:
-        orders = get_mock_orders()
-        
-        if strategy_id:
-            orders = [o for o in orders if o.strategy_id == strategy_id]
-        
-        return orders
+        orders = get_trading_store().orders
+        return await response_cache.respond(
+            request, lambda: _page_response(orders, filters, start, end, sort, limit, cursor, fields),
+            version=orders.version,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/nautilus/positions", response_model=List[PositionInfo])
-async def get_positions(strategy_id: Optional[str] = None):
-    """Get all positions, optionally filtered by strategy"""
+async def get_positions(request: Request, strategy_id: Optional[str] = None, instrument_id: Optional[str] = None,
+                        side: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None,
+                        sort: str = "-opened_at", limit: int = 100, cursor: Optional[str] = None,
+                        fields: Optional[str] = None):
+    """Get one page of positions; same parameters as /orders with start/end on opened_at"""
+    filters = {"strategy_id": strategy_id, "instrument_id": instrument_id, "side": side}
     try:
-        positions = get_mock_positions()
-        
-        # Note: Mock data doesn't have strategy_id, so filtering won't work yet
-        return positions
+        positions = get_trading_store().positions
+        return await response_cache.respond(
+            request, lambda: _page_response(positions, filters, start, end, sort, limit, cursor, fields),
+            version=positions.version,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/nautilus/trades", response_model=List[TradeInfo])
-async def get_trades(strategy_id: Optional[str] = None, limit: int = 100):
-    """Get trade history, optionally filtered by strategy"""
+async def get_trades(request: Request, strategy_id: Optional[str] = None, order_id: Optional[str] = None,
+                     instrument_id: Optional[str] = None, side: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None,
+                     sort: str = "-timestamp", limit: int = 100, cursor: Optional[str] = None,
+                     fields: Optional[str] = None):
+    """Get one page of trade history; same parameters as /orders with start/end on timestamp"""
+    filters = {"strategy_id": strategy_id, "order_id": order_id, "instrument_id": instrument_id, "side": side}
     try:
-        trades = get_mock_trades()
-        return trades[:limit]
+        trades = get_trading_store().trades
+        return await response_cache.respond(
+            request, lambda: _page_response(trades, filters, start, end, sort, limit, cursor, fields),
+            version=trades.version,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -393,51 +529,244 @@ async def cancel_order(order_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def get_async_postgres():
+    """Shared AsyncPostgreSQLManager over the global pooled manager"""
+    global async_postgres
+    if async_postgres is None:
+        try:
+            from server.postgres_manager import AsyncPostgreSQLManager, postgres_manager
+        except ImportError:
+            from postgres_manager import AsyncPostgreSQLManager, postgres_manager
+        async_postgres = AsyncPostgreSQLManager(postgres_manager)
+    return async_postgres
+
+@app.get("/api/admin/postgres/tables/{table_name}/rows")
+async def get_table_rows(request: Request, table_name: str, limit: int = 100, cursor: Optional[str] = None,
+                         instrument_id: Optional[str] = None):
+    """Get one keyset-paginated page of table rows; pass next_cursor back for the next page"""
+    async def load_page():
+        filters = {"instrument_id": instrument_id} if instrument_id else None
+        # Runs on the manager's executor, sized to the pool, not the default threadpool
+        result = await get_async_postgres().query_table(table_name, min(limit, 1000), cursor, filters)
+        if "error" in result:
+            raise HTTPException(status_code=400, detail=result["error"])
+        # Returned as-is so msgpack clients get native timestamps rather than ISO strings
+        return NegotiatedResponse(result)
+    
+    # No change counter for an external database: identical polls share one query per TTL
+    return await response_cache.respond(request, load_page)
+
+@app.get("/api/admin/postgres/tables/{table_name}/export")
+async def export_table(table_name: str, format: str = "ndjson", chunk_size: int = 5000,
+                       cursor: Optional[str] = None, instrument_id: Optional[str] = None,
+                       limit: Optional[int] = None):
+    """Stream table rows as NDJSON or an Arrow IPC stream through a server-side cursor"""
+    try:
+        from server.postgres_manager import stream_postgres_table, PYARROW_AVAILABLE
+    except ImportError:
+        from postgres_manager import stream_postgres_table, PYARROW_AVAILABLE
+    
+    media_types = {
+        "ndjson": "application/x-ndjson",
+        "arrow": "application/vnd.apache.arrow.stream",
+    }
+    if format not in media_types:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'")
+    if format == "arrow" and not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="pyarrow is not installed")
+    
+    filters = {"instrument_id": instrument_id} if instrument_id else None
+    # StreamingResponse iterates the sync generator in a threadpool, one chunk at a time
+    return StreamingResponse(
+        stream_postgres_table(table_name, format, chunk_size, cursor, filters, limit),
+        media_type=media_types[format],
+    )
+
+@app.get("/api/admin/parquet/{directory}/query")
+async def query_parquet_data(directory: str, instrument_id: Optional[str] = None,
+                             start: Optional[str] = None, end: Optional[str] = None,
+                             columns: Optional[str] = None, limit: Optional[int] = None,
+                             format: str = "ndjson"):
+    """
+    Stream bars/quotes/trades rows filtered by instrument and [start, end) time range
+    
+    Filters are pushed down to file and row-group statistics, so only overlapping
+    row groups are read. `columns` is a comma-separated projection.
+    """
+    try:
+        from server.parquet_manager import stream_parquet_query
+    except ImportError:
+        from parquet_manager import stream_parquet_query
+    
+    media_types = {
+        "ndjson": "application/x-ndjson",
+        "arrow": "application/vnd.apache.arrow.stream",
+    }
+    if format not in media_types:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'")
+    
+    projection = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    try:
+        stream = await asyncio.to_thread(
+            stream_parquet_query, directory, instrument_id, start, end, projection, limit, format
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(stream, media_type=media_types[format])
+
+def get_async_redis():
+    """Shared AsyncRedisManager for this event loop"""
+    global async_redis
+    if async_redis is None:
+        try:
+            from server.redis_manager import AsyncRedisManager
+        except ImportError:
+            from redis_manager import AsyncRedisManager
+        async_redis = AsyncRedisManager()
+    return async_redis
+
+@app.get("/api/admin/redis/keys")
+async def get_redis_keys(request: Request, pattern: str = "*", cursor: str = "0", count: int = 100,
+                         type: Optional[str] = None, time_budget_ms: int = 250):
+    """Scan one page of keys with type, TTL and memory usage; pass `cursor` back for the next page"""
+    async def scan_page():
+        page = await get_async_redis().scan_keys_page(
+            pattern, cursor, min(count, 1000), type, min(time_budget_ms, 2000)
+        )
+        if "error" in page:
+            raise HTTPException(status_code=503, detail=page["error"])
+        return NegotiatedResponse(page)
+    
+    return await response_cache.respond(request, scan_page)
+
+@app.post("/api/admin/redis/keys/info")
+async def get_redis_keys_info(keys: List[str]):
+    """Type, TTL and size for specific keys in two pipelined round trips"""
+    info = await get_async_redis().get_keys_info(keys[:1000])
+    if isinstance(info, dict) and "error" in info:
+        raise HTTPException(status_code=503, detail=info["error"])
+    return NegotiatedResponse({"keys": info, "count": len(info)})
+
 # ============================================================================
 # WebSocket Endpoints
 # ============================================================================
 
 @app.websocket("/ws/nautilus")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates"""
-    await websocket.accept()
-    websocket_clients.append(websocket)
+    """
+    WebSocket endpoint for real-time updates
+    
+    Clients send {"action": "subscribe", "topics": [...]} and receive a snapshot per
+    topic followed by deltas (see server/ws_topics.py for the protocol).
+    
+    Offering the "nautilus.msgpack" subprotocol switches both directions to binary
+    MessagePack frames; otherwise frames are JSON text.
+    """
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols"))
+    await websocket.accept(subprotocol=subprotocol)
+    # All writes go through the client's queue so they never race the sender task
+    client = broadcaster.register(websocket, WS_SUBPROTOCOLS.get(subprotocol, JSON))
     
     try:
         # Send initial connection message
-        await websocket.send_json({
+        broadcaster.send(client, {
             "type": "connection",
             "status": "connected",
             "mode": "mock",
+            "topics": list(TOPIC_FAMILIES),
+            "wire_format": client.wire_format,
             "timestamp": datetime.utcnow().isoformat()
         })
         
         while True:
-            # Keep connection alive
-            data = await websocket.receive_text()
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            # Binary frames carry the negotiated format, text frames are always JSON
+            data = frame.get("text")
+            wire_format = JSON
+            if data is None:
+                data = frame.get("bytes")
+                wire_format = client.wire_format
+            
+            try:
+                message = loads(data, wire_format)
+            except Exception:
+                message = None
             
-            # Echo back for now
-            await websocket.send_json({
+            if isinstance(message, dict) and "action" in message:
+                reply = topic_hub.handle(client, message)
+                if reply is not None:
+                    broadcaster.send(client, reply)
+                continue
+            
+            # Echo anything else back for now
+            broadcaster.send(client, {
                 "type": "echo",
                 "data": data,
                 "timestamp": datetime.utcnow().isoformat()
             })
             
     except WebSocketDisconnect:
-        websocket_clients.remove(websocket)
+        pass
+    finally:
+        topic_hub.remove_client(client)
+        await broadcaster.unregister(client)
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Response cache entries, hits, misses and 304s served"""
+    return response_cache.stats()
+
+@app.get("/api/ws/stats")
+async def websocket_stats():
+    """Per-client queue depth, sent, dropped and coalesced frame counts, plus topic versions"""
+    return {**broadcaster.stats(), "topics": topic_hub.stats()}
 
 async def broadcast_update(message: Dict[str, Any]):
     """Broadcast update to all connected WebSocket clients"""
-    disconnected = []
-    for client in websocket_clients:
+    # Encodes once and only enqueues; each client's sender task does the writing
+    broadcaster.broadcast(message)
+
+def collect_topic_states() -> Dict[str, Any]:
+    """
+    Current state of every polled topic, read from the same TradingStore as the REST lists.
+    Collections are keyed by id so deltas touch single rows; system_metrics is pushed by
+    the metrics sampler instead (see startup_event).
+    """
+    store = get_trading_store()
+    states: Dict[str, Any] = {
+        "system_status": jsonable_encoder(get_mock_system_status()),
+        "components": {c["name"]: c for c in nautilus_bridge.get_all_components()},
+        "strategies": {s["id"]: s for s in jsonable_encoder(store.strategies.rows())},
+    }
+    # Per-strategy topics that emptied out still need a publish to clear their rows
+    for topic in topic_hub.topic_names():
+        if ":" in topic:
+            states[topic] = {}
+    for family, collection in (("orders", store.orders), ("positions", store.positions), ("trades", store.trades)):
+        rows = jsonable_encoder(collection.rows())
+        states[family] = {row["id"]: row for row in rows}
+        for row in rows:
+            # Trades carry their order's strategy_id in the store
+            if row.get("strategy_id"):
+                states.setdefault(f"{family}:{row['strategy_id']}", {})[row["id"]] = row
+    return states
+
+async def publish_topics():
+    """Refresh topic state on an interval; unchanged topics send nothing"""
+    while True:
         try:
-            await client.send_json(message)
-        except:
-            disconnected.append(client)
-    
-    # Remove disconnected clients
-    for client in disconnected:
-        websocket_clients.remove(client)
+            for topic, state in collect_topic_states().items():
+                topic_hub.publish(topic, state)
+        except Exception as e:
+            print(f"Topic publish error: {e}")
+        await asyncio.sleep(TOPIC_PUBLISH_INTERVAL)
+
+def _publish_metrics_sample(sample: Dict[str, Any]):
+    """Metrics sampler listener; hands each sample to the event loop that owns topic_hub"""
+    if metrics_loop is not None and not metrics_loop.is_closed():
+        metrics_loop.call_soon_threadsafe(topic_hub.publish, "system_metrics", sample)
 
 # ============================================================================
 # Startup and Shutdown Events
@@ -451,11 +780,25 @@ async def startup_event():
     print("Mode: MOCK (Phase 1 - Initial Setup)")
     print("Real Nautilus integration will be added in Phase 2")
     print("=" * 80)
+    global topic_publisher_task, metrics_loop
+    topic_publisher_task = asyncio.create_task(publish_topics())
+    metrics_loop = asyncio.get_running_loop()
+    sampler = nautilus_bridge.nautilus_manager.metrics_sampler
+    sampler.add_listener(_publish_metrics_sample)
+    sampler.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("Shutting down Nautilus Trader FastAPI Bridge...")
+    if topic_publisher_task is not None:
+        topic_publisher_task.cancel()
+    nautilus_bridge.nautilus_manager.metrics_sampler.remove_listener(_publish_metrics_sample)
+    await broadcaster.close_all()
+    if async_redis is not None:
+        await async_redis.close()
+    if async_postgres is not None:
+        await async_postgres.close()
 
 # ============================================================================
 # Main Entry Point
@@ -0,0 +1,357 @@
+"""
+Parquet Catalog
+On-disk SQLite index of Parquet files so overview and stats pages never re-read footers
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import pyarrow.parquet as pq
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    ctime REAL NOT NULL,
+    num_rows INTEGER NOT NULL DEFAULT 0,
+    num_columns INTEGER NOT NULL DEFAULT 0,
+    num_row_groups INTEGER NOT NULL DEFAULT 0,
+    schema_hash TEXT,
+    error TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_directory ON files(directory, mtime DESC);
+
+CREATE TABLE IF NOT EXISTS column_stats (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    column_name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    min_value TEXT,
+    max_value TEXT,
+    null_count INTEGER,
+    PRIMARY KEY (path, column_name)
+);
+"""
+
+
+def _stat_value(value: Any) -> Optional[str]:
+    """JSON-encode a footer statistic; timestamps become ISO strings"""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, bytes):
+        value = value.decode("utf-8", errors="replace")
+    return json.dumps(value, default=str)
+
+
+def _comparable(stat: Any, bound: Any) -> Any:
+    """Decode a stored statistic into the type of the bound it is compared against"""
+    if isinstance(bound, datetime) and isinstance(stat, str):
+        value = datetime.fromisoformat(stat)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    return stat
+
+
+class ParquetCatalog:
+    """
+    Index of every Parquet file under the managed directories.
+
+    refresh() stats each file and only re-reads footers whose size or mtime changed.
+    Readers call ensure_fresh(), which costs one stat per directory: a changed
+    directory mtime (file added, removed or renamed) triggers an incremental refresh,
+    in-place rewrites are picked up by the background rescan.
+    """
+
+    def __init__(self, directories: Dict[str, str], db_path: str, rescan_interval: float = 60.0):
+        self.directories = directories
+        self.db_path = db_path
+        self.rescan_interval = rescan_interval
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._dir_mtimes: Dict[str, float] = {}
+        self._last_refresh: Optional[Dict[str, Any]] = None
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Parquet catalog falling back to memory ({self.db_path}): {e}")
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def start(self):
+        """Start the background rescan thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="parquet-catalog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background rescan thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def ensure_fresh(self):
+        """Refresh if never indexed or a directory listing changed since the last refresh"""
+        if self._last_refresh is None or self._dir_mtimes != self._current_dir_mtimes():
+            self.refresh()
+
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """Sync the index with disk; unchanged files (same size and mtime) are skipped unless full"""
+        with self._lock:
+            started = time.monotonic()
+            dir_mtimes = self._current_dir_mtimes()
+            indexed = {
+                path: (size, mtime)
+                for path, size, mtime in self._conn.execute("SELECT path, size_bytes, mtime FROM files")
+            }
+            seen = set()
+            added = updated = 0
+
+            for dir_name, dir_path in self.directories.items():
+                os.makedirs(dir_path, exist_ok=True)
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith('.parquet') or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        seen.add(entry.path)
+                        previous = indexed.get(entry.path)
+                        if not full and previous == (stat.st_size, stat.st_mtime):
+                            continue
+                        self._index_file(dir_name, entry.name, entry.path, stat)
+                        if previous is None:
+                            added += 1
+                        else:
+                            updated += 1
+
+            removed = [path for path in indexed if path not in seen]
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+            self._conn.commit()
+
+            self._dir_mtimes = dir_mtimes
+            self._last_refresh = {
+                "added": added,
+                "updated": updated,
+                "removed": len(removed),
+                "files": len(seen),
+                "full": full,
+                "duration_ms": round((time.monotonic() - started) * 1000, 1),
+                "refreshed_at": time.time(),
+            }
+            return self._last_refresh
+
+    def reindex(self) -> Dict[str, Any]:
+        """Drop the index and re-read every footer"""
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.commit()
+            return self.refresh(full=True)
+
+    def remove(self, path: str):
+        """Drop one file from the index (after deleting it from disk)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self._conn.commit()
+
+    def files(self, directory: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Indexed files, newest first"""
+        query = "SELECT * FROM files"
+        params: tuple = ()
+        if directory is not None:
+            query += " WHERE directory = ?"
+            params = (directory,)
+        return self._fetch(query + " ORDER BY mtime DESC", params)
+
+    def directory_totals(self) -> Dict[str, Dict[str, int]]:
+        """File count, bytes and rows per directory"""
+        rows = self._fetch("""
+            SELECT directory, COUNT(*) AS files, COALESCE(SUM(size_bytes), 0) AS size_bytes,
+                   COALESCE(SUM(num_rows), 0) AS records
+            FROM files GROUP BY directory
+        """)
+        totals = {name: {"files": 0, "size_bytes": 0, "records": 0} for name in self.directories}
+        for row in rows:
+            totals[row.pop("directory")] = row
+        return totals
+
+    def column_stats(self, path: str) -> List[Dict[str, Any]]:
+        """Per-column min/max/null counts aggregated over a file's row groups"""
+        rows = self._fetch(
+            "SELECT column_name, type, min_value, max_value, null_count FROM column_stats WHERE path = ?",
+            (path,),
+        )
+        for row in rows:
+            for key in ("min_value", "max_value"):
+                if row[key] is not None:
+                    row[key] = json.loads(row[key])
+        return rows
+
+    def candidate_files(self, directory: str, ranges: Dict[str, tuple]) -> List[Dict[str, Any]]:
+        """
+        Files in a directory whose min/max may overlap every (low, high) column range.
+
+        Bounds are inclusive and either end may be None. Missing or incomparable
+        statistics never prune a file.
+        """
+        files = {entry["path"]: entry for entry in self.files(directory) if entry["error"] is None}
+        if not ranges or not files:
+            return sorted(files.values(), key=lambda entry: entry["name"])
+
+        placeholders = ", ".join("?" * len(ranges))
+        stats = self._fetch(
+            f"""
+            SELECT cs.path, cs.column_name, cs.min_value, cs.max_value
+            FROM column_stats cs JOIN files f ON f.path = cs.path
+            WHERE f.directory = ? AND cs.column_name IN ({placeholders})
+            """,
+            (directory, *ranges.keys()),
+        )
+        for row in stats:
+            if row["path"] not in files or row["min_value"] is None or row["max_value"] is None:
+                continue
+            low, high = ranges[row["column_name"]]
+            try:
+                col_min = _comparable(json.loads(row["min_value"]), low if low is not None else high)
+                col_max = _comparable(json.loads(row["max_value"]), low if low is not None else high)
+                if (high is not None and col_min > high) or (low is not None and col_max < low):
+                    del files[row["path"]]
+            except (TypeError, ValueError):
+                continue
+        return sorted(files.values(), key=lambda entry: entry["name"])
+
+    def status(self) -> Dict[str, Any]:
+        """Index location, size and the result of the last refresh"""
+        return {
+            "db_path": self.db_path,
+            "indexed_files": self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            "rescan_interval": self.rescan_interval,
+            "background": self._thread is not None and self._thread.is_alive(),
+            "last_refresh": self._last_refresh,
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.rescan_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Parquet catalog rescan error: {e}")
+
+    def _fetch(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            names = [col[0] for col in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def _current_dir_mtimes(self) -> Dict[str, float]:
+        mtimes = {}
+        for dir_name, dir_path in self.directories.items():
+            try:
+                mtimes[dir_name] = os.stat(dir_path).st_mtime
+            except OSError:
+                mtimes[dir_name] = 0.0
+        return mtimes
+
+    def _index_file(self, directory: str, name: str, path: str, stat: os.stat_result):
+        """Read one footer and upsert its file row and column stats"""
+        record = {
+            "path": path,
+            "directory": directory,
+            "name": name,
+            "size_bytes": stat.st_size,
+            "mtime": stat.st_mtime,
+            "ctime": stat.st_ctime,
+            "num_rows": 0,
+            "num_columns": 0,
+            "num_row_groups": 0,
+            "schema_hash": None,
+            "error": None,
+            "indexed_at": time.time(),
+        }
+        column_rows = []
+        try:
+            parquet_file = pq.ParquetFile(path)
+            metadata = parquet_file.metadata
+            schema = parquet_file.schema_arrow
+            record.update({
+                "num_rows": metadata.num_rows,
+                "num_columns": metadata.num_columns,
+                "num_row_groups": metadata.num_row_groups,
+                "schema_hash": hashlib.sha1(str(schema).encode("utf-8")).hexdigest()[:16],
+            })
+            column_rows = self._column_stats_from_footer(path, metadata, schema)
+        except Exception as e:
+            record["error"] = str(e)
+
+        self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        self._conn.execute(
+            f"INSERT INTO files ({', '.join(record)}) VALUES ({', '.join('?' * len(record))})",
+            tuple(record.values()),
+        )
+        self._conn.executemany(
+            "INSERT INTO column_stats (path, column_name, type, min_value, max_value, null_count) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            column_rows,
+        )
+
+    def _column_stats_from_footer(self, path: str, metadata, schema) -> List[tuple]:
+        """Fold row group statistics into one min/max/null_count per top-level column"""
+        folded: Dict[str, Dict[str, Any]] = {}
+        for rg in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg)
+            for c in range(row_group.num_columns):
+                chunk = row_group.column(c)
+                name = chunk.path_in_schema
+                entry = folded.setdefault(name, {"min": None, "max": None, "nulls": 0, "complete": True})
+                stats = chunk.statistics
+                if stats is None or not stats.has_min_max:
+                    entry["complete"] = False
+                    continue
+                try:
+                    if entry["min"] is None or stats.min < entry["min"]:
+                        entry["min"] = stats.min
+                    if entry["max"] is None or stats.max > entry["max"]:
+                        entry["max"] = stats.max
+                except TypeError:
+                    entry["complete"] = False
+                if stats.has_null_count:
+                    entry["nulls"] += stats.null_count
+
+        rows = []
+        for field in schema:
+            entry = folded.get(field.name)
+            if entry is None:
+                continue
+            # A row group without statistics makes the file-level bounds unknown
+            complete = entry["complete"]
+            rows.append((
+                path,
+                field.name,
+                str(field.type),
+                _stat_value(entry["min"]) if complete else None,
+                _stat_value(entry["max"]) if complete else None,
+                entry["nulls"],
+            ))
+        return rows
@@ -3,12 +3,30 @@ Parquet File Management Module
 Provides functions to manage Parquet storage for backtesting data
 """
 
+import io
+import json
 import os
+import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Any, Optional, Union
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    from server.parquet_catalog import ParquetCatalog
+except ImportError:
+    from parquet_catalog import ParquetCatalog
+
+# Directories that hold market data and can be queried as datasets
+QUERYABLE_DIRECTORIES = ('bars', 'quotes', 'trades')
+
+# Column names tried, in order, when the caller does not name the filter columns
+INSTRUMENT_COLUMNS = ('instrument_id', 'symbol', 'instrument')
+TIME_COLUMNS = ('ts_event', 'timestamp', 'ts_init', 'time')
+
+EPOCH = datetime(1970, 1, 1)
+
 class ParquetManager:
     """Manager class for Parquet file operations"""
     
@@ -20,20 +38,24 @@ class ParquetManager:
             'trades': f"{base_path}/trades",
             'backtests': f"{base_path}/backtests"
         }
+        self.catalog = ParquetCatalog(
+            self.directories,
+            os.environ.get('PARQUET_CATALOG_PATH', f"{base_path}/.catalog.sqlite"),
+            rescan_interval=float(os.environ.get('PARQUET_CATALOG_RESCAN', '60')),
+        )
+    
+    def _fresh_catalog(self) -> ParquetCatalog:
+        """Catalog synced with any directory changes, with the background rescan running"""
+        self.catalog.start()
+        self.catalog.ensure_fresh()
+        return self.catalog
     
     def get_overview(self) -> Dict[str, Any]:
         """Get overview of Parquet storage"""
         try:
-            total_files = 0
-            total_size = 0
-            
-            for dir_name, dir_path in self.directories.items():
-                if os.path.exists(dir_path):
-                    for file in os.listdir(dir_path):
-                        if file.endswith('.parquet'):
-                            total_files += 1
-                            file_path = os.path.join(dir_path, file)
-                            total_size += os.path.getsize(file_path)
+            totals = self._fresh_catalog().directory_totals()
+            total_files = sum(t["files"] for t in totals.values())
+            total_size = sum(t["size_bytes"] for t in totals.values())
             
             return {
                 "base_path": self.base_path,
@@ -50,51 +72,35 @@ class ParquetManager:
         """List all directories with file counts"""
         directories = []
         
+        try:
+            catalog = self._fresh_catalog()
+        except Exception as e:
+            return [
+                {"name": name, "path": path, "error": str(e), "files": [], "file_count": 0}
+                for name, path in self.directories.items()
+            ]
+        
         for dir_name, dir_path in self.directories.items():
-            try:
-                if not os.path.exists(dir_path):
-                    os.makedirs(dir_path, exist_ok=True)
-                
-                files = []
-                total_size = 0
-                
-                for file in os.listdir(dir_path):
-                    if file.endswith('.parquet'):
-                        file_path = os.path.join(dir_path, file)
-                        file_stat = os.stat(file_path)
-                        
-                        # Get parquet file metadata
-                        try:
-                            parquet_file = pq.ParquetFile(file_path)
-                            num_rows = parquet_file.metadata.num_rows
-                        except:
-                            num_rows = 0
-                        
-                        files.append({
-                            "name": file,
-                            "size": self._format_bytes(file_stat.st_size),
-                            "size_bytes": file_stat.st_size,
-                            "records": num_rows,
-                            "modified": datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc).isoformat()
-                        })
-                        total_size += file_stat.st_size
-                
-                directories.append({
-                    "name": dir_name,
-                    "path": dir_path,
-                    "files": sorted(files, key=lambda x: x['modified'], reverse=True),
-                    "file_count": len(files),
-                    "total_size": self._format_bytes(total_size),
-                    "total_size_bytes": total_size
-                })
-            except Exception as e:
-                directories.append({
-                    "name": dir_name,
-                    "path": dir_path,
-                    "error": str(e),
-                    "files": [],
-                    "file_count": 0
-                })
+            files = [
+                {
+                    "name": entry["name"],
+                    "size": self._format_bytes(entry["size_bytes"]),
+                    "size_bytes": entry["size_bytes"],
+                    "records": entry["num_rows"],
+                    "modified": datetime.fromtimestamp(entry["mtime"], tz=timezone.utc).isoformat()
+                }
+                for entry in catalog.files(dir_name)
+            ]
+            total_size = sum(f["size_bytes"] for f in files)
+            
+            directories.append({
+                "name": dir_name,
+                "path": dir_path,
+                "files": files,
+                "file_count": len(files),
+                "total_size": self._format_bytes(total_size),
+                "total_size_bytes": total_size
+            })
         
         return directories
     
@@ -115,7 +121,7 @@ class ParquetManager:
             # Get Parquet metadata
             parquet_file = pq.ParquetFile(file_path)
             metadata = parquet_file.metadata
-            schema = parquet_file.schema
+            schema = parquet_file.schema_arrow
             
             return {
                 "name": filename,
@@ -128,6 +134,7 @@ class ParquetManager:
                 "num_columns": metadata.num_columns,
                 "num_row_groups": metadata.num_row_groups,
                 "format_version": metadata.format_version,
+                "column_stats": self.catalog.column_stats(file_path),
                 "columns": [
                     {
                         "name": field.name,
@@ -139,8 +146,15 @@ class ParquetManager:
         except Exception as e:
             return {"error": str(e)}
     
-    def read_file_preview(self, directory: str, filename: str, limit: int = 10) -> Dict[str, Any]:
-        """Read preview of Parquet file"""
+    def read_file_preview(self, directory: str, filename: str, limit: int = 10, offset: int = 0,
+                          columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Read a window of rows from a Parquet file
+        
+        Only the row groups overlapping [offset, offset + limit) are decoded, batch by
+        batch, and only the projected columns. total_rows comes from the footer, so
+        the cost depends on the rows requested rather than the file size.
+        """
         try:
             dir_path = self.directories.get(directory)
             if not dir_path:
@@ -150,22 +164,232 @@ class ParquetManager:
             if not os.path.exists(file_path):
                 return {"error": f"File '{filename}' not found"}
             
-            # Read parquet file
-            table = pq.read_table(file_path)
-            df = table.to_pandas()
+            parquet_file = pq.ParquetFile(file_path)
+            metadata = parquet_file.metadata
+            schema = parquet_file.schema_arrow
+            
+            if columns:
+                unknown = [name for name in columns if schema.get_field_index(name) < 0]
+                if unknown:
+                    return {"error": f"Unknown columns: {', '.join(unknown)}"}
+            column_names = list(columns) if columns else schema.names
             
-            # Get preview
-            preview_df = df.head(limit)
+            offset = max(0, offset)
+            limit = max(0, limit)
+            row_groups, skip = self._row_groups_for_window(metadata, offset, limit)
+            
+            rows: List[Dict[str, Any]] = []
+            if row_groups and limit:
+                batches = parquet_file.iter_batches(
+                    batch_size=max(1, min(skip + limit, 65536)),
+                    row_groups=row_groups,
+                    columns=columns or None,
+                )
+                for batch in batches:
+                    if skip >= batch.num_rows:
+                        skip -= batch.num_rows
+                        continue
+                    window = batch.slice(skip, limit - len(rows))
+                    skip = 0
+                    rows.extend(window.to_pylist())
+                    if len(rows) >= limit:
+                        break
+            
+            return {
+                "columns": column_names,
+                "rows": rows,
+                "total_rows": metadata.num_rows,
+                "preview_rows": len(rows),
+                "offset": offset,
+                "limit": limit,
+                "num_row_groups": metadata.num_row_groups,
+                "row_groups_read": row_groups,
+            }
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _row_groups_for_window(self, metadata, offset: int, limit: int):
+        """Row group indexes overlapping [offset, offset + limit) and rows to skip in the first"""
+        row_groups = []
+        skip = 0
+        start = 0
+        end = offset + limit
+        for i in range(metadata.num_row_groups):
+            num_rows = metadata.row_group(i).num_rows
+            stop = start + num_rows
+            if stop > offset and start < end:
+                if not row_groups:
+                    skip = offset - start
+                row_groups.append(i)
+            if stop >= end:
+                break
+            start = stop
+        return row_groups, skip
+    
+    def query(self, directory: str, instrument_id: Optional[str] = None,
+              start: Optional[Union[str, int]] = None, end: Optional[Union[str, int]] = None,
+              columns: Optional[List[str]] = None, limit: int = 1000,
+              instrument_column: Optional[str] = None, time_column: Optional[str] = None) -> Dict[str, Any]:
+        """Run a filtered query over a data directory and return the matching rows"""
+        try:
+            plan = self._plan_query(directory, instrument_id, start, end, columns,
+                                    instrument_column, time_column)
+            rows: List[Dict[str, Any]] = []
+            truncated = False
+            for batch in self._scan(plan, limit + 1):
+                rows.extend(batch.to_pylist())
+            if len(rows) > limit:
+                rows = rows[:limit]
+                truncated = True
             
             return {
-                "columns": list(df.columns),
-                "rows": preview_df.to_dict('records'),
-                "total_rows": len(df),
-                "preview_rows": len(preview_df)
+                "columns": plan["columns"],
+                "rows": rows,
+                "count": len(rows),
+                "truncated": truncated,
+                **plan["stats"],
             }
         except Exception as e:
             return {"error": str(e)}
     
+    def stream_query(self, directory: str, instrument_id: Optional[str] = None,
+                     start: Optional[Union[str, int]] = None, end: Optional[Union[str, int]] = None,
+                     columns: Optional[List[str]] = None, limit: Optional[int] = None,
+                     format: str = 'ndjson', instrument_column: Optional[str] = None,
+                     time_column: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Stream a filtered query as NDJSON lines or an Arrow IPC stream
+        
+        The query is planned before the first chunk is produced, so bad arguments
+        raise immediately instead of in the middle of a response.
+        """
+        if format not in ('ndjson', 'arrow'):
+            raise ValueError(f"Unsupported stream format '{format}'")
+        plan = self._plan_query(directory, instrument_id, start, end, columns,
+                                instrument_column, time_column)
+        if format == 'ndjson':
+            return self._stream_ndjson(plan, limit)
+        return self._stream_arrow(plan, limit)
+    
+    def _stream_ndjson(self, plan: Dict[str, Any], limit: Optional[int]) -> Iterator[bytes]:
+        for batch in self._scan(plan, limit):
+            lines = [json.dumps(row, default=_json_default) for row in batch.to_pylist()]
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    
+    def _stream_arrow(self, plan: Dict[str, Any], limit: Optional[int]) -> Iterator[bytes]:
+        sink = io.BytesIO()
+        writer = pa.ipc.new_stream(sink, plan["schema"])
+        yield _take(sink)
+        for batch in self._scan(plan, limit):
+            writer.write_batch(batch)
+            yield _take(sink)
+        writer.close()
+        yield _take(sink)
+    
+    def _plan_query(self, directory: str, instrument_id: Optional[str], start, end,
+                    columns: Optional[List[str]], instrument_column: Optional[str],
+                    time_column: Optional[str]) -> Dict[str, Any]:
+        """
+        Resolve filter columns, prune files with catalog min/max stats, then prune
+        row groups with footer statistics. Only the surviving row groups are read.
+        """
+        if directory not in QUERYABLE_DIRECTORIES:
+            raise ValueError(f"Directory '{directory}' is not queryable")
+        
+        catalog = self._fresh_catalog()
+        all_files = catalog.files(directory)
+        if not all_files:
+            raise ValueError(f"No Parquet files in '{directory}'")
+        
+        schema = ds.dataset(min(all_files, key=lambda f: f["name"])["path"], format="parquet").schema
+        instrument_column = self._resolve_column(schema, instrument_column, INSTRUMENT_COLUMNS,
+                                                 required=instrument_id is not None)
+        time_column = self._resolve_column(schema, time_column, TIME_COLUMNS,
+                                           required=start is not None or end is not None)
+        if columns:
+            unknown = [name for name in columns if schema.get_field_index(name) < 0]
+            if unknown:
+                raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        
+        expression = None
+        ranges: Dict[str, tuple] = {}
+        if instrument_id is not None:
+            expression = ds.field(instrument_column) == instrument_id
+            ranges[instrument_column] = (instrument_id, instrument_id)
+        if start is not None or end is not None:
+            time_type = schema.field(time_column).type
+            low = _time_bound(start, time_type)
+            high = _time_bound(end, time_type)
+            if low is not None:
+                condition = ds.field(time_column) >= pa.scalar(low, type=time_type)
+                expression = condition if expression is None else expression & condition
+            if high is not None:
+                # End is exclusive for rows; the catalog prune treats it as an inclusive bound
+                condition = ds.field(time_column) < pa.scalar(high, type=time_type)
+                expression = condition if expression is None else expression & condition
+            ranges[time_column] = (low, high)
+        
+        candidates = catalog.candidate_files(directory, ranges)
+        row_groups = []
+        if candidates:
+            dataset = ds.dataset([f["path"] for f in candidates], schema=schema, format="parquet")
+            for fragment in dataset.get_fragments():
+                # split_by_row_group drops row groups whose statistics cannot satisfy the filter
+                row_groups.extend(fragment.split_by_row_group(filter=expression)
+                                  if expression is not None else [fragment])
+        
+        projected = list(columns) if columns else schema.names
+        return {
+            "dataset_schema": schema,
+            "schema": pa.schema([schema.field(name) for name in projected]),
+            "columns": projected,
+            "filter": expression,
+            "fragments": row_groups,
+            "stats": {
+                "files_total": len(all_files),
+                "files_scanned": len(candidates),
+                "row_groups_total": sum(f["num_row_groups"] for f in all_files),
+                # Split fragments hold one row group each; unfiltered scans read whole files
+                "row_groups_scanned": len(row_groups) if expression is not None
+                                      else sum(f["num_row_groups"] for f in candidates),
+                "instrument_column": instrument_column,
+                "time_column": time_column,
+            },
+        }
+    
+    def _scan(self, plan: Dict[str, Any], limit: Optional[int]) -> Iterator[pa.RecordBatch]:
+        """Record batches from the planned row groups, truncated at limit"""
+        remaining = limit
+        for fragment in plan["fragments"]:
+            batches = fragment.to_batches(
+                schema=plan["dataset_schema"],
+                columns=plan["columns"],
+                filter=plan["filter"],
+            )
+            for batch in batches:
+                if batch.num_rows == 0:
+                    continue
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    batch = batch.slice(0, remaining)
+                    remaining -= batch.num_rows
+                yield batch
+            if remaining is not None and remaining <= 0:
+                return
+    
+    def _resolve_column(self, schema, requested: Optional[str], candidates: tuple, required: bool) -> Optional[str]:
+        if requested:
+            if schema.get_field_index(requested) < 0:
+                raise ValueError(f"Unknown column '{requested}'")
+            return requested
+        for name in candidates:
+            if schema.get_field_index(name) >= 0:
+                return name
+        if required:
+            raise ValueError(f"None of the columns {', '.join(candidates)} exist; pass the column name explicitly")
+        return None
+    
     def delete_file(self, directory: str, filename: str) -> bool:
         """Delete a Parquet file"""
         try:
@@ -176,6 +400,7 @@ class ParquetManager:
             file_path = os.path.join(dir_path, filename)
             if os.path.exists(file_path):
                 os.remove(file_path)
+                self.catalog.remove(file_path)
                 return True
             return False
         except Exception as e:
@@ -192,35 +417,17 @@ class ParquetManager:
             total_size = 0
             total_records = 0
             
-            for dir_name, dir_path in self.directories.items():
-                if os.path.exists(dir_path):
-                    dir_files = 0
-                    dir_size = 0
-                    dir_records = 0
-                    
-                    for file in os.listdir(dir_path):
-                        if file.endswith('.parquet'):
-                            dir_files += 1
-                            file_path = os.path.join(dir_path, file)
-                            file_size = os.path.getsize(file_path)
-                            dir_size += file_size
-                            
-                            try:
-                                parquet_file = pq.ParquetFile(file_path)
-                                dir_records += parquet_file.metadata.num_rows
-                            except:
-                                pass
-                    
-                    stats["directories"][dir_name] = {
-                        "files": dir_files,
-                        "size": self._format_bytes(dir_size),
-                        "size_bytes": dir_size,
-                        "records": dir_records
-                    }
-                    
-                    total_files += dir_files
-                    total_size += dir_size
-                    total_records += dir_records
+            for dir_name, totals in self._fresh_catalog().directory_totals().items():
+                stats["directories"][dir_name] = {
+                    "files": totals["files"],
+                    "size": self._format_bytes(totals["size_bytes"]),
+                    "size_bytes": totals["size_bytes"],
+                    "records": totals["records"]
+                }
+                
+                total_files += totals["files"]
+                total_size += totals["size_bytes"]
+                total_records += totals["records"]
             
             stats["total"] = {
                 "files": total_files,
@@ -233,6 +440,20 @@ class ParquetManager:
         except Exception as e:
             return {"error": str(e)}
     
+    def reindex(self) -> Dict[str, Any]:
+        """Rebuild the catalog from every file footer"""
+        try:
+            return self.catalog.reindex()
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def get_catalog_status(self) -> Dict[str, Any]:
+        """Get catalog location, size and last refresh result"""
+        try:
+            return self.catalog.status()
+        except Exception as e:
+            return {"error": str(e)}
+    
     def _format_bytes(self, bytes_value: int) -> str:
         """Format bytes in human-readable format"""
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -242,6 +463,40 @@ class ParquetManager:
         return f"{bytes_value:.1f} PB"
 
 
+def _time_bound(value: Optional[Union[str, int]], arrow_type) -> Any:
+    """
+    Convert an ISO string or epoch-nanosecond int into the time column's value space:
+    naive UTC datetimes for timestamp columns, epoch nanoseconds for integer columns
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        if pa.types.is_integer(arrow_type):
+            return (moment - EPOCH) // timedelta(microseconds=1) * 1000
+        return moment
+    if pa.types.is_timestamp(arrow_type):
+        return EPOCH + timedelta(microseconds=value // 1000)
+    return int(value)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _take(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
 # Global instance
 parquet_manager = ParquetManager()
 
@@ -256,8 +511,9 @@ def list_parquet_directories():
 def get_parquet_file_info(directory: str, filename: str):
     return parquet_manager.get_file_info(directory, filename)
 
-def read_parquet_file_preview(directory: str, filename: str, limit: int = 10):
-    return parquet_manager.read_file_preview(directory, filename, limit)
+def read_parquet_file_preview(directory: str, filename: str, limit: int = 10, offset: int = 0,
+                              columns: Optional[List[str]] = None):
+    return parquet_manager.read_file_preview(directory, filename, limit, offset, columns)
 
 def delete_parquet_file(directory: str, filename: str):
     return parquet_manager.delete_file(directory, filename)
@@ -265,3 +521,18 @@ def delete_parquet_file(directory: str, filename: str):
 def get_parquet_storage_stats():
     return parquet_manager.get_storage_stats()
 
+def query_parquet(directory: str, instrument_id: Optional[str] = None, start=None, end=None,
+                  columns: Optional[List[str]] = None, limit: int = 1000):
+    return parquet_manager.query(directory, instrument_id, start, end, columns, limit)
+
+def stream_parquet_query(directory: str, instrument_id: Optional[str] = None, start=None, end=None,
+                         columns: Optional[List[str]] = None, limit: Optional[int] = None,
+                         format: str = 'ndjson'):
+    return parquet_manager.stream_query(directory, instrument_id, start, end, columns, limit, format)
+
+def reindex_parquet_catalog():
+    return parquet_manager.reindex()
+
+def get_parquet_catalog_status():
+    return parquet_manager.get_catalog_status()
+
@@ -1,29 +1,88 @@
 #!/usr/bin/env python3
 """
 Populate PostgreSQL database with realistic trading data for testing
+
+Default mode inserts a few dozen rows. Bulk mode (--bulk) generates tables with the
+vectorized SyntheticMarketData and streams them through COPY ... FROM STDIN for load
+testing at production volumes:
+
+    python3 server/populate_database.py --bulk --scale 10 --format binary
 """
 
+import argparse
+import csv
+import io
+import math
+import multiprocessing
 import random
+import re
+import struct
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import psycopg2
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from postgres_manager import PostgreSQLManager
+from synthetic_data import (
+    INSTRUMENTS,
+    ORDER_SIDES,
+    ORDER_STATUSES,
+    ORDER_TYPES,
+    SyntheticMarketData,
+)
+
+ORDER_STATUS_WEIGHTS = [0.1, 0.7, 0.15, 0.03, 0.02]  # PENDING, FILLED, CANCELLED, REJECTED, EXPIRED
+
+# Column names and COPY binary types, in the order the row builders produce values
+TABLE_COLUMNS = {
+    "orders": [
+        ("order_id", "text"), ("instrument_id", "text"), ("side", "text"), ("order_type", "text"),
+        ("quantity", "numeric"), ("price", "numeric"), ("filled_qty", "numeric"), ("avg_px", "numeric"),
+        ("status", "text"), ("created_at", "timestamp"),
+    ],
+    "trades": [
+        ("trade_id", "text"), ("order_id", "text"), ("instrument_id", "text"), ("side", "text"),
+        ("quantity", "numeric"), ("price", "numeric"), ("commission", "numeric"),
+        ("realized_pnl", "numeric"), ("executed_at", "timestamp"),
+    ],
+    "positions": [
+        ("position_id", "text"), ("instrument_id", "text"), ("side", "text"), ("quantity", "numeric"),
+        ("entry_price", "numeric"), ("current_price", "numeric"), ("unrealized_pnl", "numeric"),
+        ("realized_pnl", "numeric"), ("status", "text"), ("opened_at", "timestamp"),
+        ("closed_at", "timestamp"),
+    ],
+    "bars": [
+        ("instrument_id", "text"), ("bar_type", "text"), ("open", "numeric"), ("high", "numeric"),
+        ("low", "numeric"), ("close", "numeric"), ("volume", "numeric"), ("timestamp", "timestamp"),
+    ],
+    "quote_ticks": [
+        ("instrument_id", "text"), ("bid_price", "numeric"), ("ask_price", "numeric"),
+        ("bid_size", "numeric"), ("ask_size", "numeric"), ("timestamp", "timestamp"),
+    ],
+    "trade_ticks": [
+        ("instrument_id", "text"), ("price", "numeric"), ("size", "numeric"),
+        ("aggressor_side", "text"), ("timestamp", "timestamp"),
+    ],
+}
 
-# Trading instruments
-INSTRUMENTS = [
-    ('BTCUSD', 'BTC/USD.SIM', 40000, 50000),
-    ('ETHUSD', 'ETH/USD.SIM', 2000, 3000),
-    ('EURUSD', 'EUR/USD.SIM', 1.05, 1.15),
-    ('GBPUSD', 'GBP/USD.SIM', 1.20, 1.30),
-    ('USDJPY', 'USD/JPY.SIM', 140, 150),
-    ('AUDUSD', 'AUD/USD.SIM', 0.65, 0.75),
-]
-
-ORDER_TYPES = ['MARKET', 'LIMIT', 'STOP', 'STOP_LIMIT']
-ORDER_SIDES = ['BUY', 'SELL']
-ORDER_STATUSES = ['PENDING', 'FILLED', 'CANCELLED', 'REJECTED', 'EXPIRED']
-POSITION_SIDES = ['LONG', 'SHORT', 'FLAT']
-POSITION_STATUSES = ['OPEN', 'CLOSED']
+# Bulk row counts at --scale 1; --scale 10 gives 10M orders and 50M quote ticks
+BULK_BASE_COUNTS = {
+    "orders": 1_000_000,
+    "trades": 700_000,
+    "positions": 100_000,
+    "bars": 500_000,
+    "quote_ticks": 5_000_000,
+    "trade_ticks": 2_000_000,
+}
+
+# Load order respecting foreign keys (trades reference orders)
+BULK_TABLE_ORDER = ["orders", "trades", "positions", "bars", "quote_ticks", "trade_ticks"]
+
+# Spacing of generated quote ticks and bars in bulk mode
+BULK_QUOTE_INTERVAL = 1
+BULK_BAR_INTERVAL = 60
 
 def random_price(min_price, max_price):
     """Generate random price within range"""
@@ -38,9 +97,9 @@ def random_quantity(instrument_code):
     else:  # Forex
         return round(random.uniform(1000, 100000), 8)
 
-def random_timestamp(days_ago=30):
+def random_timestamp(days_ago=30, now=None):
     """Generate random timestamp within last N days"""
-    now = datetime.now()
+    now = now or datetime.now()
     start = now - timedelta(days=days_ago)
     random_date = start + timedelta(
         seconds=random.randint(0, int((now - start).total_seconds()))
@@ -54,16 +113,393 @@ def calculate_pnl(entry_price, exit_price, quantity, side):
     else:  # SHORT
         return (entry_price - exit_price) * quantity
 
+# Row builders, shared by the INSERT and COPY paths
+def order_row(n, now=None):
+    """Order number n (1-based) as a tuple in TABLE_COLUMNS["orders"] order"""
+    instrument_code, instrument_id, min_price, max_price = random.choice(INSTRUMENTS)
+    order_type = random.choice(ORDER_TYPES)
+    side = random.choice(ORDER_SIDES)
+    status = random.choices(ORDER_STATUSES, weights=ORDER_STATUS_WEIGHTS)[0]
+
+    quantity = random_quantity(instrument_code)
+    price = random_price(min_price, max_price) if order_type != 'MARKET' else None
+    timestamp = random_timestamp(30, now)
+
+    # Calculate filled quantity
+    filled_qty = quantity if status == 'FILLED' else (
+        round(quantity * random.uniform(0, 1), 8) if status == 'PENDING' else 0
+    )
+
+    # Average fill price
+    avg_price = price if price else random_price(min_price, max_price)
+
+    return (f'TEST-O-{n:04d}', instrument_id, side, order_type, quantity,
+            price, filled_qty, avg_price, status, timestamp)
+
+def trade_row(n, order_count, now=None):
+    """Trade number n linked to a random one of the first order_count orders"""
+    instrument_code, instrument_id, min_price, max_price = random.choice(INSTRUMENTS)
+    side = random.choice(ORDER_SIDES)
+    quantity = random_quantity(instrument_code)
+    price = random_price(min_price, max_price)
+    timestamp = random_timestamp(30, now)
+
+    # Commission (0.1% of trade value)
+    commission = round(price * float(quantity) * 0.001, 2)
+
+    # P&L (for closed trades, random between -20% and +30%)
+    pnl = round(price * float(quantity) * random.uniform(-0.2, 0.3), 2)
+
+    return (f'TEST-T-{n:04d}', f'TEST-O-{random.randint(1, order_count):04d}', instrument_id, side,
+            quantity, price, commission, pnl, timestamp)
+
+def position_row(n, now=None):
+    """Position number n, 60% OPEN and 40% CLOSED"""
+    instrument_code, instrument_id, min_price, max_price = random.choice(INSTRUMENTS)
+
+    is_open = random.random() < 0.6
+    status = 'OPEN' if is_open else 'CLOSED'
+
+    # Side
+    if status == 'CLOSED':
+        side = 'FLAT'
+        quantity = 0
+    else:
+        side = random.choice(['LONG', 'SHORT'])
+        quantity = random_quantity(instrument_code)
+
+    # Prices
+    entry_price = random_price(min_price, max_price)
+    current_price = random_price(min_price, max_price)
+
+    # P&L calculations
+    if status == 'OPEN':
+        unrealized_pnl = calculate_pnl(entry_price, current_price, float(quantity), side)
+        realized_pnl = 0
+    else:
+        unrealized_pnl = 0
+        # For closed positions, realized P&L is between -30% and +50%
+        realized_pnl = entry_price * random.uniform(-0.3, 0.5) * 100
+
+    # Timestamps
+    opened_at = random_timestamp(30, now)
+    closed_at = opened_at + timedelta(hours=random.randint(1, 720)) if status == 'CLOSED' else None
+
+    return (f'TEST-P-{n:04d}', instrument_id, side, quantity, entry_price, current_price,
+            round(unrealized_pnl, 2), round(realized_pnl, 2), status, opened_at, closed_at)
+
+# COPY encoders
+_PG_EPOCH = datetime(2000, 1, 1)
+_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_BINARY_TRAILER = struct.pack('!h', -1)
+_NULL_FIELD = struct.pack('!i', -1)
+
+def _binary_numeric(value) -> bytes:
+    """PostgreSQL numeric wire format: base-10000 digit groups with weight, sign and scale"""
+    text = repr(value) if isinstance(value, float) else str(value)
+    if 'e' in text or 'E' in text or 'n' in text:
+        # Exponent notation (and inf/nan, which numeric rejects anyway): normalise via Decimal
+        text = format(Decimal(text), 'f')
+    negative = text.startswith('-')
+    integer, _, fraction = text.lstrip('+-').partition('.')
+    dscale = len(fraction)
+
+    groups = []
+    whole = int(integer)
+    while whole:
+        whole, group = divmod(whole, 10000)
+        groups.append(group)
+    groups.reverse()
+    weight = len(groups) - 1
+    if fraction:
+        fraction += '0' * (-len(fraction) % 4)
+        groups += [int(fraction[i:i + 4]) for i in range(0, len(fraction), 4)]
+
+    while groups and groups[0] == 0:
+        # Only reachable for |value| < 1, whose integer part contributed no groups
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight, negative = 0, False
+
+    count = len(groups)
+    return struct.pack(f'!ihhHH{count}H', 8 + 2 * count, count, weight,
+                       0x4000 if negative else 0, dscale, *groups)
+
+def _binary_text(value) -> bytes:
+    data = str(value).encode('utf-8')
+    return struct.pack('!i', len(data)) + data
+
+def _binary_timestamp(value) -> bytes:
+    # timestamp without time zone: microseconds since 2000-01-01
+    delta = value - _PG_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack('!iq', 8, micros)
+
+_BINARY_ENCODERS = {"text": _binary_text, "numeric": _binary_numeric, "timestamp": _binary_timestamp}
+
+def throughput(table: str, rows: float, sent: float, seconds: float) -> Dict[str, Any]:
+    """Result row for print_throughput()"""
+    return {
+        "table": table,
+        "rows": int(rows),
+        "bytes": int(sent),
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds else None,
+        "mb_per_sec": round(sent / seconds / 1e6, 2) if seconds else None,
+    }
+
+class CopyLoader:
+    """
+    Streams rows into a table with COPY ... FROM STDIN
+
+    Rows are encoded into an in-memory buffer of batch_rows rows (CSV or PostgreSQL
+    binary format), each buffer is sent as one COPY, and the transaction is
+    committed every commit_rows rows so a failure late in a large load keeps the
+    earlier batches. Arrow tables from SyntheticMarketData are written to CSV by
+    Arrow itself, without materialising Python rows.
+
+    Totals per table accumulate across calls; summary() reports them.
+    """
+
+    def __init__(self, conn, format: str = "csv", batch_rows: int = 50_000, commit_rows: int = 1_000_000):
+        if format not in ("csv", "binary"):
+            raise ValueError(f"Unsupported COPY format: {format}")
+        self.conn = conn
+        self.format = format
+        self.batch_rows = batch_rows
+        self.commit_rows = commit_rows
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self._uncommitted = 0
+
+    def load(self, table: str, rows: Iterable[Sequence[Any]],
+             progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """COPY rows into table; returns rows loaded, bytes sent, seconds and rows/s"""
+        columns = TABLE_COLUMNS[table]
+        encode = self._binary_encoder(columns) if self.format == "binary" else None
+        buffers = (
+            (len(batch), self._encode_binary(batch, encode) if encode else self._encode_csv(batch))
+            for batch in _batches(rows, self.batch_rows)
+        )
+        return self._copy(table, buffers, progress)
+
+    def load_arrow(self, table: str, tables: Iterable[pa.Table],
+                   progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """COPY Arrow tables (columns named as in TABLE_COLUMNS) into table"""
+        columns = TABLE_COLUMNS[table]
+        names = [name for name, _ in columns]
+        encode = self._binary_encoder(columns) if self.format == "binary" else None
+
+        def buffers():
+            for source in tables:
+                for batch in source.select(names).to_batches(max_chunksize=self.batch_rows):
+                    if encode:
+                        rows = list(zip(*(column.to_pylist() for column in batch.columns)))
+                        yield batch.num_rows, self._encode_binary(rows, encode)
+                    else:
+                        yield batch.num_rows, self._encode_arrow_csv(batch)
+        return self._copy(table, buffers(), progress)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-table totals with throughput, in load order"""
+        return [throughput(table, t["rows"], t["bytes"], t["seconds"]) for table, t in self.totals.items()]
+
+    def _copy(self, table: str, buffers: Iterable[Tuple[int, io.BytesIO]],
+              progress: Optional[Callable[[int], None]]) -> Dict[str, Any]:
+        statement = "COPY {} ({}) FROM STDIN WITH (FORMAT {})".format(
+            table, ", ".join(name for name, _ in TABLE_COLUMNS[table]), self.format
+        )
+        loaded = sent = 0
+        started = time.perf_counter()
+        with self.conn.cursor() as cursor:
+            for count, buffer in buffers:
+                sent += buffer.getbuffer().nbytes
+                cursor.copy_expert(statement, buffer, size=1 << 20)
+                loaded += count
+                self._uncommitted += count
+                if self._uncommitted >= self.commit_rows:
+                    self.conn.commit()
+                    self._uncommitted = 0
+                if progress:
+                    progress(loaded)
+        self.conn.commit()
+        self._uncommitted = 0
+
+        elapsed = time.perf_counter() - started
+        totals = self.totals.setdefault(table, {"rows": 0, "bytes": 0, "seconds": 0.0})
+        totals["rows"] += loaded
+        totals["bytes"] += sent
+        totals["seconds"] += elapsed
+        return throughput(table, loaded, sent, elapsed)
+
+    @staticmethod
+    def _encode_arrow_csv(batch: pa.RecordBatch) -> io.BytesIO:
+        buffer = io.BytesIO()
+        # Nulls come out as empty unquoted fields, strings quoted: both what COPY CSV expects
+        pa_csv.write_csv(batch, buffer, pa_csv.WriteOptions(include_header=False))
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def _encode_csv(batch: List[Sequence[Any]]) -> io.BytesIO:
+        text = io.StringIO()
+        # None is written as an empty unquoted field, which COPY CSV reads as NULL
+        csv.writer(text, lineterminator='\n').writerows(batch)
+        return io.BytesIO(text.getvalue().encode('utf-8'))
+
+    @staticmethod
+    def _binary_encoder(columns: List[Tuple[str, str]]) -> Callable[[Sequence[Any]], bytes]:
+        encoders = [_BINARY_ENCODERS[kind] for _, kind in columns]
+        field_count = struct.pack('!h', len(encoders))
+
+        def encode(row: Sequence[Any]) -> bytes:
+            return field_count + b''.join(
+                _NULL_FIELD if value is None else encoder(value) for encoder, value in zip(encoders, row)
+            )
+        return encode
+
+    @staticmethod
+    def _encode_binary(batch: List[Sequence[Any]], encode) -> io.BytesIO:
+        buffer = io.BytesIO()
+        buffer.write(_BINARY_HEADER)
+        buffer.write(b''.join(map(encode, batch)))
+        buffer.write(_BINARY_TRAILER)
+        buffer.seek(0)
+        return buffer
+
+def _batches(rows: Iterable[Sequence[Any]], size: int) -> Iterator[List[Sequence[Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _progress_printer(total: int, steps: int = 10) -> Callable[[int], None]:
+    """Progress callback printing roughly every 1/steps of total"""
+    next_report = [total / steps]
+
+    def report(loaded: int):
+        if loaded >= next_report[0] and loaded < total:
+            print(f"   {loaded:,}/{total:,}")
+            next_report[0] += total / steps
+    return report
+
+def bulk_window_days(counts: Dict[str, int]) -> int:
+    """Days of history needed so per-instrument tick and bar counts fit in the window"""
+    per_instrument = lambda table: math.ceil(counts.get(table, 0) / len(INSTRUMENTS))
+    seconds = max(per_instrument("quote_ticks") * BULK_QUOTE_INTERVAL,
+                  per_instrument("bars") * BULK_BAR_INTERVAL)
+    return max(30, math.ceil(seconds / 86400) + 1)
+
+def bulk_counts(scale: float = 1.0, overrides: Optional[Dict[str, Optional[int]]] = None) -> Dict[str, int]:
+    """Row counts per table for a scale factor, with explicit per-table counts taking precedence"""
+    counts = {table: int(base * scale) for table, base in BULK_BASE_COUNTS.items()}
+    for table, count in (overrides or {}).items():
+        if count is not None:
+            counts[table] = count
+    return counts
+
+def print_throughput(results: List[Dict[str, Any]], wall_seconds: Optional[float] = None, workers: int = 1):
+    """Print the per-table COPY throughput report; seconds are summed over workers when parallel"""
+    print("\n" + "="*60)
+    print("BULK LOAD THROUGHPUT" + (f" ({workers} workers)" if workers > 1 else ""))
+    print("="*60)
+    print(f"{'table':<14}{'rows':>14}{'seconds':>10}{'rows/s':>12}{'MB/s':>8}")
+    for r in results:
+        print(f"{r['table']:<14}{r['rows']:>14,}{r['seconds']:>10.1f}{r['rows_per_sec'] or 0:>12,}{r['mb_per_sec'] or 0:>8}")
+    rows = sum(r['rows'] for r in results)
+    seconds = sum(r['seconds'] for r in results)
+    print("-"*60)
+    print(f"{'total':<14}{rows:>14,}{seconds:>10.1f}{round(rows / seconds) if seconds else 0:>12,}")
+    if wall_seconds:
+        print(f"{'wall clock':<14}{rows:>14,}{wall_seconds:>10.1f}{round(rows / wall_seconds):>12,}")
+    print("="*60 + "\n")
+
+# Parallel seeding: a coordinator partitions the load into independent tasks (an
+# activity chunk, or one instrument's chunk of bars / quotes / trade ticks) and a
+# process pool runs them, each worker with its own connection and COPY stream.
+# SyntheticMarketData is deterministic per chunk, so workers rebuild the same
+# generator from the coordinator's seed and window and need no data shipped to them.
+
+_worker: Dict[str, Any] = {}
+
+def seeding_tasks(data: SyntheticMarketData, counts: Dict[str, int], chunk_rows: int) -> List[Tuple[Any, ...]]:
+    """Independent (table, ...) units of work covering counts"""
+    tasks: List[Tuple[Any, ...]] = []
+    orders = counts.get("orders", 0)
+    trades = counts.get("trades", 0) if orders > 0 else 0
+    positions = counts.get("positions", 0)
+    if orders or positions:
+        chunks = max(math.ceil(max(orders, trades, positions) / chunk_rows), 1)
+        tasks.extend(("activity", c, chunks, orders, trades, positions) for c in range(chunks))
+    if counts.get("bars", 0) > 0:
+        # Every bar is aggregated from BULK_BAR_INTERVAL ticks, so bar chunks stay smaller
+        bar_rows = max(chunk_rows // 10, 1)
+        for k, first, n in data.tick_plan("bars", counts["bars"], BULK_BAR_INTERVAL):
+            tasks.extend(("bars", k, spec) for spec in data.chunks(first, n, BULK_BAR_INTERVAL, bar_rows))
+    if counts.get("quote_ticks", 0) > 0:
+        for k, first, n in data.tick_plan("quotes", counts["quote_ticks"], BULK_QUOTE_INTERVAL):
+            tasks.extend(("quote_ticks", k, spec) for spec in data.chunks(first, n, BULK_QUOTE_INTERVAL, chunk_rows))
+    if counts.get("trade_ticks", 0) > 0:
+        tasks.extend(("trade_ticks", k, spec, chunks)
+                      for k, spec, chunks in data.trade_tick_plan(counts["trade_ticks"], chunk_rows=chunk_rows))
+    return tasks
+
+def _init_seed_worker(settings: Dict[str, Any], window: Dict[str, Any], format: str,
+                      batch_rows: int, commit_rows: int):
+    """Pool initializer: one connection, loader and generator per worker process"""
+    conn = psycopg2.connect(**settings)
+    with conn.cursor() as cursor:
+        cursor.execute("SET synchronous_commit TO OFF")
+    conn.commit()
+    _worker["conn"] = conn
+    _worker["loader"] = CopyLoader(conn, format=format, batch_rows=batch_rows, commit_rows=commit_rows)
+    _worker["data"] = SyntheticMarketData(**window)
+
+def _run_seed_task(task: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+    """Generate and COPY one task; returns per-table totals for it"""
+    loader, data = _worker["loader"], _worker["data"]
+    loader.totals = {}
+    table = task[0]
+    if table == "activity":
+        chunk = data.activity_chunk(*task[1:])
+        # Orders commit before the trades that reference them
+        for name in ("orders", "trades", "positions"):
+            if chunk[name].num_rows:
+                loader.load_arrow(name, [chunk[name]])
+    elif table == "bars":
+        loader.load_arrow(table, [data.bar_chunk(task[1], task[2], BULK_BAR_INTERVAL)])
+    elif table == "quote_ticks":
+        loader.load_arrow(table, [data.quote_chunk(task[1], task[2], BULK_QUOTE_INTERVAL)])
+    elif table == "trade_ticks":
+        loader.load_arrow(table, [data.trade_tick_chunk(*task[1:])])
+    return loader.summary()
+
+def _run_statement(statement: str) -> Tuple[str, float]:
+    """Run one maintenance statement (CREATE INDEX, ANALYZE) on the worker's connection"""
+    conn = _worker["conn"]
+    started = time.perf_counter()
+    with conn.cursor() as cursor:
+        cursor.execute(statement)
+    conn.commit()
+    return statement, time.perf_counter() - started
+
 class DatabasePopulator:
     def __init__(self):
         self.pm = PostgreSQLManager()
-        self.conn = psycopg2.connect(
-            host='localhost',
-            port=5432,
-            database='nautilus',
-            user='nautilus_user',
-            password='nautilus_pass'
+        self.settings = dict(
+            host=self.pm.host,
+            port=self.pm.port,
+            database=self.pm.database,
+            user=self.pm.user,
+            password=self.pm.password
         )
+        self.conn = psycopg2.connect(**self.settings)
         self.cursor = self.conn.cursor()
     
     def clear_existing_data(self):
@@ -76,6 +512,13 @@ class DatabasePopulator:
         self.conn.commit()
         print("✅ Cleared existing test data")
     
+    def truncate_bulk_tables(self):
+        """Empty every table bulk mode writes to; much faster than DELETE at bulk volumes"""
+        print("Truncating bulk tables...")
+        self.cursor.execute("TRUNCATE trades, orders, positions, bars, quote_ticks, trade_ticks")
+        self.conn.commit()
+        print("✅ Truncated " + ", ".join(BULK_TABLE_ORDER))
+    
     def populate_instruments(self):
         """Ensure instruments exist"""
         print("\nPopulating instruments...")
@@ -88,151 +531,171 @@ class DatabasePopulator:
         self.conn.commit()
         print(f"✅ Populated {len(INSTRUMENTS)} instruments")
     
+    def _insert_rows(self, table, rows):
+        columns = ", ".join(name for name, _ in TABLE_COLUMNS[table])
+        placeholders = ", ".join(["%s"] * len(TABLE_COLUMNS[table]))
+        for row in rows:
+            self.cursor.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", row)
+        self.conn.commit()
+    
     def populate_orders(self, count=50):
         """Generate realistic orders"""
         print(f"\nPopulating {count} orders...")
-        
-        for i in range(count):
-            instrument_code, instrument_id, min_price, max_price = random.choice(INSTRUMENTS)
-            order_type = random.choice(ORDER_TYPES)
-            side = random.choice(ORDER_SIDES)
-            
-            # Determine status based on probabilities
-            status_weights = [0.1, 0.7, 0.15, 0.03, 0.02]  # PENDING, FILLED, CANCELLED, REJECTED, EXPIRED
-            status = random.choices(ORDER_STATUSES, weights=status_weights)[0]
-            
-            quantity = random_quantity(instrument_code)
-            price = random_price(min_price, max_price) if order_type != 'MARKET' else None
-            timestamp = random_timestamp(30)
-            
-            # Calculate filled quantity
-            filled_qty = quantity if status == 'FILLED' else (
-                round(quantity * random.uniform(0, 1), 8) if status == 'PENDING' else 0
-            )
-            
-            # Average fill price
-            avg_price = price if price else random_price(min_price, max_price)
-            
-            self.cursor.execute("""
-                INSERT INTO orders (
-                    order_id, instrument_id, side, order_type, quantity, 
-                    price, filled_qty, avg_px, status, created_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                f'TEST-O-{i+1:04d}',
-                instrument_id,
-                side,
-                order_type,
-                str(quantity),
-                str(price) if price else None,
-                str(filled_qty),
-                str(avg_price),
-                status,
-                timestamp
-            ))
-        
-        self.conn.commit()
+        self._insert_rows("orders", (order_row(i + 1) for i in range(count)))
         print(f"✅ Populated {count} orders")
     
-    def populate_trades(self, count=30):
+    def populate_trades(self, count=30, order_count=50):
         """Generate realistic trades"""
         print(f"\nPopulating {count} trades...")
-        
-        for i in range(count):
-            instrument_code, instrument_id, min_price, max_price = random.choice(INSTRUMENTS)
-            side = random.choice(ORDER_SIDES)
-            quantity = random_quantity(instrument_code)
-            price = random_price(min_price, max_price)
-            timestamp = random_timestamp(30)
-            
-            # Commission (0.1% of trade value)
-            commission = round(price * float(quantity) * 0.001, 2)
-            
-            # P&L (for closed trades, random between -20% and +30%)
-            pnl = round(price * float(quantity) * random.uniform(-0.2, 0.3), 2)
-            
-            self.cursor.execute("""
-                INSERT INTO trades (
-                    trade_id, order_id, instrument_id, side, quantity,
-                    price, commission, realized_pnl, executed_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                f'TEST-T-{i+1:04d}',
-                f'TEST-O-{random.randint(1, 50):04d}',  # Link to random order
-                instrument_id,
-                side,
-                str(quantity),
-                str(price),
-                str(commission),
-                str(pnl),
-                timestamp
-            ))
-        
-        self.conn.commit()
+        self._insert_rows("trades", (trade_row(i + 1, order_count) for i in range(count)))
         print(f"✅ Populated {count} trades")
     
     def populate_positions(self, count=15):
         """Generate realistic positions (mix of open and closed)"""
         print(f"\nPopulating {count} positions...")
-        
-        for i in range(count):
-            instrument_code, instrument_id, min_price, max_price = random.choice(INSTRUMENTS)
-            
-            # 60% OPEN, 40% CLOSED
-            is_open = random.random() < 0.6
-            status = 'OPEN' if is_open else 'CLOSED'
-            
-            # Side
-            if status == 'CLOSED':
-                side = 'FLAT'
-                quantity = 0
-            else:
-                side = random.choice(['LONG', 'SHORT'])
-                quantity = random_quantity(instrument_code)
-            
-            # Prices
-            entry_price = random_price(min_price, max_price)
-            current_price = random_price(min_price, max_price)
-            
-            # P&L calculations
-            if status == 'OPEN':
-                unrealized_pnl = calculate_pnl(entry_price, current_price, float(quantity), side)
-                realized_pnl = 0
-            else:
-                unrealized_pnl = 0
-                # For closed positions, realized P&L is between -30% and +50%
-                realized_pnl = entry_price * random.uniform(-0.3, 0.5) * 100
-            
-            # Timestamps
-            opened_at = random_timestamp(30)
-            closed_at = opened_at + timedelta(hours=random.randint(1, 720)) if status == 'CLOSED' else None
-            
-            self.cursor.execute("""
-                INSERT INTO positions (
-                    position_id, instrument_id, side, quantity, entry_price,
-                    current_price, unrealized_pnl, realized_pnl, status,
-                    opened_at, closed_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                f'TEST-P-{i+1:04d}',
-                instrument_id,
-                side,
-                str(quantity),
-                str(entry_price),
-                str(current_price),
-                str(round(unrealized_pnl, 2)),
-                str(round(realized_pnl, 2)),
-                status,
-                opened_at,
-                closed_at
-            ))
-        
-        self.conn.commit()
+        self._insert_rows("positions", (position_row(i + 1) for i in range(count)))
         print(f"✅ Populated {count} positions")
     
+    def bulk_populate(self, counts: Dict[str, int], format: str = "csv",
+                      batch_rows: int = 50_000, commit_rows: int = 1_000_000,
+                      seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """COPY counts[table] generated rows into each table; returns per-table throughput"""
+        # Durability is irrelevant for generated data and commit fsyncs dominate small batches
+        self.cursor.execute("SET synchronous_commit TO OFF")
+        loader = CopyLoader(self.conn, format=format, batch_rows=batch_rows, commit_rows=commit_rows)
+        data = SyntheticMarketData(seed=seed, days=bulk_window_days(counts))
+
+        orders = counts.get("orders", 0)
+        trades = counts.get("trades", 0) if orders > 0 else 0
+        positions = counts.get("positions", 0)
+        if counts.get("trades", 0) > 0 and orders <= 0:
+            print("⚠️  Skipping trades: they reference orders loaded in the same run")
+        if orders or positions:
+            print(f"\nCOPY {orders:,} orders, {trades:,} trades, {positions:,} positions ({format})...")
+            # Each chunk is self-contained (trades reference orders of the same chunk)
+            for chunk in data.trading_activity(orders, trades, positions, chunk_rows=commit_rows):
+                for table in ("orders", "trades", "positions"):
+                    if chunk[table].num_rows:
+                        loader.load_arrow(table, [chunk[table]])
+
+        streams = {
+            "bars": lambda n: data.bars(n, interval=BULK_BAR_INTERVAL),
+            "quote_ticks": lambda n: data.quote_ticks(n, interval=BULK_QUOTE_INTERVAL),
+            "trade_ticks": lambda n: data.trade_ticks(n),
+        }
+        for table, stream in streams.items():
+            count = counts.get(table, 0)
+            if count <= 0:
+                continue
+            print(f"\nCOPY {count:,} rows into {table} ({format})...")
+            loader.load_arrow(table, stream(count), progress=_progress_printer(count))
+
+        results = sorted(loader.summary(), key=lambda r: BULK_TABLE_ORDER.index(r["table"]))
+        for result in results:
+            print(f"✅ {result['table']}: {result['rows']:,} rows in {result['seconds']}s "
+                  f"({result['rows_per_sec']:,} rows/s)")
+        return results
+    
+    def secondary_indexes(self, tables: Sequence[str]) -> List[Tuple[str, str]]:
+        """(name, definition) of indexes on tables that do not back a constraint"""
+        self.cursor.execute("""
+            SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class t ON t.oid = i.indrelid
+            WHERE t.relname = ANY(%s)
+              AND t.relnamespace = 'public'::regnamespace
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            ORDER BY 1
+        """, (list(tables),))
+        return self.cursor.fetchall()
+    
+    def drop_indexes(self, indexes: List[Tuple[str, str]]):
+        for name, _ in indexes:
+            self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        self.conn.commit()
+    
+    def create_indexes(self, indexes: List[Tuple[str, str]]):
+        for _, definition in indexes:
+            # IF NOT EXISTS: a rebuild interrupted part way may have created some already
+            self.cursor.execute(re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX IF NOT EXISTS ", definition))
+        self.conn.commit()
+    
+    def _restore_indexes(self, indexes: List[Tuple[str, str]]):
+        """Put back indexes a failed load dropped; never raises, so the load error is what surfaces"""
+        try:
+            self.conn.rollback()
+            self.create_indexes(indexes)
+            print(f"Restored {len(indexes)} indexes after the failed load")
+        except Exception as e:
+            print(f"❌ Could not restore {len(indexes)} indexes ({e}); recreate them with:")
+            for _, definition in indexes:
+                print(f"   {definition};")
+
+    def parallel_populate(self, counts: Dict[str, int], workers: int, format: str = "csv",
+                          batch_rows: int = 50_000, commit_rows: int = 1_000_000,
+                          seed: Optional[int] = None) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        bulk_populate across a pool of worker processes; returns per-table totals and wall seconds
+
+        Secondary indexes are dropped for the load and rebuilt afterwards, one index per
+        worker, then every table is analyzed. Primary keys stay: trades check orders.
+        """
+        data = SyntheticMarketData(seed=seed, days=bulk_window_days(counts))
+        window = {"seed": data.seed, "start": data.start, "end": data.end}
+        tasks = seeding_tasks(data, counts, commit_rows)
+        total = sum(count for table, count in counts.items()
+                    if count > 0 and not (table == "trades" and counts.get("orders", 0) <= 0))
+        if counts.get("trades", 0) > 0 and counts.get("orders", 0) <= 0:
+            print("⚠️  Skipping trades: they reference orders loaded in the same run")
+
+        indexes = self.secondary_indexes(BULK_TABLE_ORDER)
+        self.drop_indexes(indexes)
+        print(f"\nDropped {len(indexes)} secondary indexes for the load")
+
+        started = time.perf_counter()
+        totals: Dict[str, Dict[str, float]] = {}
+        try:
+            with multiprocessing.Pool(workers, initializer=_init_seed_worker,
+                                      initargs=(self.settings, window, format, batch_rows, commit_rows)) as pool:
+                try:
+                    print(f"COPY {total:,} rows as {len(tasks)} tasks on {workers} workers ({format})...")
+                    progress = _progress_printer(total)
+                    loaded = 0
+                    for summary in pool.imap_unordered(_run_seed_task, tasks):
+                        for result in summary:
+                            table = totals.setdefault(result["table"], {"rows": 0, "bytes": 0, "seconds": 0.0})
+                            table["rows"] += result["rows"]
+                            table["bytes"] += result["bytes"]
+                            table["seconds"] += result["seconds"]
+                            loaded += result["rows"]
+                        progress(loaded)
+                    print(f"✅ Loaded {loaded:,} rows in {time.perf_counter() - started:.1f}s")
+
+                    print(f"\nRebuilding {len(indexes)} indexes...")
+                    for statement, seconds in pool.imap_unordered(_run_statement, [d for _, d in indexes]):
+                        # Only what is still missing gets recreated if a later rebuild fails
+                        indexes = [index for index in indexes if index[1] != statement]
+                        print(f"   {statement.split(' ON ')[0].split()[-1]}: {seconds:.1f}s")
+                    tables = [table for table in BULK_TABLE_ORDER if table in totals]
+                    pool.map(_run_statement, [f"ANALYZE {table}" for table in tables])
+                    print(f"✅ Analyzed {', '.join(tables)}")
+                finally:
+                    # Wait for the workers to exit, so their connections and locks are gone
+                    # before any index is restored below
+                    pool.terminate()
+                    pool.join()
+        except BaseException:
+            if indexes:
+                self._restore_indexes(indexes)
+            raise
+        wall = time.perf_counter() - started
+
+        results = [
+            throughput(table, t["rows"], t["bytes"], t["seconds"])
+            for table, t in sorted(totals.items(), key=lambda item: BULK_TABLE_ORDER.index(item[0]))
+        ]
+        return results, wall
+    
     def print_summary(self):
         """Print summary of populated data"""
         print("\n" + "="*60)
@@ -282,25 +745,67 @@ class DatabasePopulator:
         self.cursor.close()
         self.conn.close()
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Populate PostgreSQL with test trading data")
+    parser.add_argument("--bulk", action="store_true", help="load with COPY at --scale volumes")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="bulk volume multiplier (1 = 1M orders, 5M quote ticks)")
+    parser.add_argument("--format", choices=["csv", "binary"], default="csv", help="COPY format")
+    parser.add_argument("--batch-rows", type=int, default=50_000, help="rows per COPY buffer")
+    parser.add_argument("--commit-rows", type=int, default=1_000_000, help="rows per transaction")
+    parser.add_argument("--truncate", action="store_true",
+                        help="TRUNCATE bulk tables first instead of deleting TEST- rows "
+                             "(market data tables are otherwise appended to)")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible data")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for --bulk; above 1 loads tables and instruments in parallel")
+    for table in BULK_TABLE_ORDER:
+        parser.add_argument(f"--{table.replace('_', '-')}", dest=table, type=int,
+                            help=f"exact {table} row count (overrides --scale)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main execution"""
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+
     print("\n🚀 Starting database population...\n")
-    
+
     populator = DatabasePopulator()
-    
+
     try:
         # Clear existing test data
-        populator.clear_existing_data()
-        
+        if args.truncate:
+            populator.truncate_bulk_tables()
+        else:
+            populator.clear_existing_data()
+            if args.bulk:
+                # Market data rows carry no TEST- marker to delete by, so repeated runs stack up
+                print("⚠️  bars, quote_ticks and trade_ticks are appended to; pass --truncate to replace them")
+
         # Populate tables
         populator.populate_instruments()
-        populator.populate_orders(count=50)
-        populator.populate_trades(count=30)
-        populator.populate_positions(count=15)
-        
-        # Print summary
-        populator.print_summary()
-        
+        if args.bulk and args.workers > 1:
+            counts = bulk_counts(args.scale, {table: getattr(args, table) for table in BULK_TABLE_ORDER})
+            results, wall = populator.parallel_populate(counts, args.workers, format=args.format,
+                                                        batch_rows=args.batch_rows, commit_rows=args.commit_rows,
+                                                        seed=args.seed)
+            print_throughput(results, wall_seconds=wall, workers=args.workers)
+        elif args.bulk:
+            counts = bulk_counts(args.scale, {table: getattr(args, table) for table in BULK_TABLE_ORDER})
+            results = populator.bulk_populate(counts, format=args.format,
+                                              batch_rows=args.batch_rows, commit_rows=args.commit_rows,
+                                              seed=args.seed)
+            print_throughput(results)
+        else:
+            populator.populate_orders(count=50)
+            populator.populate_trades(count=30)
+            populator.populate_positions(count=15)
+
+            # Print summary
+            populator.print_summary()
+
     except Exception as e:
         print(f"\n❌ Error: {e}")
         raise
@@ -309,4 +814,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -4,273 +4,624 @@ Provides functions to monitor and manage PostgreSQL database
 """
 
 import psycopg2
+from psycopg2 import sql
+import asyncio
+import base64
+import io
+import json
 import os
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Dict, Iterator, List, Any, Optional
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Upper bounds (ms) of the acquisition latency histogram buckets
+ACQUIRE_LATENCY_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+# Keyset orderings for query_table/stream_table, matching the indexes in docker/init-postgres.sql.
+# The trailing unique column breaks ties so every row has exactly one position.
+KEYSET_ORDERINGS = {
+    "orders": [("created_at", "DESC"), ("order_id", "DESC")],
+    "trades": [("executed_at", "DESC"), ("trade_id", "DESC")],
+    "positions": [("opened_at", "DESC"), ("position_id", "DESC")],
+    "bars": [("instrument_id", "ASC"), ("timestamp", "DESC"), ("id", "DESC")],
+    "quote_ticks": [("instrument_id", "ASC"), ("timestamp", "DESC"), ("id", "DESC")],
+    "trade_ticks": [("instrument_id", "ASC"), ("timestamp", "DESC"), ("id", "DESC")],
+    "instruments": [("instrument_id", "ASC")],
+    "accounts": [("account_id", "ASC")],
+}
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class PostgreSQLConnectionPool:
+    """
+    Bounded, thread-safe psycopg2 connection pool
+    
+    - Callers block (up to acquire_timeout) when all connections are checked out
+    - Connections idle longer than health_check_after are pinged before reuse
+    - Connections idle longer than idle_timeout are closed, down to min_size
+    - Broken connections are discarded and replaced on the next checkout
+    """
+    
+    def __init__(self, connect_kwargs: Dict[str, Any], min_size: int = 1, max_size: int = 10,
+                 acquire_timeout: float = 10.0, idle_timeout: float = 300.0,
+                 health_check_after: float = 30.0):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        
+        self._idle: List[tuple] = []  # (connection, returned_at), most recently used last
+        self._checked_out = 0
+        self._cond = threading.Condition()
+        
+        # Metrics
+        self._acquisitions = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._timeouts = 0
+        self._reconnects = 0
+        self._reaped = 0
+        self._latency_buckets = [0] * (len(ACQUIRE_LATENCY_BUCKETS_MS) + 1)
+    
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block"""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self.release(conn, discard=broken)
+    
+    def acquire(self):
+        """Take an idle connection or open a new one, blocking while the pool is exhausted"""
+        started = time.monotonic()
+        deadline = started + self.acquire_timeout
+        waited = False
+        
+        with self._cond:
+            while not self._idle and self._checked_out >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(f"No connection available within {self.acquire_timeout}s")
+                waited = True
+                self._cond.wait(remaining)
+            
+            self._reap_idle_locked()
+            conn, returned_at = self._idle.pop() if self._idle else (None, None)
+            self._checked_out += 1
+        
+        try:
+            if conn is not None and not self._is_healthy(conn, returned_at):
+                self._close_quietly(conn)
+                conn = None
+                with self._cond:
+                    self._reconnects += 1
+            if conn is None:
+                conn = psycopg2.connect(**self.connect_kwargs)
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        
+        self._record_acquire(time.monotonic() - started, waited)
+        return conn
+    
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool (or drop it if broken)"""
+        if conn.closed or discard:
+            discard = True
+        elif conn.status != psycopg2.extensions.STATUS_READY:
+            # Don't hand out a connection with an open transaction
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        
+        if discard:
+            self._close_quietly(conn)
+        
+        with self._cond:
+            self._checked_out -= 1
+            if not discard:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+    
+    def close_all(self):
+        """Close every idle connection"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool size, checkout counts, wait time and acquisition latency histogram"""
+        with self._cond:
+            histogram = {}
+            for bound, count in zip(ACQUIRE_LATENCY_BUCKETS_MS, self._latency_buckets):
+                histogram[f"le_{bound}ms"] = count
+            histogram["gt_{}ms".format(ACQUIRE_LATENCY_BUCKETS_MS[-1])] = self._latency_buckets[-1]
+            
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checked_out": self._checked_out,
+                "idle": len(self._idle),
+                "total": self._checked_out + len(self._idle),
+                "acquisitions": self._acquisitions,
+                "waits": self._waits,
+                "wait_time_ms_total": round(self._wait_time_total * 1000, 2),
+                "timeouts": self._timeouts,
+                "reconnects": self._reconnects,
+                "reaped": self._reaped,
+                "acquire_latency_histogram": histogram,
+            }
+    
+    def _is_healthy(self, conn, returned_at: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - returned_at < self.health_check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1;")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+    
+    def _reap_idle_locked(self):
+        """Close connections idle past idle_timeout, keeping at least min_size open"""
+        now = time.monotonic()
+        while (self._idle and len(self._idle) + self._checked_out > self.min_size
+               and now - self._idle[0][1] > self.idle_timeout):
+            conn, _ = self._idle.pop(0)
+            self._close_quietly(conn)
+            self._reaped += 1
+    
+    def _record_acquire(self, elapsed: float, waited: bool):
+        elapsed_ms = elapsed * 1000
+        bucket = len(ACQUIRE_LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(ACQUIRE_LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = i
+                break
+        with self._cond:
+            self._acquisitions += 1
+            self._latency_buckets[bucket] += 1
+            if waited:
+                self._waits += 1
+                self._wait_time_total += elapsed
+    
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
 
 class PostgreSQLManager:
     """Manager class for PostgreSQL operations"""
     
-    def __init__(self, host=None, port=None, user=None, password=None, database=None):
+    def __init__(self, host=None, port=None, user=None, password=None, database=None,
+                 pool_min_size=None, pool_max_size=None):
         # Use environment variables with fallback to defaults
         self.host = host or os.getenv('POSTGRES_HOST', 'localhost')
         self.port = port or int(os.getenv('POSTGRES_PORT', '5432'))
         self.user = user or os.getenv('POSTGRES_USER', 'nautilus_user')
         self.password = password or os.getenv('POSTGRES_PASSWORD', 'nautilus_pass')
         self.database = database or os.getenv('POSTGRES_DB', 'nautilus')
-        self._conn = None
+        self._pool = PostgreSQLConnectionPool(
+            connect_kwargs={
+                "host": self.host,
+                "port": self.port,
+                "user": self.user,
+                "password": self.password,
+                "database": self.database,
+                "connect_timeout": 5,
+            },
+            min_size=pool_min_size or int(os.getenv('POSTGRES_POOL_MIN', '1')),
+            max_size=pool_max_size or int(os.getenv('POSTGRES_POOL_MAX', '10')),
+        )
     
-    def _get_connection(self):
-        """Get or create database connection"""
-        try:
-            if self._conn is None or self._conn.closed:
-                self._conn = psycopg2.connect(
-                    host=self.host,
-                    port=self.port,
-                    user=self.user,
-                    password=self.password,
-                    database=self.database,
-                    connect_timeout=5
-                )
-            return self._conn
-        except Exception as e:
-            return None
+    def _connection(self):
+        """Check out a pooled connection (use as a context manager)"""
+        return self._pool.connection()
     
     def get_info(self) -> Dict[str, Any]:
         """Get PostgreSQL server info"""
         try:
-            conn = self._get_connection()
-            if not conn:
-                return {"connected": False, "error": "Cannot connect to database"}
+            with self._connection() as conn:
+                cur = conn.cursor()
             
-            cur = conn.cursor()
-            
-            # Get version
-            cur.execute("SELECT version();")
-            version_str = cur.fetchone()[0]
-            version = version_str.split()[1] if len(version_str.split()) > 1 else "unknown"
+                # Get version
+                cur.execute("SELECT version();")
+                version_str = cur.fetchone()[0]
+                version = version_str.split()[1] if len(version_str.split()) > 1 else "unknown"
             
-            # Get database size
-            cur.execute(f"SELECT pg_database_size('{self.database}');")
-            db_size_bytes = cur.fetchone()[0]
-            db_size = self._format_bytes(db_size_bytes)
+                # Get database size
+                cur.execute("SELECT pg_database_size(%s);", (self.database,))
+                db_size_bytes = cur.fetchone()[0]
+                db_size = self._format_bytes(db_size_bytes)
             
-            # Get connection stats
-            cur.execute("""
-                SELECT count(*) as total,
-                       count(*) FILTER (WHERE state = 'active') as active,
-                       count(*) FILTER (WHERE state = 'idle') as idle
-                FROM pg_stat_activity
-                WHERE datname = %s;
-            """, (self.database,))
-            conn_stats = cur.fetchone()
+                # Get connection stats
+                cur.execute("""
+                    SELECT count(*) as total,
+                           count(*) FILTER (WHERE state = 'active') as active,
+                           count(*) FILTER (WHERE state = 'idle') as idle
+                    FROM pg_stat_activity
+                    WHERE datname = %s;
+                """, (self.database,))
+                conn_stats = cur.fetchone()
             
-            # Get max connections
-            cur.execute("SHOW max_connections;")
-            max_connections = int(cur.fetchone()[0])
+                # Get max connections
+                cur.execute("SHOW max_connections;")
+                max_connections = int(cur.fetchone()[0])
             
-            # Get cache hit rate
-            cur.execute("""
-                SELECT 
-                    sum(heap_blks_hit) / nullif(sum(heap_blks_hit) + sum(heap_blks_read), 0) * 100 as cache_hit_rate
-                FROM pg_statio_user_tables;
-            """)
-            cache_hit_rate = cur.fetchone()[0]
-            if cache_hit_rate is None:
-                cache_hit_rate = 0
+                # Get cache hit rate
+                cur.execute("""
+                    SELECT 
+                        sum(heap_blks_hit) / nullif(sum(heap_blks_hit) + sum(heap_blks_read), 0) * 100 as cache_hit_rate
+                    FROM pg_statio_user_tables;
+                """)
+                cache_hit_rate = cur.fetchone()[0]
+                if cache_hit_rate is None:
+                    cache_hit_rate = 0
             
-            cur.close()
+                cur.close()
             
-            return {
-                "connected": True,
-                "version": version,
-                "database": self.database,
-                "size": db_size,
-                "size_bytes": db_size_bytes,
-                "connections": {
-                    "total": conn_stats[0],
-                    "active": conn_stats[1],
-                    "idle": conn_stats[2],
-                    "max": max_connections
-                },
-                "cache_hit_rate": round(float(cache_hit_rate), 2),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
+                return {
+                    "connected": True,
+                    "version": version,
+                    "database": self.database,
+                    "size": db_size,
+                    "size_bytes": db_size_bytes,
+                    "connections": {
+                        "total": conn_stats[0],
+                        "active": conn_stats[1],
+                        "idle": conn_stats[2],
+                        "max": max_connections
+                    },
+                    "cache_hit_rate": round(float(cache_hit_rate), 2),
+                    "pool": self._pool.get_metrics(),
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }
         except Exception as e:
             return {
                 "connected": False,
                 "error": str(e),
+                "pool": self._pool.get_metrics(),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
     
     def get_tables(self) -> List[Dict[str, Any]]:
         """Get list of tables"""
         try:
-            conn = self._get_connection()
-            if not conn:
-                return []
+            with self._connection() as conn:
+                cur = conn.cursor()
             
-            cur = conn.cursor()
-            
-            # Get tables with stats
-            cur.execute("""
-                SELECT 
-                    schemaname,
-                    tablename,
-                    pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as size,
-                    pg_total_relation_size(schemaname||'.'||tablename) as size_bytes,
-                    n_live_tup as row_count
-                FROM pg_stat_user_tables
-                ORDER BY pg_total_relation_size(schemaname||'.'||tablename) DESC;
-            """)
+                # Get tables with stats
+                cur.execute("""
+                    SELECT 
+                        schemaname,
+                        tablename,
+                        pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as size,
+                        pg_total_relation_size(schemaname||'.'||tablename) as size_bytes,
+                        n_live_tup as row_count
+                    FROM pg_stat_user_tables
+                    ORDER BY pg_total_relation_size(schemaname||'.'||tablename) DESC;
+                """)
             
-            tables = []
-            for row in cur.fetchall():
-                tables.append({
-                    "schema": row[0],
-                    "name": row[1],
-                    "type": "nautilus",  # All tables in this DB are Nautilus tables
-                    "size": row[2],
-                    "size_bytes": row[3],
-                    "records": row[4] or 0
-                })
+                tables = []
+                for row in cur.fetchall():
+                    tables.append({
+                        "schema": row[0],
+                        "name": row[1],
+                        "type": "nautilus",  # All tables in this DB are Nautilus tables
+                        "size": row[2],
+                        "size_bytes": row[3],
+                        "records": row[4] or 0
+                    })
             
-            cur.close()
-            return tables
+                cur.close()
+                return tables
         except Exception as e:
             return []
     
     def get_table_stats(self, table_name: str) -> Dict[str, Any]:
         """Get detailed statistics for a table"""
         try:
-            conn = self._get_connection()
-            if not conn:
-                return {}
-            
-            cur = conn.cursor()
+            with self._connection() as conn:
+                cur = conn.cursor()
             
-            # Get table stats
-            cur.execute("""
-                SELECT 
-                    schemaname,
-                    tablename,
-                    pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as total_size,
-                    pg_size_pretty(pg_relation_size(schemaname||'.'||tablename)) as table_size,
-                    pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename) - 
-                                   pg_relation_size(schemaname||'.'||tablename)) as indexes_size,
-                    n_live_tup as row_count,
-                    n_dead_tup as dead_rows,
-                    last_vacuum,
-                    last_autovacuum,
-                    last_analyze,
-                    last_autoanalyze
-                FROM pg_stat_user_tables
-                WHERE tablename = %s;
-            """, (table_name,))
+                # Get table stats
+                cur.execute("""
+                    SELECT 
+                        schemaname,
+                        tablename,
+                        pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as total_size,
+                        pg_size_pretty(pg_relation_size(schemaname||'.'||tablename)) as table_size,
+                        pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename) - 
+                                       pg_relation_size(schemaname||'.'||tablename)) as indexes_size,
+                        n_live_tup as row_count,
+                        n_dead_tup as dead_rows,
+                        last_vacuum,
+                        last_autovacuum,
+                        last_analyze,
+                        last_autoanalyze
+                    FROM pg_stat_user_tables
+                    WHERE tablename = %s;
+                """, (table_name,))
             
-            row = cur.fetchone()
-            if not row:
-                return {}
+                row = cur.fetchone()
+                if not row:
+                    return {}
             
-            stats = {
-                "schema": row[0],
-                "name": row[1],
-                "total_size": row[2],
-                "table_size": row[3],
-                "indexes_size": row[4],
-                "row_count": row[5] or 0,
-                "dead_rows": row[6] or 0,
-                "last_vacuum": row[7].isoformat() if row[7] else None,
-                "last_autovacuum": row[8].isoformat() if row[8] else None,
-                "last_analyze": row[9].isoformat() if row[9] else None,
-                "last_autoanalyze": row[10].isoformat() if row[10] else None,
-            }
+                stats = {
+                    "schema": row[0],
+                    "name": row[1],
+                    "total_size": row[2],
+                    "table_size": row[3],
+                    "indexes_size": row[4],
+                    "row_count": row[5] or 0,
+                    "dead_rows": row[6] or 0,
+                    "last_vacuum": row[7].isoformat() if row[7] else None,
+                    "last_autovacuum": row[8].isoformat() if row[8] else None,
+                    "last_analyze": row[9].isoformat() if row[9] else None,
+                    "last_autoanalyze": row[10].isoformat() if row[10] else None,
+                }
             
-            # Get column count
-            cur.execute("""
-                SELECT count(*)
-                FROM information_schema.columns
-                WHERE table_name = %s;
-            """, (table_name,))
-            stats["column_count"] = cur.fetchone()[0]
+                # Get column count
+                cur.execute("""
+                    SELECT count(*)
+                    FROM information_schema.columns
+                    WHERE table_name = %s;
+                """, (table_name,))
+                stats["column_count"] = cur.fetchone()[0]
             
-            # Get index count
-            cur.execute("""
-                SELECT count(*)
-                FROM pg_indexes
-                WHERE tablename = %s;
-            """, (table_name,))
-            stats["index_count"] = cur.fetchone()[0]
+                # Get index count
+                cur.execute("""
+                    SELECT count(*)
+                    FROM pg_indexes
+                    WHERE tablename = %s;
+                """, (table_name,))
+                stats["index_count"] = cur.fetchone()[0]
             
-            cur.close()
-            return stats
+                cur.close()
+                return stats
         except Exception as e:
             return {"error": str(e)}
     
-    def query_table(self, table_name: str, limit: int = 100) -> Dict[str, Any]:
-        """Query table data"""
+    def query_table(self, table_name: str, limit: int = 100, cursor: Optional[str] = None,
+                    filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Query one page of table data using keyset pagination
+        
+        Rows are ordered by the table's keyset (see KEYSET_ORDERINGS, else the primary key)
+        and `next_cursor` encodes the last row's key. Passing it back seeks straight to the
+        next page through the index, so page 10,000 costs the same as page 1.
+        """
         try:
-            conn = self._get_connection()
-            if not conn:
-                return {"error": "Cannot connect to database"}
-            
-            cur = conn.cursor()
-            
-            # Get column names
-            cur.execute("""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_name = %s
-                ORDER BY ordinal_position;
-            """, (table_name,))
-            columns = cur.fetchall()
+            with self._connection() as conn:
+                cur = conn.cursor()
+                
+                columns = self._get_columns(cur, table_name)
+                if not columns:
+                    return {"error": f"Table '{table_name}' not found"}
+                
+                keyset = self._get_keyset(cur, table_name, columns)
+                query, params = self._build_select(table_name, columns, keyset, cursor, filters)
+                cur.execute(query + sql.SQL(" LIMIT %s"), params + [limit + 1])
+                rows = cur.fetchall()
+                
+                # pg_class.reltuples is a planner estimate; an exact count(*) would scan the table
+                cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;", (table_name,))
+                estimate = cur.fetchone()
+                
+                cur.close()
+                
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                next_cursor = None
+                if has_more and rows:
+                    names = [col[0] for col in columns]
+                    next_cursor = encode_cursor([rows[-1][names.index(c)] for c, _ in keyset])
+                
+                return {
+                    "columns": [{"name": col[0], "type": col[1]} for col in columns],
+                    "rows": [list(row) for row in rows],
+                    "count": len(rows),
+                    "order_by": [{"column": c, "direction": d} for c, d in keyset],
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
+                    "estimated_total": max(0, estimate[0]) if estimate else None,
+                }
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def stream_table(self, table_name: str, format: str = "ndjson", chunk_size: int = 5000,
+                     cursor: Optional[str] = None, filters: Optional[Dict[str, Any]] = None,
+                     limit: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Stream table rows through a server-side cursor
+        
+        Yields NDJSON lines or Arrow IPC stream bytes one chunk at a time, so memory stays
+        bounded by chunk_size regardless of table size. The pooled connection is held
+        until the generator is exhausted or closed.
+        """
+        if format not in ("ndjson", "arrow"):
+            raise ValueError(f"Unsupported stream format '{format}'")
+        if format == "arrow" and not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for Arrow streaming")
+        
+        with self._connection() as conn:
+            meta = conn.cursor()
+            columns = self._get_columns(meta, table_name)
+            if not columns:
+                raise ValueError(f"Table '{table_name}' not found")
+            keyset = self._get_keyset(meta, table_name, columns)
+            meta.close()
             
-            # Query data
-            cur.execute(f"SELECT * FROM {table_name} LIMIT %s;", (limit,))
-            rows = cur.fetchall()
+            query, params = self._build_select(table_name, columns, keyset, cursor, filters)
+            if limit is not None:
+                query = query + sql.SQL(" LIMIT %s")
+                params = params + [limit]
             
-            cur.close()
+            # Named cursor => rows stay on the server and arrive itersize at a time
+            server_cursor = conn.cursor(name=f"stream_{table_name}_{threading.get_ident()}")
+            server_cursor.itersize = chunk_size
+            server_cursor.execute(query, params)
             
-            return {
-                "columns": [{"name": col[0], "type": col[1]} for col in columns],
-                "rows": [list(row) for row in rows],
-                "count": len(rows)
-            }
-        except Exception as e:
-            return {"error": str(e)}
+            names = [col[0] for col in columns]
+            try:
+                if format == "ndjson":
+                    yield from self._stream_ndjson(server_cursor, names, chunk_size)
+                else:
+                    yield from self._stream_arrow(server_cursor, columns, chunk_size)
+            finally:
+                server_cursor.close()
+                conn.rollback()
+    
+    def _stream_ndjson(self, server_cursor, names: List[str], chunk_size: int) -> Iterator[bytes]:
+        while True:
+            rows = server_cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            lines = [json.dumps(dict(zip(names, row)), default=_json_default) for row in rows]
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    
+    def _stream_arrow(self, server_cursor, columns: List[tuple], chunk_size: int) -> Iterator[bytes]:
+        schema = pa.schema([(name, _arrow_type(data_type)) for name, data_type in columns])
+        sink = io.BytesIO()
+        writer = pa.ipc.new_stream(sink, schema)
+        
+        # The schema message is written on open, so clients can start decoding immediately
+        yield _take(sink)
+        while True:
+            rows = server_cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            arrays = [
+                pa.array([_arrow_value(row[i]) for row in rows], type=schema.field(i).type)
+                for i in range(len(columns))
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield _take(sink)
+        writer.close()
+        yield _take(sink)
+    
+    def _get_columns(self, cur, table_name: str) -> List[tuple]:
+        cur.execute("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = %s
+            ORDER BY ordinal_position;
+        """, (table_name,))
+        return cur.fetchall()
+    
+    def _get_keyset(self, cur, table_name: str, columns: List[tuple]) -> List[tuple]:
+        """Ordering columns for keyset pagination: configured index order, else the primary key"""
+        column_names = {col[0] for col in columns}
+        configured = KEYSET_ORDERINGS.get(table_name)
+        if configured and all(column in column_names for column, _ in configured):
+            return configured
+        
+        cur.execute("""
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = %s::regclass AND i.indisprimary;
+        """, (table_name,))
+        primary_key = [row[0] for row in cur.fetchall()]
+        if primary_key:
+            return [(column, "ASC") for column in primary_key]
+        # No primary key: fall back to every column so the ordering is at least total
+        return [(col[0], "ASC") for col in columns]
+    
+    def _build_select(self, table_name: str, columns: List[tuple], keyset: List[tuple],
+                      cursor: Optional[str], filters: Optional[Dict[str, Any]]):
+        """Build SELECT ... WHERE <filters> AND <seek past cursor> ORDER BY <keyset>"""
+        column_names = {col[0] for col in columns}
+        conditions = []
+        params: List[Any] = []
+        
+        for column, value in (filters or {}).items():
+            if column not in column_names:
+                raise ValueError(f"Unknown filter column '{column}'")
+            conditions.append(sql.SQL("{} = %s").format(sql.Identifier(column)))
+            params.append(value)
+        
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(keyset):
+                raise ValueError("Cursor does not match table ordering")
+            seek, seek_params = _keyset_predicate(keyset, values)
+            conditions.append(seek)
+            params.extend(seek_params)
+        
+        query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name))
+        if conditions:
+            query = query + sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions)
+        query = query + sql.SQL(" ORDER BY ") + sql.SQL(", ").join(
+            sql.SQL("{} " + direction).format(sql.Identifier(column)) for column, direction in keyset
+        )
+        return query, params
     
     def vacuum_table(self, table_name: str) -> bool:
         """Run VACUUM on a table"""
         try:
-            conn = self._get_connection()
-            if not conn:
-                return False
-            
-            # VACUUM requires autocommit mode
-            old_isolation_level = conn.isolation_level
-            conn.set_isolation_level(0)
-            
-            cur = conn.cursor()
-            cur.execute(f"VACUUM {table_name};")
-            cur.close()
-            
-            conn.set_isolation_level(old_isolation_level)
-            return True
+            with self._connection() as conn:
+                # VACUUM requires autocommit mode
+                old_isolation_level = conn.isolation_level
+                conn.set_isolation_level(0)
+                try:
+                    cur = conn.cursor()
+                    cur.execute(f"VACUUM {table_name};")
+                    cur.close()
+                finally:
+                    # Restore before the connection goes back to the pool
+                    conn.set_isolation_level(old_isolation_level)
+                return True
         except Exception as e:
             return False
     
     def analyze_table(self, table_name: str) -> bool:
         """Run ANALYZE on a table"""
         try:
-            conn = self._get_connection()
-            if not conn:
-                return False
-            
-            cur = conn.cursor()
-            cur.execute(f"ANALYZE {table_name};")
-            conn.commit()
-            cur.close()
-            return True
+            with self._connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f"ANALYZE {table_name};")
+                conn.commit()
+                cur.close()
+                return True
         except Exception as e:
             return False
     
@@ -282,10 +633,154 @@ class PostgreSQLManager:
             bytes_value /= 1024.0
         return f"{bytes_value:.1f} PB"
     
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Get connection pool metrics"""
+        return self._pool.get_metrics()
+    
     def close(self):
-        """Close database connection"""
-        if self._conn and not self._conn.closed:
-            self._conn.close()
+        """Close pooled database connections"""
+        self._pool.close_all()
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode a row's keyset values as an opaque URL-safe page token"""
+    raw = json.dumps(values, default=_json_default, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """Decode a page token produced by encode_cursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _keyset_predicate(keyset: List[tuple], values: List[Any]):
+    """WHERE clause selecting rows strictly after `values` in keyset order"""
+    columns = [sql.Identifier(column) for column, _ in keyset]
+    directions = {direction for _, direction in keyset}
+    
+    if len(directions) == 1:
+        # Uniform direction: a row comparison the planner can turn into an index range scan
+        op = "<" if directions == {"DESC"} else ">"
+        clause = sql.SQL("({}) " + op + " ({})").format(
+            sql.SQL(", ").join(columns),
+            sql.SQL(", ").join(sql.Placeholder() * len(columns)),
+        )
+        return clause, list(values)
+    
+    # Mixed directions: expand to (a > x) OR (a = x AND b < y) OR ...
+    # The leading bound on the first column keeps the scan on the index.
+    branches = []
+    params: List[Any] = []
+    for i, (_, direction) in enumerate(keyset):
+        op = "<" if direction == "DESC" else ">"
+        parts = [sql.SQL("{} = %s").format(columns[j]) for j in range(i)]
+        parts.append(sql.SQL("{} " + op + " %s").format(columns[i]))
+        branches.append(sql.SQL("(") + sql.SQL(" AND ").join(parts) + sql.SQL(")"))
+        params.extend(values[:i + 1])
+    
+    lead_op = "<=" if keyset[0][1] == "DESC" else ">="
+    clause = sql.SQL("({} " + lead_op + " %s AND ({}))").format(
+        columns[0], sql.SQL(" OR ").join(branches)
+    )
+    return clause, [values[0]] + params
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _arrow_type(data_type: str):
+    """Map an information_schema data_type onto a fixed Arrow type"""
+    if data_type in ("smallint", "integer", "bigint"):
+        return pa.int64()
+    if data_type in ("numeric", "real", "double precision"):
+        return pa.float64()
+    if data_type == "timestamp with time zone":
+        return pa.timestamp("us", tz="UTC")
+    if data_type == "timestamp without time zone":
+        return pa.timestamp("us")
+    if data_type == "date":
+        return pa.date32()
+    if data_type == "boolean":
+        return pa.bool_()
+    return pa.string()
+
+
+def _arrow_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    if value is not None and not isinstance(value, (int, float, bool, str, datetime, date)):
+        return str(value)
+    return value
+
+
+def _take(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+class AsyncPostgreSQLManager:
+    """
+    asyncio front-end for PostgreSQLManager
+    
+    psycopg2 has no native asyncio support, so each call runs on a dedicated thread
+    executor sized to the connection pool. Concurrent awaits proceed in parallel on
+    separate pooled connections instead of queueing behind one slow query.
+    """
+    
+    def __init__(self, manager: Optional[PostgreSQLManager] = None):
+        self.manager = manager or PostgreSQLManager()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.manager._pool.max_size,
+            thread_name_prefix="postgres-async",
+        )
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+    
+    async def get_info(self) -> Dict[str, Any]:
+        return await self._run(self.manager.get_info)
+    
+    async def get_tables(self) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_tables)
+    
+    async def get_table_stats(self, table_name: str) -> Dict[str, Any]:
+        return await self._run(self.manager.get_table_stats, table_name)
+    
+    async def query_table(self, table_name: str, limit: int = 100, cursor: Optional[str] = None,
+                          filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self._run(self.manager.query_table, table_name, limit, cursor, filters)
+    
+    async def vacuum_table(self, table_name: str) -> bool:
+        return await self._run(self.manager.vacuum_table, table_name)
+    
+    async def analyze_table(self, table_name: str) -> bool:
+        return await self._run(self.manager.analyze_table, table_name)
+    
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        return self.manager.get_pool_metrics()
+    
+    async def close(self):
+        self._executor.shutdown(wait=False)
+        await asyncio.get_running_loop().run_in_executor(None, self.manager.close)
 
 
 # Global instance
@@ -302,8 +797,14 @@ def get_postgres_tables():
 def get_postgres_table_stats(table_name: str):
     return postgres_manager.get_table_stats(table_name)
 
-def query_postgres_table(table_name: str, limit: int = 100):
-    return postgres_manager.query_table(table_name, limit)
+def query_postgres_table(table_name: str, limit: int = 100, cursor: Optional[str] = None,
+                         filters: Optional[Dict[str, Any]] = None):
+    return postgres_manager.query_table(table_name, limit, cursor, filters)
+
+def stream_postgres_table(table_name: str, format: str = "ndjson", chunk_size: int = 5000,
+                          cursor: Optional[str] = None, filters: Optional[Dict[str, Any]] = None,
+                          limit: Optional[int] = None):
+    return postgres_manager.stream_table(table_name, format, chunk_size, cursor, filters, limit)
 
 def vacuum_postgres_table(table_name: str):
     return postgres_manager.vacuum_table(table_name)
@@ -311,3 +812,6 @@ def vacuum_postgres_table(table_name: str):
 def analyze_postgres_table(table_name: str):
     return postgres_manager.analyze_table(table_name)
 
+def get_postgres_pool_metrics():
+    return postgres_manager.get_pool_metrics()
+
@@ -0,0 +1,213 @@
+"""
+Python Worker Daemon
+Long-lived process that serves admin manager calls over a local Unix socket
+
+The Node server used to spawn a fresh interpreter for every admin query, paying
+for interpreter startup and the nautilus_trader / psutil / redis / psycopg2
+imports on each dashboard refresh. This worker imports the managers once and
+then answers calls for the rest of its lifetime.
+
+Protocol (one persistent connection, requests answered in order):
+    request:  4-byte big-endian length + JSON {"id", "module", "fn", "args", "kwargs"}
+    response: 4-byte big-endian length + JSON {"id", "ok", "result"} or {"id", "ok", "error"}
+
+Usage:
+    python3.11 -m server.python_worker --socket /tmp/nautilus-worker-0.sock
+"""
+
+import argparse
+import importlib
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, Tuple
+
+# Make both "server.x" and bare "x" imports resolve (managers import each other both ways)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# orjson when installed; handles the datetimes / Decimals psycopg2 and pandas hand back
+from server.wire_format import dumps_json, loads_json
+
+# Modules the worker is allowed to serve; everything else is rejected
+EXPOSED_MODULES = (
+    "nautilus_bridge",
+    "redis_manager",
+    "postgres_manager",
+    "parquet_manager",
+    "feature_manager",
+    "nautilus_api",
+    "backtest_sweep",
+)
+
+HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class WorkerRegistry:
+    """Loads the exposed manager modules once and resolves public functions"""
+
+    def __init__(self, modules=EXPOSED_MODULES):
+        self.modules: Dict[str, Any] = {}
+        self.load_errors: Dict[str, str] = {}
+        self._functions: Dict[Tuple[str, str], Callable] = {}
+
+        for name in modules:
+            try:
+                self.modules[name] = importlib.import_module(f"server.{name}")
+            except Exception as e:
+                self.load_errors[name] = str(e)
+
+    def resolve(self, module: str, fn: str) -> Callable:
+        """Look up a public module-level function"""
+        key = (module, fn)
+        if key in self._functions:
+            return self._functions[key]
+
+        if module in self.load_errors:
+            raise RuntimeError(f"Module '{module}' failed to load: {self.load_errors[module]}")
+        mod = self.modules.get(module)
+        if mod is None:
+            raise LookupError(f"Module '{module}' is not exposed by the worker")
+        if fn.startswith("_"):
+            raise LookupError(f"Function '{fn}' is private")
+
+        func = getattr(mod, fn, None)
+        if not callable(func):
+            raise LookupError(f"Function '{module}.{fn}' not found")
+
+        self._functions[key] = func
+        return func
+
+    def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one request and build the response envelope"""
+        request_id = request.get("id")
+        try:
+            if request.get("fn") == "__ping__":
+                return {"id": request_id, "ok": True, "result": self.ping()}
+
+            func = self.resolve(request["module"], request["fn"])
+            result = func(*request.get("args", []), **request.get("kwargs", {}))
+            return {"id": request_id, "ok": True, "result": result}
+        except Exception as e:
+            return {
+                "id": request_id,
+                "ok": False,
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "traceback": traceback.format_exc(),
+            }
+
+    def ping(self) -> Dict[str, Any]:
+        """Health check payload"""
+        return {
+            "pid": os.getpid(),
+            "modules": sorted(self.modules.keys()),
+            "load_errors": self.load_errors,
+        }
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes or return b'' on EOF"""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = conn.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            return b""
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_message(conn: socket.socket):
+    """Read one length-prefixed JSON message, None on EOF"""
+    header = _recv_exact(conn, HEADER.size)
+    if not header:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message too large: {length} bytes")
+    body = _recv_exact(conn, length)
+    if len(body) != length:
+        return None
+    return loads_json(body)
+
+
+def write_message(conn: socket.socket, message: Dict[str, Any]):
+    """Write one length-prefixed JSON message"""
+    body = dumps_json(message)
+    conn.sendall(HEADER.pack(len(body)) + body)
+
+
+def serve_connection(conn: socket.socket, registry: WorkerRegistry):
+    """Answer requests on a connection until the client hangs up"""
+    with conn:
+        while True:
+            try:
+                request = read_message(conn)
+            except (ValueError, json.JSONDecodeError) as e:
+                write_message(conn, {"id": None, "ok": False, "error": f"Bad request: {e}"})
+                return
+            if request is None:
+                return
+            write_message(conn, registry.call(request))
+
+
+def serve(socket_path: str):
+    """Bind the Unix socket and serve connections forever"""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    started = time.time()
+    registry = WorkerRegistry()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen(16)
+
+    def _shutdown(signum, frame):
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    # The Node pool waits for this line before sending requests
+    print(json.dumps({
+        "ready": True,
+        "pid": os.getpid(),
+        "socket": socket_path,
+        "startup_ms": round((time.time() - started) * 1000, 1),
+        "load_errors": registry.load_errors,
+    }), flush=True)
+
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            break
+        try:
+            serve_connection(conn, registry)
+        except (BrokenPipeError, ConnectionResetError):
+            continue
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nautilus admin Python worker")
+    parser.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    args = parser.parse_args()
+    serve(args.socket)
+
+
+if __name__ == "__main__":
+    main()
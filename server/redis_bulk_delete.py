@@ -0,0 +1,222 @@
+"""
+Redis Bulk Delete
+Rate-limited, cancellable pattern deletes that walk SCAN and UNLINK in batches
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Keys per UNLINK command inside one pipeline
+UNLINK_CHUNK = 100
+
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 50
+
+# Job status and cancel flags are mirrored into Redis so any worker process can
+# answer a status poll or cancel a job started by another one
+JOB_KEY_PREFIX = "nautilus-admin:bulk-delete:"
+JOB_KEY_TTL = 3600
+
+# Sorted set of job ids scored by start time, so listing jobs never SCANs the keyspace
+JOB_INDEX_KEY = f"{JOB_KEY_PREFIX}index"
+
+JOB_ID_RE = re.compile(r"^[0-9a-f]{12}$")
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _is_job_key(key) -> bool:
+    """Status and cancel keys of delete jobs, which a broad pattern like "*" also matches"""
+    if isinstance(key, bytes):
+        return key.startswith(JOB_KEY_PREFIX.encode())
+    return key.startswith(JOB_KEY_PREFIX)
+
+
+class BulkDeleteJob:
+    """One pattern delete running on its own thread"""
+
+    def __init__(self, client, pattern: str, batch_size: int, max_keys_per_sec: float, dry_run: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.client = client
+        self.pattern = pattern
+        self.batch_size = batch_size
+        self.max_keys_per_sec = max_keys_per_sec
+        self.dry_run = dry_run
+        self.state = "pending"
+        self.error: Optional[str] = None
+        self.cursor = 0
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = 0
+        self.batches = 0
+        self.dbsize_at_start = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"redis-bulk-delete-{self.id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("completed", "cancelled", "failed")
+
+    def status(self) -> Dict[str, Any]:
+        now = self.finished_at or time.time()
+        elapsed = now - self.started_at if self.started_at else 0.0
+        return {
+            "id": self.id,
+            "pattern": self.pattern,
+            "state": self.state,
+            "dry_run": self.dry_run,
+            "matched": self.matched,
+            "deleted": self.deleted,
+            "scanned": self.scanned,
+            "batches": self.batches,
+            # SCAN gives no position and COUNT only hints at the slots visited per call, so
+            # this is batches * COUNT over DBSIZE when the job began: a rough estimate
+            "progress_estimate": (min(1.0, self.batches * self.batch_size / self.dbsize_at_start)
+                                  if self.dbsize_at_start else None),
+            "keys_per_sec": round(self.deleted / elapsed, 1) if elapsed else 0.0,
+            "max_keys_per_sec": self.max_keys_per_sec,
+            "elapsed_seconds": round(elapsed, 2),
+            "started_at": datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat() if self.started_at else None,
+            "error": self.error,
+        }
+
+    def _run(self):
+        self.state = "running"
+        self.started_at = time.time()
+        started = time.monotonic()
+        try:
+            self.dbsize_at_start = self.client.dbsize()
+            while not self._cancel.is_set():
+                self.cursor, keys = self.client.scan(cursor=self.cursor, match=self.pattern, count=self.batch_size)
+                self.batches += 1
+                # Keys SCAN actually returned, i.e. already filtered by MATCH
+                self.scanned += len(keys)
+                # Never unlink our own (or another job's) progress and cancel keys
+                keys = [key for key in keys if not _is_job_key(key)]
+                self.matched += len(keys)
+
+                pipe = self.client.pipeline(transaction=False)
+                if not self.dry_run:
+                    for i in range(0, len(keys), UNLINK_CHUNK):
+                        pipe.unlink(*keys[i:i + UNLINK_CHUNK])
+                pipe.exists(self.cancel_key)
+                replies = pipe.execute()
+                self.deleted += sum(replies[:-1])
+                if replies[-1]:
+                    self._cancel.set()
+                self._publish()
+
+                if self.cursor == 0:
+                    break
+
+                # Stay under the rate: sleep until the work done so far is "due"
+                if self.max_keys_per_sec and self.matched:
+                    ahead = self.matched / self.max_keys_per_sec - (time.monotonic() - started)
+                    if ahead > 0:
+                        self._cancel.wait(ahead)
+
+            self.state = "cancelled" if self._cancel.is_set() and self.cursor != 0 else "completed"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+            self._publish()
+
+    @property
+    def status_key(self) -> str:
+        return f"{JOB_KEY_PREFIX}{self.id}"
+
+    @property
+    def cancel_key(self) -> str:
+        return f"{JOB_KEY_PREFIX}{self.id}:cancel"
+
+    def _publish(self):
+        try:
+            self.client.set(self.status_key, json.dumps(self.status()), ex=JOB_KEY_TTL)
+        except Exception:
+            pass
+
+
+class RedisBulkDeleter:
+    """Starts bulk delete jobs and keeps their status for polling"""
+
+    def __init__(self, client_factory: Callable[[], Any]):
+        self.client_factory = client_factory
+        self._jobs: Dict[str, BulkDeleteJob] = {}
+        self._lock = threading.Lock()
+
+    def start(self, pattern: str, batch_size: int = 500, max_keys_per_sec: float = 20000,
+              dry_run: bool = False) -> Dict[str, Any]:
+        """Start deleting keys matching pattern in the background and return the job status"""
+        if not pattern:
+            raise ValueError("A key pattern is required")
+        job = BulkDeleteJob(self.client_factory(), pattern, max(1, batch_size), max_keys_per_sec, dry_run)
+        with self._lock:
+            self._prune_locked()
+            self._jobs[job.id] = job
+        self._index(job)
+        job.start()
+        return job.status()
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.status()
+        if not JOB_ID_RE.match(job_id or ""):
+            return None
+        raw = self.client_factory().get(f"{JOB_KEY_PREFIX}{job_id}")
+        return json.loads(raw) if raw else None
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+            return job.status()
+        status = self.status(job_id)
+        if status is None:
+            return None
+        # Started by another process: it checks this flag after every batch
+        self.client_factory().set(f"{JOB_KEY_PREFIX}{job_id}:cancel", 1, ex=JOB_KEY_TTL)
+        return {**status, "cancel_requested": True}
+
+    def list(self) -> List[Dict[str, Any]]:
+        client = self.client_factory()
+        ids = [_text(job_id) for job_id in client.zrevrange(JOB_INDEX_KEY, 0, MAX_FINISHED_JOBS - 1)]
+        jobs = {}
+        if ids:
+            raws = client.mget([f"{JOB_KEY_PREFIX}{job_id}" for job_id in ids])
+            expired = [job_id for job_id, raw in zip(ids, raws) if not raw]
+            if expired:
+                client.zrem(JOB_INDEX_KEY, *expired)
+            jobs = {job["id"]: job for job in (json.loads(raw) for raw in raws if raw)}
+        with self._lock:
+            jobs.update({job.id: job.status() for job in self._jobs.values()})
+        return sorted(jobs.values(), key=lambda j: j["started_at"] or "", reverse=True)
+
+    def _index(self, job: BulkDeleteJob):
+        """Record the job id for list(); only the newest MAX_FINISHED_JOBS ids are kept"""
+        pipe = self.client_factory().pipeline(transaction=False)
+        pipe.zadd(JOB_INDEX_KEY, {job.id: time.time()})
+        pipe.zremrangebyrank(JOB_INDEX_KEY, 0, -MAX_FINISHED_JOBS - 1)
+        pipe.execute()
+
+    def _prune_locked(self):
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS + 1)]:
+            del self._jobs[job.id]
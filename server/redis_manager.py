@@ -5,31 +5,222 @@ Provides functions to monitor and manage Redis cache
 
 import redis
 import os
+import threading
+import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 
+try:
+    from server.redis_memory_analyzer import RedisMemoryAnalyzer
+    from server.redis_bulk_delete import RedisBulkDeleter
+    from server.redis_stats_sampler import RedisStatsSampler
+except ImportError:
+    from redis_memory_analyzer import RedisMemoryAnalyzer
+    from redis_bulk_delete import RedisBulkDeleter
+    from redis_stats_sampler import RedisStatsSampler
+
+try:
+    import redis.asyncio as aioredis
+    ASYNC_REDIS_AVAILABLE = True
+except ImportError:
+    ASYNC_REDIS_AVAILABLE = False
+
+# Strings shorter than this are returned inline by get_key_info / get_keys_info
+MAX_INLINE_VALUE = 1000
+
+# Size command per key type, queued in the second pipeline round
+SIZE_COMMANDS = {
+    'string': ('STRLEN', 'length'),
+    'list': ('LLEN', 'length'),
+    'set': ('SCARD', 'size'),
+    'zset': ('ZCARD', 'size'),
+    'hash': ('HLEN', 'fields'),
+    'stream': ('XLEN', 'length'),
+}
+
+
+def _queue_metadata(pipe, keys: List[str]):
+    """Round 1: TYPE and TTL for every key"""
+    for key in keys:
+        pipe.type(key)
+        pipe.ttl(key)
+
+
+def _queue_sizes(pipe, keys: List[str], types: List[str]):
+    """Round 2: one size command per key, plus a bounded read of string values"""
+    for key, key_type in zip(keys, types):
+        command = SIZE_COMMANDS.get(key_type)
+        if command is None:
+            continue
+        pipe.execute_command(command[0], key)
+        if key_type == 'string':
+            pipe.getrange(key, 0, MAX_INLINE_VALUE - 1)
+
+
+def _build_keys_info(keys: List[str], metadata: List[Any], sizes: List[Any]) -> List[Dict[str, Any]]:
+    """Assemble per-key info dicts from the two pipeline replies"""
+    results = []
+    sizes_iter = iter(sizes)
+    for i, key in enumerate(keys):
+        key_type, ttl = metadata[2 * i], metadata[2 * i + 1]
+        info = {
+            "key": key,
+            "type": key_type,
+            "ttl": ttl,
+            "exists": key_type != 'none'
+        }
+        
+        command = SIZE_COMMANDS.get(key_type)
+        if command is not None:
+            size = next(sizes_iter)
+            if key_type == 'string':
+                value = next(sizes_iter)
+                if isinstance(size, int) and size < MAX_INLINE_VALUE:
+                    info["value"] = value
+                else:
+                    info["value"] = f"<large string: {size} bytes>"
+            else:
+                info[command[1]] = size
+        results.append(info)
+    return results
+
+
+def _queue_enrichment(pipe, keys: List[str], key_type: Optional[str]):
+    """TYPE (unless filtered by type), TTL and MEMORY USAGE for each key, in one round"""
+    for key in keys:
+        if key_type is None:
+            pipe.type(key)
+        pipe.ttl(key)
+        pipe.memory_usage(key)
+
+
+def _build_page_keys(keys: List[str], replies: List[Any], key_type: Optional[str]) -> List[Dict[str, Any]]:
+    per_key = 2 if key_type else 3
+    results = []
+    for i, key in enumerate(keys):
+        reply = replies[i * per_key:(i + 1) * per_key]
+        if key_type is None:
+            found_type, ttl, memory = reply
+        else:
+            found_type, (ttl, memory) = key_type, reply
+        # Keys can expire between SCAN and the pipeline; errors come back as exceptions
+        results.append({
+            "key": key,
+            "type": found_type if not isinstance(found_type, Exception) else None,
+            "ttl": ttl if not isinstance(ttl, Exception) else None,
+            "memory_bytes": memory if not isinstance(memory, Exception) else None,
+        })
+    return results
+
+
+def _parse_cursor(cursor) -> int:
+    """SCAN cursors are unsigned 64-bit, so they travel as strings to stay exact in JS"""
+    try:
+        value = int(cursor or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid SCAN cursor: {cursor!r}")
+    if value < 0:
+        raise ValueError(f"Invalid SCAN cursor: {cursor!r}")
+    return value
+
+
+class _KeyPage:
+    """
+    Cursor, TYPE filter and time budget of one scan_keys_page call
+
+    The sync and async managers only issue the SCAN and pipeline calls; this decides
+    what to ask for next, when the page is complete and what the reply looks like.
+    """
+
+    def __init__(self, pattern: str, cursor, count: int, key_type: Optional[str], time_budget_ms: int):
+        self.pattern = pattern
+        self.position = _parse_cursor(cursor)
+        self.count = count
+        self.key_type = key_type
+        self.started = time.monotonic()
+        self.deadline = self.started + time_budget_ms / 1000
+        self.keys: List[str] = []
+        self.batches = 0
+
+    def scan_args(self) -> Dict[str, Any]:
+        """Keyword arguments for the next SCAN"""
+        return {
+            "cursor": self.position,
+            "match": self.pattern,
+            "count": max(1, self.count - len(self.keys)),
+            "_type": self.key_type,
+        }
+
+    def add(self, reply) -> bool:
+        """Take one SCAN reply; True once the page is complete"""
+        self.position, batch = reply
+        self.batches += 1
+        self.keys.extend(batch)
+        return self.position == 0 or len(self.keys) >= self.count or time.monotonic() >= self.deadline
+
+    def queue_enrichment(self, pipe):
+        _queue_enrichment(pipe, self.keys, self.key_type)
+
+    def result(self, replies: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """The page, enriched when the enrichment pipeline replies are given"""
+        if replies is not None:
+            entries = _build_page_keys(self.keys, replies, self.key_type)
+        else:
+            entries = [{"key": key} for key in self.keys]
+        return {
+            "keys": entries,
+            "count": len(entries),
+            "cursor": str(self.position),
+            "done": self.position == 0,
+            "scan_calls": self.batches,
+            "budget_exhausted": self.position != 0 and len(self.keys) < self.count,
+            "elapsed_ms": round((time.monotonic() - self.started) * 1000, 1)
+        }
+
+
 class RedisManager:
     """Manager class for Redis operations"""
     
-    def __init__(self, host=None, port=None, db=0, password=None):
+    def __init__(self, host=None, port=None, db=0, password=None, max_connections=None):
         # Use environment variables with fallback to defaults
         self.host = host or os.getenv('REDIS_HOST', 'localhost')
         self.port = port or int(os.getenv('REDIS_PORT', '6379'))
         self.password = password or os.getenv('REDIS_PASSWORD', None)
         self.db = db
+        self.max_connections = max_connections or int(os.getenv('REDIS_POOL_MAX', '20'))
+        self._pool = None
         self._client = None
+        self._lock = threading.Lock()
+        self.memory_analyzer = RedisMemoryAnalyzer(
+            self._get_client,
+            segments=int(os.getenv('REDIS_MEMORY_PREFIX_SEGMENTS', '2')),
+            refresh_interval=float(os.getenv('REDIS_MEMORY_REFRESH', '300'))
+        )
+        self.bulk_deleter = RedisBulkDeleter(self._get_client)
+        self.stats_sampler = RedisStatsSampler(
+            self._get_client,
+            interval=float(os.getenv('REDIS_STATS_INTERVAL', '5')),
+            history_seconds=int(os.getenv('REDIS_STATS_HISTORY', '3600'))
+        )
     
     def _get_client(self):
-        """Get or create Redis client"""
+        """Get or create the Redis client backed by a bounded connection pool"""
         if self._client is None:
-            self._client = redis.Redis(
-                host=self.host,
-                port=self.port,
-                db=self.db,
-                password=self.password,
-                decode_responses=True,
-                socket_timeout=5
-            )
+            with self._lock:
+                if self._client is None:
+                    # Blocking pool: callers wait for a free connection instead of erroring
+                    self._pool = redis.BlockingConnectionPool(
+                        max_connections=self.max_connections,
+                        timeout=5,
+                        host=self.host,
+                        port=self.port,
+                        db=self.db,
+                        password=self.password,
+                        decode_responses=True,
+                        socket_timeout=5,
+                        health_check_interval=30
+                    )
+                    self._client = redis.Redis(connection_pool=self._pool)
         return self._client
     
     def get_info(self) -> Dict[str, Any]:
@@ -118,67 +309,156 @@ class RedisManager:
         except Exception as e:
             return []
     
+    def scan_keys_page(self, pattern: str = "*", cursor: str = "0", count: int = 100,
+                       key_type: Optional[str] = None, time_budget_ms: int = 250,
+                       with_info: bool = True) -> Dict[str, Any]:
+        """
+        Scan one page of keys, resuming from a previous SCAN cursor
+        
+        SCAN is repeated until `count` keys are collected, the keyspace is exhausted
+        (cursor "0") or the time budget runs out. Pages can slightly exceed count
+        because SCAN replies are never split. Keys are enriched with type, TTL and
+        MEMORY USAGE in a single pipelined round trip.
+        """
+        try:
+            client = self._get_client()
+            page = _KeyPage(pattern, cursor, count, key_type, time_budget_ms)
+            while not page.add(client.scan(**page.scan_args())):
+                pass
+            
+            replies = None
+            if with_info and page.keys:
+                pipe = client.pipeline(transaction=False)
+                page.queue_enrichment(pipe)
+                replies = pipe.execute(raise_on_error=False)
+            return page.result(replies)
+        except Exception as e:
+            return {"error": str(e)}
+    
     def get_key_info(self, key: str) -> Dict[str, Any]:
         """Get information about a specific key"""
+        result = self.get_keys_info([key])
+        return result[0] if isinstance(result, list) else result
+    
+    def get_keys_info(self, keys: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get information about many keys in two pipelined round trips
+        
+        Round 1 fetches TYPE/TTL for every key, round 2 the type-specific size
+        (and string values up to MAX_INLINE_VALUE bytes).
+        """
+        if not keys:
+            return []
         try:
             client = self._get_client()
             
-            key_type = client.type(key)
-            ttl = client.ttl(key)
+            pipe = client.pipeline(transaction=False)
+            _queue_metadata(pipe, keys)
+            metadata = pipe.execute()
             
-            info = {
-                "key": key,
-                "type": key_type,
-                "ttl": ttl,
-                "exists": client.exists(key) > 0
-            }
+            types = metadata[0::2]
+            pipe = client.pipeline(transaction=False)
+            _queue_sizes(pipe, keys, types)
+            sizes = pipe.execute(raise_on_error=False)
             
-            # Get value based on type (limit size for safety)
-            if key_type == 'string':
-                value = client.get(key)
-                if value and len(str(value)) < 1000:
-                    info["value"] = value
-                else:
-                    info["value"] = f"<large string: {len(str(value))} bytes>"
-            elif key_type == 'list':
-                info["length"] = client.llen(key)
-            elif key_type == 'set':
-                info["size"] = client.scard(key)
-            elif key_type == 'zset':
-                info["size"] = client.zcard(key)
-            elif key_type == 'hash':
-                info["fields"] = client.hlen(key)
-            
-            return info
+            return _build_keys_info(keys, metadata, sizes)
         except Exception as e:
             return {"error": str(e)}
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage"""
+        self._get_client()
+        # BlockingConnectionPool keeps created connections in _connections and parks
+        # idle ones (plus None placeholders for not-yet-created slots) in its queue
+        created = len(self._pool._connections)
+        idle = sum(1 for conn in list(self._pool.pool.queue) if conn is not None)
+        return {
+            "max_connections": self.max_connections,
+            "created": created,
+            "in_use": created - idle,
+            "idle": idle
+        }
+    
     def delete_key(self, key: str) -> bool:
-        """Delete a key"""
+        """Delete a key (UNLINK frees the value off the main thread)"""
         try:
             client = self._get_client()
-            return client.delete(key) > 0
+            return client.unlink(key) > 0
         except Exception as e:
             return False
     
+    def start_bulk_delete(self, pattern: str, batch_size: int = 500, max_keys_per_sec: float = 20000,
+                          dry_run: bool = False) -> Dict[str, Any]:
+        """Delete keys matching pattern in SCAN batches with pipelined UNLINK, in the background"""
+        try:
+            return self.bulk_deleter.start(pattern, batch_size, max_keys_per_sec, dry_run)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def get_bulk_delete_status(self, job_id: Optional[str] = None) -> Any:
+        """Get one bulk delete job's progress, or all recent jobs"""
+        if job_id is None:
+            return self.bulk_deleter.list()
+        return self.bulk_deleter.status(job_id) or {"error": f"Job '{job_id}' not found"}
+    
+    def cancel_bulk_delete(self, job_id: str) -> Dict[str, Any]:
+        """Stop a bulk delete job after its current batch"""
+        return self.bulk_deleter.cancel(job_id) or {"error": f"Job '{job_id}' not found"}
+    
     def flush_db(self) -> bool:
-        """Flush current database"""
+        """Flush current database (FLUSHDB ASYNC, so the server keeps serving while memory is freed)"""
         try:
             client = self._get_client()
-            client.flushdb()
+            client.flushdb(asynchronous=True)
             return True
         except Exception as e:
             return False
     
     def flush_all(self) -> bool:
-        """Flush all databases"""
+        """Flush all databases (FLUSHALL ASYNC)"""
         try:
             client = self._get_client()
-            client.flushall()
+            client.flushall(asynchronous=True)
             return True
         except Exception as e:
             return False
     
+    def get_stats_history(self, minutes: float = 15, step: int = 1) -> Dict[str, Any]:
+        """Get per-interval ops/sec, hit rate, command latency and LATENCY events"""
+        samples = self.stats_sampler.history(minutes * 60, step)
+        return {
+            "interval_seconds": self.stats_sampler.interval,
+            "samples": samples,
+            "error": self.stats_sampler.last_error
+        }
+    
+    def get_stats_latest(self) -> Dict[str, Any]:
+        """Get the most recent interval sample"""
+        sample = self.stats_sampler.latest()
+        if sample is None:
+            return {"pending": True, "error": self.stats_sampler.last_error}
+        return sample
+    
+    def get_memory_report(self, force: bool = False) -> Dict[str, Any]:
+        """Get the cached per-prefix memory breakdown (refreshed in the background)"""
+        try:
+            return self.memory_analyzer.get_report(force)
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+    
+    def set_memory_grouping(self, segments: int, separator: str = ":") -> Dict[str, Any]:
+        """Change how keys are grouped into prefixes, starting a new analysis if it changed"""
+        try:
+            changed = self.memory_analyzer.configure(segments, separator)
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        return self.get_memory_report(force=changed)
+    
+    def close(self):
+        """Disconnect every pooled connection"""
+        if self._pool is not None:
+            self._pool.disconnect()
+    
     def _format_uptime(self, seconds: int) -> str:
         """Format uptime in human-readable format"""
         days = seconds // 86400
@@ -187,6 +467,112 @@ class RedisManager:
         return f"{days}d {hours}h {minutes}m"
 
 
+class AsyncRedisManager:
+    """
+    asyncio counterpart of RedisManager for the FastAPI bridge
+    
+    Uses redis.asyncio with its own bounded pool, so event-loop code never blocks on
+    a socket read. Key info is built with the same two-round pipeline.
+    """
+    
+    def __init__(self, host=None, port=None, db=0, password=None, max_connections=None):
+        if not ASYNC_REDIS_AVAILABLE:
+            raise RuntimeError("redis.asyncio requires redis-py >= 4.2")
+        self.host = host or os.getenv('REDIS_HOST', 'localhost')
+        self.port = port or int(os.getenv('REDIS_PORT', '6379'))
+        self.password = password or os.getenv('REDIS_PASSWORD', None)
+        self.db = db
+        self.max_connections = max_connections or int(os.getenv('REDIS_POOL_MAX', '20'))
+        self._pool = aioredis.BlockingConnectionPool(
+            max_connections=self.max_connections,
+            timeout=5,
+            host=self.host,
+            port=self.port,
+            db=self.db,
+            password=self.password,
+            decode_responses=True,
+            socket_timeout=5,
+            health_check_interval=30
+        )
+        self._client = aioredis.Redis(connection_pool=self._pool)
+    
+    async def get_info(self) -> Dict[str, Any]:
+        try:
+            info = await self._client.info()
+            return {
+                "connected": True,
+                "version": info.get('redis_version', 'unknown'),
+                "uptime_seconds": info.get('uptime_in_seconds', 0),
+                "connected_clients": info.get('connected_clients', 0),
+                "used_memory": info.get('used_memory_human', '0'),
+                "instantaneous_ops_per_sec": info.get('instantaneous_ops_per_sec', 0),
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        except Exception as e:
+            return {
+                "connected": False,
+                "error": str(e),
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }
+    
+    async def scan_keys(self, pattern: str = "*", count: int = 100) -> List[str]:
+        try:
+            keys = []
+            async for key in self._client.scan_iter(match=pattern, count=count):
+                keys.append(key)
+                if len(keys) >= count:
+                    break
+            return keys
+        except Exception:
+            return []
+    
+    async def scan_keys_page(self, pattern: str = "*", cursor: str = "0", count: int = 100,
+                             key_type: Optional[str] = None, time_budget_ms: int = 250,
+                             with_info: bool = True) -> Dict[str, Any]:
+        try:
+            page = _KeyPage(pattern, cursor, count, key_type, time_budget_ms)
+            while not page.add(await self._client.scan(**page.scan_args())):
+                pass
+            
+            replies = None
+            if with_info and page.keys:
+                pipe = self._client.pipeline(transaction=False)
+                page.queue_enrichment(pipe)
+                replies = await pipe.execute(raise_on_error=False)
+            return page.result(replies)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def get_key_info(self, key: str) -> Dict[str, Any]:
+        result = await self.get_keys_info([key])
+        return result[0] if isinstance(result, list) else result
+    
+    async def get_keys_info(self, keys: List[str]) -> List[Dict[str, Any]]:
+        if not keys:
+            return []
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            _queue_metadata(pipe, keys)
+            metadata = await pipe.execute()
+            
+            pipe = self._client.pipeline(transaction=False)
+            _queue_sizes(pipe, keys, metadata[0::2])
+            sizes = await pipe.execute(raise_on_error=False)
+            
+            return _build_keys_info(keys, metadata, sizes)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def delete_key(self, key: str) -> bool:
+        try:
+            return await self._client.unlink(key) > 0
+        except Exception:
+            return False
+    
+    async def close(self):
+        await self._pool.disconnect()
+
+
 # Global instance
 redis_manager = RedisManager()
 
@@ -204,12 +590,44 @@ def get_redis_cache_hit_rate():
 def scan_redis_keys(pattern: str = "*", count: int = 100):
     return redis_manager.scan_keys(pattern, count)
 
+def scan_redis_keys_page(pattern: str = "*", cursor: str = "0", count: int = 100,
+                         key_type: Optional[str] = None, time_budget_ms: int = 250):
+    return redis_manager.scan_keys_page(pattern, cursor, count, key_type, time_budget_ms)
+
 def get_redis_key_info(key: str):
     return redis_manager.get_key_info(key)
 
+def get_redis_keys_info(keys: List[str]):
+    return redis_manager.get_keys_info(keys)
+
+def get_redis_pool_stats():
+    return redis_manager.get_pool_stats()
+
+def get_redis_stats_history(minutes: float = 15, step: int = 1):
+    return redis_manager.get_stats_history(minutes, step)
+
+def get_redis_stats_latest():
+    return redis_manager.get_stats_latest()
+
+def get_redis_memory_report(force: bool = False):
+    return redis_manager.get_memory_report(force)
+
+def set_redis_memory_grouping(segments: int, separator: str = ":"):
+    return redis_manager.set_memory_grouping(segments, separator)
+
 def delete_redis_key(key: str):
     return redis_manager.delete_key(key)
 
+def start_redis_bulk_delete(pattern: str, batch_size: int = 500, max_keys_per_sec: float = 20000,
+                            dry_run: bool = False):
+    return redis_manager.start_bulk_delete(pattern, batch_size, max_keys_per_sec, dry_run)
+
+def get_redis_bulk_delete_status(job_id: Optional[str] = None):
+    return redis_manager.get_bulk_delete_status(job_id)
+
+def cancel_redis_bulk_delete(job_id: str):
+    return redis_manager.cancel_bulk_delete(job_id)
+
 def flush_redis_db():
     return redis_manager.flush_db()
 
@@ -0,0 +1,211 @@
+"""
+Redis Memory Analyzer
+Sampled per-prefix memory breakdown and largest keys, refreshed in the background
+"""
+
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+OTHER_GROUP = "(other)"
+
+
+class RedisMemoryAnalyzer:
+    """
+    Estimates memory per key prefix without measuring every key.
+
+    One SCAN pass counts keys per prefix (the first `segments` parts of the key split
+    on `separator`, e.g. "trader-TRADER-001:orders") and keeps a uniform reservoir
+    sample per prefix. MEMORY USAGE and OBJECT ENCODING are then pipelined for the
+    sampled keys only, and each prefix's total is estimated as count * mean size with
+    a 95% confidence interval. The report is cached and recomputed at most once per
+    refresh_interval, on a background thread.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], segments: int = 2, separator: str = ":",
+                 samples_per_group: int = 200, max_groups: int = 200, max_scan_keys: int = 2_000_000,
+                 top_n: int = 20, refresh_interval: float = 300.0):
+        self.client_factory = client_factory
+        self.segments = segments
+        self.separator = separator
+        self.samples_per_group = samples_per_group
+        self.max_groups = max_groups
+        self.max_scan_keys = max_scan_keys
+        self.top_n = top_n
+        self.refresh_interval = refresh_interval
+        self._report: Optional[Dict[str, Any]] = None
+        self._error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, segments: Optional[int] = None, separator: Optional[str] = None) -> bool:
+        """
+        Change the prefix grouping. The cached report is discarded only when the
+        grouping actually changes; returns whether it did.
+        """
+        with self._lock:
+            segments = self.segments if segments is None else max(1, segments)
+            separator = separator or self.separator
+            if (segments, separator) == (self.segments, self.separator):
+                return False
+            self.segments, self.separator = segments, separator
+            self._report = None
+            return True
+
+    def get_report(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Return the cached report, starting a background refresh when it is missing,
+        older than refresh_interval or forced. Never blocks on the analysis itself.
+        """
+        with self._lock:
+            report = self._report
+            stale = report is None or time.time() - report["analyzed_at_epoch"] > self.refresh_interval
+            if (stale or force) and not self.refreshing:
+                self._thread = threading.Thread(target=self._refresh, name="redis-memory-analyzer", daemon=True)
+                self._thread.start()
+            refreshing = self.refreshing
+
+        if report is None:
+            return {"status": "error" if self._error and not refreshing else "analyzing",
+                    "error": self._error, "refreshing": refreshing}
+        return {**report, "status": "ready", "refreshing": refreshing,
+                "age_seconds": round(time.time() - report["analyzed_at_epoch"], 1)}
+
+    @property
+    def refreshing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def analyze(self) -> Dict[str, Any]:
+        """Run one full analysis synchronously"""
+        started = time.monotonic()
+        client = self.client_factory()
+        segments, separator = self.segments, self.separator
+        dbsize = client.dbsize()
+
+        counts: Dict[str, int] = {}
+        reservoirs: Dict[str, List[str]] = {}
+        scanned = 0
+        cursor = 0
+        while True:
+            cursor, keys = client.scan(cursor=cursor, count=1000)
+            for key in keys:
+                group = self._group(key, segments, separator, counts)
+                seen = counts.get(group, 0) + 1
+                counts[group] = seen
+                reservoir = reservoirs.setdefault(group, [])
+                # Algorithm R: every key in the group has the same chance to be sampled
+                if len(reservoir) < self.samples_per_group:
+                    reservoir.append(key)
+                else:
+                    slot = random.randrange(seen)
+                    if slot < self.samples_per_group:
+                        reservoir[slot] = key
+            scanned += len(keys)
+            if cursor == 0 or scanned >= self.max_scan_keys:
+                break
+
+        complete = cursor == 0
+        # A truncated scan saw a prefix of the keyspace; scale counts up to DBSIZE
+        scale = dbsize / scanned if scanned and not complete else 1.0
+
+        measured = self._measure(client, [key for sample in reservoirs.values() for key in sample])
+
+        groups = []
+        for group, count in counts.items():
+            sizes = [measured[key]["bytes"] for key in reservoirs[group]
+                     if key in measured and measured[key]["bytes"] is not None]
+            encodings: Dict[str, int] = {}
+            for key in reservoirs[group]:
+                encoding = measured.get(key, {}).get("encoding")
+                if encoding:
+                    encodings[encoding] = encodings.get(encoding, 0) + 1
+            groups.append(self._estimate(group, count * scale, sizes, encodings))
+        groups.sort(key=lambda g: g["estimated_bytes"], reverse=True)
+
+        top_keys = sorted(
+            ({"key": key, "bytes": m["bytes"], "encoding": m["encoding"],
+              "group": self._group(key, segments, separator, counts)}
+             for key, m in measured.items() if m["bytes"] is not None),
+            key=lambda k: k["bytes"],
+            reverse=True,
+        )[:self.top_n]
+
+        info = client.info("memory")
+        now = time.time()
+        return {
+            "analyzed_at": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+            "analyzed_at_epoch": now,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "dbsize": dbsize,
+            "scanned_keys": scanned,
+            "sampled_keys": len(measured),
+            "complete_scan": complete,
+            "used_memory": info.get("used_memory", 0),
+            "used_memory_human": info.get("used_memory_human", "0"),
+            "estimated_key_bytes": round(sum(g["estimated_bytes"] for g in groups)),
+            "grouping": {"segments": segments, "separator": separator},
+            "groups": groups,
+            # Largest keys among the sampled ones, not an exhaustive ranking
+            "top_keys": top_keys,
+        }
+
+    def _refresh(self):
+        try:
+            report = self.analyze()
+            with self._lock:
+                # Regrouped while this pass ran: drop it so the next read starts afresh
+                if report["grouping"] == {"segments": self.segments, "separator": self.separator}:
+                    self._report = report
+                self._error = None
+        except Exception as e:
+            self._error = str(e)
+            print(f"Redis memory analyzer error: {e}")
+
+    def _group(self, key: str, segments: int, separator: str, counts: Dict[str, int]) -> str:
+        group = separator.join(key.split(separator, segments)[:segments])
+        if group not in counts and len(counts) >= self.max_groups:
+            return OTHER_GROUP
+        return group
+
+    def _measure(self, client, keys: List[str], batch_size: int = 500) -> Dict[str, Dict[str, Any]]:
+        """Pipelined MEMORY USAGE + OBJECT ENCODING, batch_size keys per round trip"""
+        measured = {}
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            pipe = client.pipeline(transaction=False)
+            for key in batch:
+                pipe.memory_usage(key)
+                pipe.object("encoding", key)
+            replies = pipe.execute(raise_on_error=False)
+            for j, key in enumerate(batch):
+                size, encoding = replies[2 * j], replies[2 * j + 1]
+                # Keys deleted or expired since the SCAN reply come back as None / errors
+                measured[key] = {
+                    "bytes": size if isinstance(size, int) else None,
+                    "encoding": encoding if isinstance(encoding, str) else None,
+                }
+        return measured
+
+    def _estimate(self, group: str, count: float, sizes: List[int], encodings: Dict[str, int]) -> Dict[str, Any]:
+        """count * mean with a 95% interval from the sample standard error (finite population corrected)"""
+        n = len(sizes)
+        mean = sum(sizes) / n if n else 0.0
+        estimate = count * mean
+        margin = 0.0
+        if 1 < n < count:
+            variance = sum((s - mean) ** 2 for s in sizes) / (n - 1)
+            fpc = math.sqrt(max(0.0, 1 - n / count))
+            margin = 1.96 * count * math.sqrt(variance / n) * fpc
+
+        return {
+            "prefix": group,
+            "keys": round(count),
+            "sampled": n,
+            "mean_bytes": round(mean, 1),
+            "estimated_bytes": round(estimate),
+            "ci95_bytes": [round(max(0.0, estimate - margin)), round(estimate + margin)],
+            "encodings": encodings,
+        }
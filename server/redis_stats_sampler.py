@@ -0,0 +1,159 @@
+"""
+Redis Stats Sampler
+Background thread that turns INFO counters into per-interval rates kept in a ring buffer
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class RedisStatsSampler:
+    """
+    Polls INFO stats, INFO commandstats and LATENCY LATEST on a fixed interval.
+
+    INFO counters are lifetime totals, so each sample stores the delta against the
+    previous poll: ops/sec, hit rate and per-command usec_per_call over that interval
+    only. A counter going backwards (server restart, CONFIG RESETSTAT) restarts the
+    deltas instead of producing negative rates.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], interval: float = 5.0, history_seconds: int = 3600):
+        self.client_factory = client_factory
+        self.interval = interval
+        self._samples: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(history_seconds / interval)))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._prev: Optional[Dict[str, Any]] = None
+        self._last_error: Optional[str] = None
+
+    def start(self):
+        """Start the sampler thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="redis-stats-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent interval sample, None until two polls have completed"""
+        self.start()
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def history(self, seconds: Optional[float] = None, step: int = 1) -> List[Dict[str, Any]]:
+        """Samples from the last `seconds` (all retained if None), every `step`-th sample"""
+        self.start()
+        with self._lock:
+            samples = list(self._samples)
+
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            samples = [s for s in samples if s["sampled_at"] >= cutoff]
+
+        if step > 1:
+            samples = samples[::step]
+        return samples
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return self._last_error
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._take_sample()
+                self._last_error = None
+            except Exception as e:
+                # Redis down: drop the baseline so the first sample after recovery is not a huge delta
+                self._prev = None
+                self._last_error = str(e)
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _take_sample(self):
+        client = self.client_factory()
+        pipe = client.pipeline(transaction=False)
+        pipe.info("stats")
+        pipe.info("commandstats")
+        pipe.execute_command("LATENCY", "LATEST")
+        stats, commandstats, latency = pipe.execute()
+
+        current = {
+            "at": time.time(),
+            "stats": stats,
+            "commands": {
+                name[len("cmdstat_"):]: values
+                for name, values in commandstats.items()
+                if name.startswith("cmdstat_")
+            },
+        }
+        previous, self._prev = self._prev, current
+        if previous is None:
+            return
+
+        elapsed = current["at"] - previous["at"]
+        if elapsed <= 0:
+            return
+
+        def delta(key: str) -> Optional[int]:
+            change = current["stats"].get(key, 0) - previous["stats"].get(key, 0)
+            return change if change >= 0 else None
+
+        commands_processed = delta("total_commands_processed")
+        if commands_processed is None:
+            # Counters were reset; this poll becomes the new baseline
+            return
+
+        hits = delta("keyspace_hits") or 0
+        misses = delta("keyspace_misses") or 0
+
+        sample = {
+            "sampled_at": current["at"],
+            "timestamp": datetime.fromtimestamp(current["at"], tz=timezone.utc).isoformat(),
+            "interval_seconds": round(elapsed, 3),
+            "ops_per_sec": round(commands_processed / elapsed, 1),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses) * 100, 2) if hits + misses else None,
+            "expired_keys": delta("expired_keys") or 0,
+            "evicted_keys": delta("evicted_keys") or 0,
+            "net_input_bytes_per_sec": round((delta("total_net_input_bytes") or 0) / elapsed, 1),
+            "net_output_bytes_per_sec": round((delta("total_net_output_bytes") or 0) / elapsed, 1),
+            "commands": self._command_deltas(previous["commands"], current["commands"], elapsed),
+            "latency_events": [
+                {"event": event, "last_at": last_at, "latest_ms": latest_ms, "max_ms": max_ms}
+                for event, last_at, latest_ms, max_ms in (latency or [])
+            ],
+        }
+
+        with self._lock:
+            self._samples.append(sample)
+
+    def _command_deltas(self, previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]],
+                        elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """Calls/sec and usec_per_call for commands that ran during the interval"""
+        commands = {}
+        for name, values in current.items():
+            before = previous.get(name, {})
+            calls = values.get("calls", 0) - before.get("calls", 0)
+            usec = values.get("usec", 0) - before.get("usec", 0)
+            if calls <= 0 or usec < 0:
+                continue
+            commands[name] = {
+                "calls": calls,
+                "calls_per_sec": round(calls / elapsed, 1),
+                "usec_per_call": round(usec / calls, 2),
+            }
+        return commands
@@ -1,13 +1,11 @@
 import { COOKIE_NAME } from "@shared/const";
-import { promisify } from "util";
-import { exec as execCallback } from "child_process";
-const exec = promisify(execCallback);
 import { spawn } from "child_process";
 import path from "path";
 import { fileURLToPath } from "url";
 import { z } from "zod";
 import { nanoid } from "nanoid";
 import * as db from "./db";
+import { callPython } from "./_core/pythonWorker";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -31,71 +29,20 @@ export const appRouter = router({
 
   nautilus: router({
     version: publicProcedure.query(async () => {
-      return new Promise((resolve, reject) => {
-        const pythonPath = "python3.11";
-        const scriptPath = path.join(__dirname, "nautilus_api.py");
-        const proc = spawn(pythonPath, ["-c", "import nautilus_trader; print(nautilus_trader.__version__)"]);
-        
-        let output = "";
-        let error = "";
-        
-        proc.stdout.on("data", (data) => {
-          output += data.toString();
-        });
-        
-        proc.stderr.on("data", (data) => {
-          error += data.toString();
-        });
-        
-        proc.on("close", (code) => {
-          if (code === 0) {
-            resolve({ success: true, version: output.trim() });
-          } else {
-            resolve({ success: false, error: error || "Unknown error" });
-          }
-        });
-        
-        setTimeout(() => {
-          proc.kill();
-          reject(new Error("Timeout"));
-        }, 5000);
-      });
+      try {
+        const version = await callPython<string>("nautilus_api", "get_version");
+        return { success: true, version };
+      } catch (error: any) {
+        return { success: false, error: error.message };
+      }
     }),
     
     systemInfo: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const scriptPath = path.join(__dirname, "nautilus_api.py");
-        const code = `
-import json
-from nautilus_api import get_system_info
-print(json.dumps(get_system_info()))
-`;
-        const proc = spawn(pythonPath, ["-c", code], {
-          cwd: __dirname,
-          env: { ...process.env, PYTHONPATH: __dirname }
-        });
-        
-        let output = "";
-        
-        proc.stdout.on("data", (data) => {
-          output += data.toString();
-        });
-        
-        proc.on("close", () => {
-          try {
-            const result = JSON.parse(output);
-            resolve(result);
-          } catch (e) {
-            resolve({ success: false, error: "Failed to parse output" });
-          }
-        });
-        
-        setTimeout(() => {
-          proc.kill();
-          resolve({ success: false, error: "Timeout" });
-        }, 5000);
-      });
+      try {
+        return await callPython("nautilus_api", "get_system_info");
+      } catch (error: any) {
+        return { success: false, error: error.message };
+      }
     }),
     
     runBacktest: publicProcedure.mutation(async () => {
@@ -134,39 +81,69 @@ print(json.dumps(run_simple_backtest()))
     }),
     
     listIndicators: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-from nautilus_api import list_available_indicators
-print(json.dumps(list_available_indicators()))
-`;
-        const proc = spawn(pythonPath, ["-c", code], {
-          cwd: __dirname,
-          env: { ...process.env, PYTHONPATH: __dirname }
-        });
-        
-        let output = "";
-        
-        proc.stdout.on("data", (data) => {
-          output += data.toString();
-        });
-        
-        proc.on("close", () => {
-          try {
-            const result = JSON.parse(output);
-            resolve(result);
-          } catch (e) {
-            resolve({ success: false, error: "Failed to parse output" });
-          }
-        });
-        
-        setTimeout(() => {
-          proc.kill();
-          resolve({ success: false, error: "Timeout" });
-        }, 5000);
-      });
+      try {
+        return await callPython("nautilus_api", "list_available_indicators");
+      } catch (error: any) {
+        return { success: false, error: error.message };
+      }
     }),
+
+    runParameterSweep: publicProcedure
+      .input(z.object({
+        grid: z.record(z.array(z.number())).optional(),
+        space: z.record(z.union([
+          z.array(z.number()),
+          z.object({ min: z.number(), max: z.number() }),
+        ])).optional(),
+        samples: z.number().min(1).max(1000).default(50),
+        workers: z.number().min(1).max(256).optional(),
+        instrumentId: z.string().default("EUR/USD.SIM"),
+        start: z.string().optional(),
+        end: z.string().optional(),
+        seed: z.number().default(42),
+        sortBy: z.string().default("pnl"),
+      }).default({}))
+      .mutation(async ({ input }) => {
+        try {
+          // Runs in the background; poll getParameterSweepStatus with the returned id
+          return await callPython("backtest_sweep", "start_parameter_sweep", [], {
+            kwargs: {
+              grid: input.grid ?? null,
+              space: input.space ?? null,
+              samples: input.samples,
+              workers: input.workers ?? null,
+              instrument_id: input.instrumentId,
+              start: input.start ?? null,
+              end: input.end ?? null,
+              seed: input.seed,
+              sort_by: input.sortBy,
+            },
+            timeoutMs: 30_000,
+          });
+        } catch (error: any) {
+          return { success: false, error: error.message };
+        }
+      }),
+
+    getParameterSweepStatus: publicProcedure
+      .input(z.object({ jobId: z.string().optional() }).optional())
+      .query(async ({ input }) => {
+        try {
+          return await callPython("backtest_sweep", "get_parameter_sweep_status", [input?.jobId ?? null]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
+    cancelParameterSweep: publicProcedure
+      .input(z.object({ jobId: z.string() }))
+      .mutation(async ({ input }) => {
+        try {
+          return await callPython("backtest_sweep", "cancel_parameter_sweep", [input.jobId]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
   }),
 
   strategies: router({
@@ -504,178 +481,216 @@ print(json.dumps(result))
 
     // Redis Management
     getRedisInfo: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from redis_manager import get_redis_info
-print(json.dumps(get_redis_info()))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve({ connected: false, error: "Failed to parse output" });
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve({ connected: false, error: "Timeout" }); }, 5000);
-      });
+      try {
+        return await callPython("redis_manager", "get_redis_info");
+      } catch (error: any) {
+        return { connected: false, error: error.message };
+      }
     }),
 
     getRedisKeyspaceStats: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from redis_manager import get_redis_keyspace_stats, get_redis_cache_hit_rate
-result = {
-  "keyspaces": get_redis_keyspace_stats(),
-  "hit_rate": get_redis_cache_hit_rate()
-}
-print(json.dumps(result))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve({ keyspaces: [], hit_rate: 0 });
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve({ keyspaces: [], hit_rate: 0 }); }, 5000);
-      });
+      try {
+        const [keyspaces, hit_rate] = await Promise.all([
+          callPython("redis_manager", "get_redis_keyspace_stats"),
+          callPython("redis_manager", "get_redis_cache_hit_rate"),
+        ]);
+        return { keyspaces, hit_rate };
+      } catch (error: any) {
+        return { keyspaces: [], hit_rate: 0 };
+      }
     }),
 
+    scanRedisKeys: publicProcedure
+      .input(z.object({
+        pattern: z.string().default("*"),
+        cursor: z.string().default("0"),
+        count: z.number().min(1).max(1000).default(100),
+        type: z.enum(["string", "list", "set", "zset", "hash", "stream"]).optional(),
+        timeBudgetMs: z.number().min(10).max(2000).default(250),
+      }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "scan_redis_keys_page", [
+            input.pattern,
+            input.cursor,
+            input.count,
+            input.type ?? null,
+            input.timeBudgetMs,
+          ]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
+    getRedisStatsHistory: publicProcedure
+      .input(z.object({
+        minutes: z.number().min(1).max(60).default(15),
+        step: z.number().int().min(1).default(1),
+      }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "get_redis_stats_history", [input.minutes, input.step]);
+        } catch (error: any) {
+          return { interval_seconds: 5, samples: [], error: error.message };
+        }
+      }),
+
+    getRedisMemoryReport: publicProcedure
+      .input(z.object({ force: z.boolean().default(false) }).optional())
+      .query(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "get_redis_memory_report", [input?.force ?? false]);
+        } catch (error: any) {
+          return { status: "error", error: error.message };
+        }
+      }),
+
+    setRedisMemoryGrouping: publicProcedure
+      .input(z.object({
+        segments: z.number().int().min(1).max(6),
+        separator: z.string().min(1).max(4).default(":"),
+      }))
+      .mutation(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "set_redis_memory_grouping", [input.segments, input.separator]);
+        } catch (error: any) {
+          return { status: "error", error: error.message };
+        }
+      }),
+
+    startRedisBulkDelete: publicProcedure
+      .input(z.object({
+        pattern: z.string().min(1),
+        batchSize: z.number().min(1).max(10000).default(500),
+        maxKeysPerSec: z.number().min(0).default(20000),
+        dryRun: z.boolean().default(false),
+      }))
+      .mutation(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "start_redis_bulk_delete", [
+            input.pattern,
+            input.batchSize,
+            input.maxKeysPerSec,
+            input.dryRun,
+          ]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
+    getRedisBulkDeleteStatus: publicProcedure
+      .input(z.object({ jobId: z.string().optional() }).optional())
+      .query(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "get_redis_bulk_delete_status", [input?.jobId ?? null]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
+    cancelRedisBulkDelete: publicProcedure
+      .input(z.object({ jobId: z.string() }))
+      .mutation(async ({ input }) => {
+        try {
+          return await callPython("redis_manager", "cancel_redis_bulk_delete", [input.jobId]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
     flushRedisCache: publicProcedure.mutation(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from redis_manager import flush_redis_db
-result = flush_redis_db()
-print(json.dumps({"success": result}))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve({ success: false });
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve({ success: false }); }, 5000);
-      });
+      try {
+        const result = await callPython<boolean>("redis_manager", "flush_redis_db");
+        return { success: result };
+      } catch (error: any) {
+        return { success: false };
+      }
     }),
 
     // PostgreSQL Management
     getPostgresInfo: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from postgres_manager import get_postgres_info
-print(json.dumps(get_postgres_info()))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve({ connected: false, error: "Failed to parse output" });
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve({ connected: false, error: "Timeout" }); }, 5000);
-      });
+      try {
+        return await callPython("postgres_manager", "get_postgres_info");
+      } catch (error: any) {
+        return { connected: false, error: error.message };
+      }
     }),
 
     getPostgresTables: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from postgres_manager import get_postgres_tables
-print(json.dumps(get_postgres_tables()))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve([]);
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve([]); }, 5000);
-      });
+      try {
+        return await callPython("postgres_manager", "get_postgres_tables");
+      } catch (error: any) {
+        return [];
+      }
     }),
 
+    queryPostgresTable: publicProcedure
+      .input(z.object({
+        table: z.string(),
+        limit: z.number().min(1).max(1000).default(100),
+        cursor: z.string().optional(),
+        filters: z.record(z.union([z.string(), z.number(), z.boolean()])).optional(),
+      }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("postgres_manager", "query_postgres_table", [
+            input.table,
+            input.limit,
+            input.cursor ?? null,
+            input.filters ?? null,
+          ]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
     // Parquet Management
     getParquetOverview: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from parquet_manager import get_parquet_overview
-print(json.dumps(get_parquet_overview()))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve({ total_files: 0, total_size: "0 B" });
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve({ total_files: 0, total_size: "0 B" }); }, 5000);
-      });
+      try {
+        return await callPython("parquet_manager", "get_parquet_overview");
+      } catch (error: any) {
+        return { total_files: 0, total_size: "0 B" };
+      }
     }),
 
     listParquetDirectories: publicProcedure.query(async () => {
-      return new Promise((resolve) => {
-        const pythonPath = "python3.11";
-        const code = `
-import json
-import sys
-sys.path.append('/home/ubuntu/nautilus-trader-demo/server')
-from parquet_manager import list_parquet_directories
-print(json.dumps(list_parquet_directories()))
-`;
-        const proc = spawn(pythonPath, ["-c", code]);
-        let output = "";
-        proc.stdout.on("data", (data) => { output += data.toString(); });
-        proc.on("close", () => {
-          try {
-            resolve(JSON.parse(output));
-          } catch (e) {
-            resolve([]);
-          }
-        });
-        setTimeout(() => { proc.kill(); resolve([]); }, 5000);
-      });
+      try {
+        return await callPython("parquet_manager", "list_parquet_directories");
+      } catch (error: any) {
+        return [];
+      }
+    }),
+
+    queryParquet: publicProcedure
+      .input(z.object({
+        directory: z.enum(["bars", "quotes", "trades"]),
+        instrumentId: z.string().optional(),
+        start: z.string().optional(),
+        end: z.string().optional(),
+        columns: z.array(z.string()).optional(),
+        limit: z.number().min(1).max(10000).default(1000),
+      }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("parquet_manager", "query_parquet", [
+            input.directory,
+            input.instrumentId ?? null,
+            input.start ?? null,
+            input.end ?? null,
+            input.columns ?? null,
+            input.limit,
+          ], { timeoutMs: 30_000 });
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
+    reindexParquetCatalog: publicProcedure.mutation(async () => {
+      try {
+        return await callPython("parquet_manager", "reindex_parquet_catalog", [], { timeoutMs: 300_000 });
+      } catch (error: any) {
+        return { error: error.message };
+      }
     }),
   }),
 
@@ -855,9 +870,7 @@ print(json.dumps(list_parquet_directories()))
   nautilusCore: router({
     getSystemStatus: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_system_status; import json; print(json.dumps(get_system_status()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "get_system_status");
       } catch (error: any) {
         return { status: "error", message: error.message };
       }
@@ -867,9 +880,7 @@ print(json.dumps(list_parquet_directories()))
       .input(z.object({ component: z.string() }))
       .query(async ({ input }) => {
         try {
-          const projectRoot = path.join(__dirname, "..");
-          const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_component_status; import json; print(json.dumps(get_component_status('${input.component}')))"`);
-          return JSON.parse(stdout.trim());
+          return await callPython("nautilus_bridge", "get_component_status", [input.component]);
         } catch (error: any) {
           return { error: error.message };
         }
@@ -877,9 +888,7 @@ print(json.dumps(list_parquet_directories()))
 
     getAllComponents: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_all_components; import json; print(json.dumps(get_all_components()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "get_all_components");
       } catch (error: any) {
         return [];
       }
@@ -887,19 +896,28 @@ print(json.dumps(list_parquet_directories()))
 
     getSystemMetrics: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_system_metrics; import json; print(json.dumps(get_system_metrics()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "get_system_metrics");
       } catch (error: any) {
         return { error: error.message };
       }
     }),
 
+    getMetricsHistory: publicProcedure
+      .input(z.object({
+        minutes: z.number().min(1).max(15).default(5),
+        step: z.number().int().min(1).default(1),
+      }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("nautilus_bridge", "get_metrics_history", [input.minutes, input.step]);
+        } catch (error: any) {
+          return { interval_seconds: 1, count: 0, samples: [] };
+        }
+      }),
+
     getTradingMetrics: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_trading_metrics; import json; print(json.dumps(get_trading_metrics()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "get_trading_metrics");
       } catch (error: any) {
         return { error: error.message };
       }
@@ -913,10 +931,7 @@ print(json.dumps(list_parquet_directories()))
       }))
       .query(async ({ input }) => {
         try {
-          const projectRoot = path.join(__dirname, "..");
-          const component = input.component ? `'${input.component}'` : "None";
-          const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import get_logs; import json; print(json.dumps(get_logs(${component}, '${input.level}', ${input.limit})))"`);
-          return JSON.parse(stdout.trim());
+          return await callPython("nautilus_bridge", "get_logs", [input.component ?? null, input.level, input.limit]);
         } catch (error: any) {
           return [];
         }
@@ -926,9 +941,7 @@ print(json.dumps(list_parquet_directories()))
       .input(z.object({ component: z.string() }))
       .mutation(async ({ input }) => {
         try {
-          const projectRoot = path.join(__dirname, "..");
-          const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import restart_component; import json; print(json.dumps(restart_component('${input.component}')))"`);
-          return JSON.parse(stdout.trim());
+          return await callPython("nautilus_bridge", "restart_component", [input.component]);
         } catch (error: any) {
           return { success: false, message: error.message };
         }
@@ -936,9 +949,7 @@ print(json.dumps(list_parquet_directories()))
 
     emergencyStopAll: publicProcedure.mutation(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.nautilus_bridge import emergency_stop_all; import json; print(json.dumps(emergency_stop_all()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("nautilus_bridge", "emergency_stop_all");
       } catch (error: any) {
         return { success: false, message: error.message };
       }
@@ -947,9 +958,7 @@ print(json.dumps(list_parquet_directories()))
     // Feature and Service Management
     getAllFeatures: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_all_features; import json; print(json.dumps(get_all_features()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("feature_manager", "get_all_features");
       } catch (error: any) {
         return { features: [], total: 0, categories: [] };
       }
@@ -959,9 +968,7 @@ print(json.dumps(list_parquet_directories()))
       .input(z.object({ category: z.string() }))
       .query(async ({ input }) => {
         try {
-          const projectRoot = path.join(__dirname, "..");
-          const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_features_by_category; import json; print(json.dumps(get_features_by_category('${input.category}')))"`);
-          return JSON.parse(stdout.trim());
+          return await callPython("feature_manager", "get_features_by_category", [input.category]);
         } catch (error: any) {
           return [];
         }
@@ -969,29 +976,81 @@ print(json.dumps(list_parquet_directories()))
 
     getFeatureStatusSummary: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_feature_status_summary; import json; print(json.dumps(get_feature_status_summary()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("feature_manager", "get_feature_status_summary");
       } catch (error: any) {
         return { available: 0, configured: 0, requires_config: 0, requires_data: 0 };
       }
     }),
 
+    toggleFeature: publicProcedure
+      .input(z.object({ featureId: z.string(), enabled: z.boolean(), force: z.boolean().default(false) }))
+      .mutation(async ({ input }) => {
+        try {
+          return await callPython("feature_manager", "toggle_feature", [input.featureId, input.enabled, input.force]);
+        } catch (error: any) {
+          return { success: false, error: error.message };
+        }
+      }),
+
+    getFeatureImpact: publicProcedure
+      .input(z.object({ feature: z.string() }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("feature_manager", "get_feature_impact", [input.feature]);
+        } catch (error: any) {
+          return { error: error.message };
+        }
+      }),
+
+    getStartupOrder: publicProcedure
+      .input(z.object({ features: z.array(z.string()).optional() }).optional())
+      .query(async ({ input }) => {
+        try {
+          return await callPython("feature_manager", "get_startup_order", [input?.features ?? null]);
+        } catch (error: any) {
+          return { order: [], total: 0, cycles: [] };
+        }
+      }),
+
+    getDependencyCycles: publicProcedure.query(async () => {
+      try {
+        return await callPython("feature_manager", "get_dependency_cycles");
+      } catch (error: any) {
+        return { cycles: [], nodes: 0, edges: 0, optional_edges: 0 };
+      }
+    }),
+
     getAllServices: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_all_services; import json; print(json.dumps(get_all_services()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("feature_manager", "get_all_services");
       } catch (error: any) {
         return { services: [], total: 0 };
       }
     }),
 
+    queryServices: publicProcedure
+      .input(z.object({
+        category: z.string().optional(),
+        state: z.string().optional(),
+        offset: z.number().int().min(0).default(0),
+        limit: z.number().int().min(1).max(1000).default(50),
+      }))
+      .query(async ({ input }) => {
+        try {
+          return await callPython("nautilus_bridge", "query_services", [
+            input.category ?? null,
+            input.state ?? null,
+            input.offset,
+            input.limit,
+          ]);
+        } catch (error: any) {
+          return { services: [], total: 0, offset: input.offset, limit: input.limit };
+        }
+      }),
+
     getCoreComponents: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_core_components; import json; print(json.dumps(get_core_components()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("feature_manager", "get_core_components");
       } catch (error: any) {
         return [];
       }
@@ -999,9 +1058,7 @@ print(json.dumps(list_parquet_directories()))
 
     getComponentHealthSummary: publicProcedure.query(async () => {
       try {
-        const projectRoot = path.join(__dirname, "..");
-        const { stdout } = await exec(`cd ${projectRoot} && python3.11 -c "from server.feature_manager import get_component_health_summary; import json; print(json.dumps(get_component_health_summary()))"`);
-        return JSON.parse(stdout.trim());
+        return await callPython("feature_manager", "get_component_health_summary");
       } catch (error: any) {
         return { healthy: 0, degraded: 0, unhealthy: 0, stopped: 0 };
       }
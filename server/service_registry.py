@@ -0,0 +1,200 @@
+"""
+Service Registry
+Indexed store of Nautilus services with resource readings taken from a shared sampled snapshot
+"""
+
+import threading
+import time
+from itertools import islice
+from typing import Any, Collection, Dict, Optional
+
+import psutil
+
+
+class ServiceRegistry:
+    """
+    Keeps service records indexed by category and state.
+
+    Resource readings are refreshed on the metrics sampler thread: services bound to a
+    PID keep a cached psutil.Process handle, the rest share one host CPU reading. Reads
+    never call psutil, so listing cost depends on the page size, not the service count.
+    """
+
+    def __init__(self, metrics_sampler=None):
+        self._services: Dict[str, Dict[str, Any]] = {}
+        self._processes: Dict[str, psutil.Process] = {}
+        # Insertion-ordered dicts used as ordered sets so pagination is stable
+        self._by_category: Dict[str, Dict[str, None]] = {}
+        self._by_state: Dict[str, Dict[str, None]] = {}
+        self._shared_cpu_percent = 0.0
+        self._lock = threading.Lock()
+
+        if metrics_sampler is not None:
+            metrics_sampler.add_listener(self.refresh_resources)
+
+    def register(
+        self,
+        service_id: str,
+        name: str,
+        category: str,
+        pid: Optional[int] = None,
+        state: str = "running",
+        memory_mb: float = 0.0,
+        started_at: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Add or replace a service record"""
+        with self._lock:
+            if service_id in self._services:
+                self._unindex(service_id)
+
+            self._services[service_id] = {
+                "id": service_id,
+                "name": name,
+                "category": category,
+                "state": state,
+                "health": "healthy" if state == "running" else "stopped",
+                "pid": pid,
+                "started_at": started_at or time.time(),
+                "cpu_percent": None,
+                "memory_mb": memory_mb,
+                "threads": None,
+            }
+            self._index(service_id)
+
+            if pid is not None:
+                try:
+                    process = psutil.Process(pid)
+                    process.cpu_percent(interval=None)  # prime the counter
+                    self._processes[service_id] = process
+                except psutil.Error:
+                    self._services[service_id]["health"] = "unknown"
+
+            return self._services[service_id]
+
+    def unregister(self, service_id: str) -> bool:
+        """Remove a service record"""
+        with self._lock:
+            if service_id not in self._services:
+                return False
+            self._unindex(service_id)
+            del self._services[service_id]
+            self._processes.pop(service_id, None)
+            return True
+
+    def set_state(self, service_id: str, state: str) -> Optional[Dict[str, Any]]:
+        """Update a service's state and move it between state indexes"""
+        with self._lock:
+            record = self._services.get(service_id)
+            if record is None:
+                return None
+            self._by_state.get(record["state"], {}).pop(service_id, None)
+            record["state"] = state
+            record["health"] = "healthy" if state == "running" else "stopped"
+            if state == "running":
+                record["started_at"] = time.time()
+            self._by_state.setdefault(state, {})[service_id] = None
+            return self._view(record, time.time())
+
+    def get(self, service_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single service with its latest readings"""
+        with self._lock:
+            record = self._services.get(service_id)
+            return self._view(record, time.time()) if record else None
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        state: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Filter by category and/or state and return one page"""
+        with self._lock:
+            ids = self._matching_ids(category, state)
+            total = len(ids)
+            stop = None if limit is None else offset + limit
+            now = time.time()
+            page = [self._view(self._services[sid], now) for sid in islice(ids, offset, stop)]
+
+            return {
+                "services": page,
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts by category and state, computed from index sizes"""
+        with self._lock:
+            return {
+                "total": len(self._services),
+                "by_category": {c: len(ids) for c, ids in self._by_category.items() if ids},
+                "by_state": {s: len(ids) for s, ids in self._by_state.items() if ids},
+            }
+
+    def refresh_resources(self, sample: Dict[str, Any]):
+        """Update readings from a metrics sample (runs on the sampler thread)"""
+        cpu = sample.get("cpu", {})
+        shared = cpu.get("percent", 0.0) / max(1, cpu.get("count") or 1)
+
+        with self._lock:
+            self._shared_cpu_percent = shared
+            processes = list(self._processes.items())
+
+        readings = {}
+        for service_id, process in processes:
+            try:
+                with process.oneshot():
+                    readings[service_id] = {
+                        "cpu_percent": process.cpu_percent(interval=None),
+                        "memory_mb": process.memory_info().rss / (1024**2),
+                        "threads": process.num_threads(),
+                        "health": "healthy",
+                    }
+            except psutil.Error:
+                readings[service_id] = {"health": "unhealthy", "state": "stopped"}
+
+        with self._lock:
+            for service_id, reading in readings.items():
+                record = self._services.get(service_id)
+                if record is None:
+                    continue
+                if reading.get("state") and reading["state"] != record["state"]:
+                    self._by_state.get(record["state"], {}).pop(service_id, None)
+                    self._by_state.setdefault(reading["state"], {})[service_id] = None
+                record.update(reading)
+                if reading.get("state") == "stopped":
+                    self._processes.pop(service_id, None)
+
+    def _matching_ids(self, category: Optional[str], state: Optional[str]) -> Collection[str]:
+        if category is None and state is None:
+            return self._services
+        if state is None:
+            return self._by_category.get(category, {})
+        if category is None:
+            return self._by_state.get(state, {})
+
+        by_category = self._by_category.get(category, {})
+        by_state = self._by_state.get(state, {})
+        # Walk the smaller index and probe the larger one
+        if len(by_state) < len(by_category):
+            return [sid for sid in by_state if sid in by_category]
+        return [sid for sid in by_category if sid in by_state]
+
+    def _view(self, record: Dict[str, Any], now: float) -> Dict[str, Any]:
+        view = dict(record)
+        view["uptime"] = now - record["started_at"] if record["state"] == "running" else 0
+        if record["pid"] is None:
+            view["cpu_percent"] = self._shared_cpu_percent
+        return view
+
+    def _index(self, service_id: str):
+        record = self._services[service_id]
+        self._by_category.setdefault(record["category"], {})[service_id] = None
+        self._by_state.setdefault(record["state"], {})[service_id] = None
+
+    def _unindex(self, service_id: str):
+        record = self._services[service_id]
+        self._by_category.get(record["category"], {}).pop(service_id, None)
+        self._by_state.get(record["state"], {}).pop(service_id, None)
+
@@ -0,0 +1,659 @@
+"""
+Synthetic Market Data
+Seeded, vectorized generator for orders, trades, positions, bars, quote ticks and trade ticks
+
+Every table is built with whole-array NumPy operations and returned as Arrow tables,
+ready for Postgres COPY (populate_database), Parquet files (the ParquetManager
+directories) or a pandas frame for QuoteTickDataWrangler.
+
+Prices follow one reference path per instrument on a one-minute grid (geometric
+Brownian motion or an additive random walk). Quote ticks and bars fill in each
+minute with a Brownian bridge pinned to that grid, and orders fill at the reference
+price of their timestamp, so quotes, bars, orders and fills describe the same market.
+
+Random streams are keyed by (seed, table, instrument, chunk). A chunk comes out the
+same whichever process generates it and in whatever order, so a load can be split
+across workers without changing the data.
+"""
+
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# (code, instrument_id, min_price, max_price); starting prices are drawn from the range
+INSTRUMENTS = [
+    ('BTCUSD', 'BTC/USD.SIM', 40000, 50000),
+    ('ETHUSD', 'ETH/USD.SIM', 2000, 3000),
+    ('EURUSD', 'EUR/USD.SIM', 1.05, 1.15),
+    ('GBPUSD', 'GBP/USD.SIM', 1.20, 1.30),
+    ('USDJPY', 'USD/JPY.SIM', 140, 150),
+    ('AUDUSD', 'AUD/USD.SIM', 0.65, 0.75),
+]
+
+ORDER_TYPES = ['MARKET', 'LIMIT', 'STOP', 'STOP_LIMIT']
+ORDER_SIDES = ['BUY', 'SELL']
+ORDER_STATUSES = ['PENDING', 'FILLED', 'CANCELLED', 'REJECTED', 'EXPIRED']
+POSITION_SIDES = ['LONG', 'SHORT', 'FLAT']
+POSITION_STATUSES = ['OPEN', 'CLOSED']
+AGGRESSOR_SIDES = ['BUYER', 'SELLER']
+
+# Annualised volatility by asset class
+DEFAULT_VOLATILITY = {"CRYPTO": 0.6, "FX": 0.08}
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+US_PER_SECOND = 1_000_000
+
+# Spacing of the reference price grid; tick intervals must divide it, bar intervals be multiples of it
+REFERENCE_STEP = 60
+
+# Independent random streams, one per generated table
+STREAMS = ("reference", "quotes", "bars", "trade_ticks", "activity")
+
+# Fraction of orders with at least one fill that are completely filled (the rest are partial)
+FULL_FILL_RATE = 0.85
+# Status mix of orders without fills: PENDING, CANCELLED, REJECTED, EXPIRED
+UNFILLED_STATUS_WEIGHTS = [0.3, 0.45, 0.15, 0.1]
+CLOSED_POSITION_RATE = 0.4
+COMMISSION_RATE = 0.001
+
+ChunkSpec = Tuple[int, int, int]
+
+
+def is_crypto(instrument_code: str) -> bool:
+    return 'BTC' in instrument_code or 'ETH' in instrument_code
+
+
+def price_precision(instrument_code: str) -> int:
+    """Decimal places quoted for an instrument"""
+    if 'JPY' in instrument_code:
+        return 3
+    if is_crypto(instrument_code):
+        return 2
+    return 5
+
+
+def quantity_range(instrument_code: str) -> Tuple[float, float]:
+    """Realistic order / quote size range for an instrument"""
+    if 'BTC' in instrument_code:
+        return 0.01, 2.0
+    if 'ETH' in instrument_code:
+        return 0.1, 10.0
+    return 1000.0, 100000.0
+
+
+def _seconds(value: Union[int, float, timedelta]) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+def _bar_type(interval: int) -> str:
+    if interval % 86400 == 0:
+        return f"{interval // 86400}-DAY-MID"
+    if interval % 3600 == 0:
+        return f"{interval // 3600}-HOUR-MID"
+    return f"{interval // 60}-MINUTE-MID"
+
+
+# Arrow column builders
+def _strings(values: Sequence[str], indices: np.ndarray) -> pa.Array:
+    return pa.array(values, pa.string()).take(pa.array(indices))
+
+
+def _ids(prefix: str, first: int, count: int) -> pa.Array:
+    """prefix + 1-based sequence number, zero padded to at least 4 digits (TEST-O-0001)"""
+    numbers = pa.array(np.arange(first + 1, first + count + 1, dtype=np.int64))
+    return pc.binary_join_element_wise(prefix, pc.utf8_lpad(pc.cast(numbers, pa.string()), 4, "0"), "")
+
+
+def _timestamps(micros: np.ndarray) -> pa.Array:
+    return pa.array(micros.astype("datetime64[us]"))
+
+
+def _round(values: np.ndarray, digits: Union[int, np.ndarray]) -> np.ndarray:
+    """np.round with a scalar or per-row number of decimals"""
+    if not np.ndim(digits):
+        return np.round(values, int(digits))
+    rounded = np.empty_like(values)
+    for d in np.unique(digits):
+        mask = digits == d
+        rounded[mask] = np.round(values[mask], int(d))
+    return rounded
+
+
+def _decimals(values: np.ndarray, digits: Union[int, np.ndarray]) -> pa.Array:
+    """Rounded float column; NaN becomes null"""
+    return pa.array(_round(values, digits), from_pandas=True)
+
+
+class SyntheticMarketData:
+    """
+    Vectorized synthetic data over a fixed time window.
+
+    instruments are (code, instrument_id, min_price, max_price) tuples. The window
+    runs from start to end (default: the `days` before now). model is "gbm" or
+    "random_walk"; volatility overrides the annualised volatility per instrument_id
+    (or for all instruments when a float); spread_bps is the mean quoted spread and
+    spread_jitter its relative variation.
+    """
+
+    def __init__(self, instruments: Sequence[Tuple[str, str, float, float]] = INSTRUMENTS,
+                 seed: Optional[int] = None, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None, days: float = 30, model: str = "gbm",
+                 volatility: Union[None, float, Dict[str, float]] = None,
+                 spread_bps: Union[float, Dict[str, float]] = 1.0, spread_jitter: float = 0.2):
+        if model not in ("gbm", "random_walk"):
+            raise ValueError(f"Unknown price model: {model}")
+        self.instruments = list(instruments)
+        self.seed = int(np.random.SeedSequence(seed).entropy)
+        self.model = model
+        self.spread_jitter = spread_jitter
+
+        end = end or datetime.now().replace(microsecond=0)
+        start = start or end - timedelta(days=days)
+        step_us = REFERENCE_STEP * US_PER_SECOND
+        self.end_us = int(np.datetime64(end, "us").astype(np.int64))
+        # Whole reference steps, so every tick interval tiles the window exactly
+        self.segments = max(int((self.end_us - int(np.datetime64(start, "us").astype(np.int64))) // step_us), 1)
+        self.start_us = self.end_us - self.segments * step_us
+
+        codes = [code for code, _, _, _ in self.instruments]
+        self.codes = codes
+        self.instrument_ids = [instrument_id for _, instrument_id, _, _ in self.instruments]
+        self.precision = np.array([price_precision(code) for code in codes])
+        ranges = np.array([quantity_range(code) for code in codes])
+        self.qty_low, self.qty_high = ranges[:, 0], ranges[:, 1]
+        self.size_precision = np.where([is_crypto(code) for code in codes], 4, 0)
+
+        def per_instrument(value, default):
+            if value is None:
+                return np.array([default(code, iid) for code, iid in zip(codes, self.instrument_ids)], dtype=float)
+            if isinstance(value, dict):
+                return np.array([value.get(iid, default(code, iid)) for code, iid in zip(codes, self.instrument_ids)],
+                                dtype=float)
+            return np.full(len(codes), float(value))
+
+        self.volatility = per_instrument(
+            volatility, lambda code, _: DEFAULT_VOLATILITY["CRYPTO" if is_crypto(code) else "FX"])
+        self.spread_bps = per_instrument(spread_bps, lambda code, _: 1.0)
+        self.start_prices = np.array([
+            self._rng("reference", k, 1).uniform(low, high) for k, (_, _, low, high, *_) in enumerate(self.instruments)
+        ])
+        self._reference: Optional[np.ndarray] = None
+
+    # Window and reference path
+    @property
+    def start(self) -> datetime:
+        return datetime(1970, 1, 1) + timedelta(microseconds=self.start_us)
+
+    @property
+    def end(self) -> datetime:
+        return datetime(1970, 1, 1) + timedelta(microseconds=self.end_us)
+
+    def reference(self) -> np.ndarray:
+        """Reference path in model space (log price for gbm), shape (instruments, segments + 1)"""
+        if self._reference is None:
+            path = np.empty((len(self.instruments), self.segments + 1))
+            for k in range(len(self.instruments)):
+                sigma = self._step_sigma(k, REFERENCE_STEP)
+                shocks = self._rng("reference", k).standard_normal(self.segments)
+                path[k, 0] = self._to_model(k, self.start_prices[k])
+                if self.model == "gbm":
+                    shocks = shocks * sigma - 0.5 * sigma * sigma
+                else:
+                    shocks *= sigma
+                np.cumsum(shocks, out=path[k, 1:])
+                path[k, 1:] += path[k, 0]
+            self._reference = path
+        return self._reference
+
+    def mid_at(self, instrument_index: np.ndarray, micros: np.ndarray) -> np.ndarray:
+        """Reference mid price, linearly interpolated between grid points"""
+        ref = self.reference()
+        position = (micros - self.start_us) / (REFERENCE_STEP * US_PER_SECOND)
+        i = np.clip(position.astype(np.int64), 0, self.segments - 1)
+        frac = np.clip(position - i, 0.0, 1.0)
+        return self._to_price(ref[instrument_index, i] * (1 - frac) + ref[instrument_index, i + 1] * frac,
+                              instrument_index)
+
+    # Market data
+    def quote_ticks(self, count: Optional[int] = None, interval: Union[float, timedelta] = 1.0,
+                    instruments: Optional[Sequence[str]] = None,
+                    chunk_rows: int = 1_000_000) -> Iterator[pa.Table]:
+        """
+        Quote ticks every `interval` seconds, one table per instrument chunk
+
+        With count, the most recent count ticks in total are produced (split evenly
+        across instruments); otherwise the whole window.
+        """
+        for k, first, ticks in self.tick_plan("quotes", count, interval, instruments):
+            for spec in self.chunks(first, ticks, interval, chunk_rows):
+                yield self.quote_chunk(k, spec, interval)
+
+    def quote_chunk(self, k: int, spec: ChunkSpec, interval: Union[float, timedelta] = 1.0) -> pa.Table:
+        """Quotes of instrument k for one chunk from chunks(); deterministic per (k, chunk)"""
+        chunk_id, first, last = spec
+        interval_us = self._interval_us(interval)
+        rng = self._rng("quotes", k, chunk_id)
+        mid, micros = self._bridge(k, first, last, interval_us, rng)
+        n = len(mid)
+
+        half_spread = mid * (self.spread_bps[k] / 2e4)
+        if self.spread_jitter:
+            half_spread *= 1 + self.spread_jitter * rng.standard_normal(n, dtype=np.float32)
+        digits = int(self.precision[k])
+        increment = 10.0 ** -digits
+        bid = np.round(mid - np.abs(half_spread), digits)
+        ask = np.maximum(np.round(mid + np.abs(half_spread), digits), bid + increment)
+        return pa.table({
+            "instrument_id": _strings(self.instrument_ids, np.full(n, k, dtype=np.int32)),
+            "bid_price": pa.array(bid),
+            "ask_price": pa.array(ask),
+            "bid_size": _decimals(self._sizes(k, n, rng), int(self.size_precision[k])),
+            "ask_size": _decimals(self._sizes(k, n, rng), int(self.size_precision[k])),
+            "timestamp": _timestamps(micros),
+        })
+
+    def bars(self, count: Optional[int] = None, interval: Union[int, timedelta] = 60,
+             tick_interval: Union[float, timedelta] = 1.0, instruments: Optional[Sequence[str]] = None,
+             chunk_rows: int = 100_000) -> Iterator[pa.Table]:
+        """OHLCV bars aggregated from a tick-level bridge path; timestamp is the bar close"""
+        bar_seconds = int(_seconds(interval))
+        if bar_seconds % REFERENCE_STEP:
+            raise ValueError(f"Bar interval must be a multiple of {REFERENCE_STEP}s")
+        for k, first, bars in self.tick_plan("bars", count, bar_seconds, instruments):
+            for spec in self.chunks(first, bars, bar_seconds, chunk_rows):
+                yield self.bar_chunk(k, spec, bar_seconds, tick_interval)
+
+    def bar_chunk(self, k: int, spec: ChunkSpec, interval: Union[int, timedelta] = 60,
+                  tick_interval: Union[float, timedelta] = 1.0) -> pa.Table:
+        chunk_id, first, last = spec
+        bar_us = self._interval_us(interval)
+        tick_us = self._interval_us(tick_interval)
+        per_bar = bar_us // tick_us
+        rng = self._rng("bars", k, chunk_id)
+        n = last - first
+        mid, _ = self._bridge(k, first * per_bar, last * per_bar, tick_us, rng)
+        ticks = mid.reshape(n, per_bar)
+
+        # Bars open and close on reference grid points, so consecutive bars join up
+        steps_per_bar = bar_us // (REFERENCE_STEP * US_PER_SECOND)
+        grid = np.arange(first, last + 1) * steps_per_bar
+        edges = self._to_price(self.reference()[k, grid], k)
+        open_, close = edges[:-1], edges[1:]
+        high = np.maximum(np.maximum(ticks.max(axis=1), open_), close)
+        low = np.minimum(np.minimum(ticks.min(axis=1), open_), close)
+        mean_size = (self.qty_low[k] + self.qty_high[k]) / 2
+        volume = rng.gamma(4.0, mean_size * per_bar / 4.0, n)
+        digits = int(self.precision[k])
+        return pa.table({
+            "instrument_id": _strings(self.instrument_ids, np.full(n, k, dtype=np.int32)),
+            "bar_type": _strings([_bar_type(bar_us // US_PER_SECOND)], np.zeros(n, dtype=np.int32)),
+            "open": _decimals(open_, digits),
+            "high": _decimals(high, digits),
+            "low": _decimals(low, digits),
+            "close": _decimals(close, digits),
+            "volume": _decimals(volume, int(self.size_precision[k])),
+            "timestamp": _timestamps(self.start_us + (np.arange(first, last, dtype=np.int64) + 1) * bar_us),
+        })
+
+    def trade_ticks(self, count: int, instruments: Optional[Sequence[str]] = None,
+                    chunk_rows: int = 1_000_000) -> Iterator[pa.Table]:
+        """count market trades at random times, priced at the quoted side the aggressor lifts"""
+        for k, spec, chunks in self.trade_tick_plan(count, instruments, chunk_rows):
+            yield self.trade_tick_chunk(k, spec, chunks)
+
+    def trade_tick_plan(self, count: int, instruments: Optional[Sequence[str]] = None,
+                        chunk_rows: int = 1_000_000) -> List[Tuple[int, ChunkSpec, int]]:
+        """(instrument index, chunk spec, chunks of that instrument) for trade_tick_chunk()"""
+        selected = self._selected(instruments)
+        plan = []
+        for i, k in enumerate(selected):
+            n = count // len(selected) + (1 if i < count % len(selected) else 0)
+            chunks = max(math.ceil(n / chunk_rows), 1)
+            plan.extend((k, (c, n * c // chunks, n * (c + 1) // chunks), chunks) for c in range(chunks))
+        return plan
+
+    def trade_tick_chunk(self, k: int, spec: ChunkSpec, chunks: int) -> pa.Table:
+        """Chunk c of `chunks` covers the matching slice of the window, so chunks concatenate in time order"""
+        chunk_id, first, last = spec
+        n = last - first
+        rng = self._rng("trade_ticks", k, chunk_id)
+        window = self.end_us - self.start_us
+        lo = self.start_us + window * chunk_id // chunks
+        hi = self.start_us + window * (chunk_id + 1) // chunks
+        micros = np.sort(rng.integers(lo, max(hi, lo + 1), n))
+        mid = self.mid_at(np.full(n, k), micros)
+        aggressor = rng.integers(0, 2, n)
+        half_spread = mid * (self.spread_bps[k] / 2e4)
+        price = np.where(aggressor == 0, mid + half_spread, mid - half_spread)
+        return pa.table({
+            "instrument_id": _strings(self.instrument_ids, np.full(n, k, dtype=np.int32)),
+            "price": _decimals(price, int(self.precision[k])),
+            "size": _decimals(self._sizes(k, n, rng), int(self.size_precision[k])),
+            "aggressor_side": _strings(AGGRESSOR_SIDES, aggressor),
+            "timestamp": _timestamps(micros),
+        })
+
+    # Trading activity
+    def trading_activity(self, orders: int, trades: Optional[int] = None, positions: Optional[int] = None,
+                         chunk_rows: int = 1_000_000) -> Iterator[Dict[str, pa.Table]]:
+        """
+        Orders with the fills (trades) and positions they produce, chunk by chunk
+
+        Trades reference orders of the same chunk and positions aggregate the trades
+        of their instrument, so each chunk can be loaded on its own (orders first).
+        """
+        trades = int(orders * 0.7) if trades is None else trades
+        positions = max(orders // 10, 1) if positions is None else positions
+        chunks = max(math.ceil(max(orders, trades, positions) / chunk_rows), 1)
+        for c in range(chunks):
+            yield self.activity_chunk(c, chunks, orders, trades, positions)
+
+    def activity_chunk(self, index: int, chunks: int, orders: int, trades: int,
+                       positions: int) -> Dict[str, pa.Table]:
+        """Chunk `index` of `chunks` of trading_activity(); deterministic per index"""
+        def part(total):
+            lo, hi = total * index // chunks, total * (index + 1) // chunks
+            return lo, hi - lo
+
+        order_lo, n_o = part(orders)
+        trade_lo, n_t = part(trades)
+        position_lo, n_p = part(positions)
+        rng = self._rng("activity", index)
+        n_instruments = len(self.instruments)
+        window = self.end_us - self.start_us
+
+        # Orders
+        inst = rng.integers(0, n_instruments, n_o)
+        created = self.start_us + rng.integers(0, window, n_o)
+        mid = self.mid_at(inst, created)
+        order_type = rng.integers(0, len(ORDER_TYPES), n_o)
+        side = rng.integers(0, 2, n_o)
+        buy = side == 0
+        quantity = np.round(rng.uniform(self.qty_low[inst], self.qty_high[inst]), 8)
+        is_market = order_type == 0
+        # Limits rest on the passive side of the mid, stops beyond it
+        offset = np.abs(rng.normal(0, 0.001, n_o)) * np.where(buy == (order_type == 1), -1, 1)
+        price = np.where(is_market, np.nan, mid * (1 + offset))
+
+        fill_order = rng.integers(0, n_o, n_t) if n_o else np.zeros(0, dtype=np.int64)
+        fills = np.bincount(fill_order, minlength=n_o)
+        has_fill = fills > 0
+        full = has_fill & (rng.random(n_o) < FULL_FILL_RATE)
+        unfilled_status = rng.choice([0, 2, 3, 4], n_o, p=UNFILLED_STATUS_WEIGHTS)
+        status = np.where(full, 1, np.where(has_fill, 0, unfilled_status))
+        filled_qty = np.where(full, quantity, np.where(has_fill, np.round(quantity * rng.uniform(0.05, 0.95, n_o), 8), 0.0))
+        slippage = np.abs(rng.normal(0, 0.0002, n_o)) * np.where(buy, 1, -1)
+        avg_px = np.where(has_fill, np.where(is_market, mid * (1 + slippage), price), np.nan)
+
+        orders_table = pa.table({
+            "order_id": _ids("TEST-O-", order_lo, n_o),
+            "instrument_id": _strings(self.instrument_ids, inst),
+            "side": _strings(ORDER_SIDES, side),
+            "order_type": _strings(ORDER_TYPES, order_type),
+            "quantity": pa.array(quantity),
+            "price": _decimals(price, self.precision[inst]),
+            "filled_qty": pa.array(filled_qty),
+            "avg_px": _decimals(avg_px, self.precision[inst]),
+            "status": _strings(ORDER_STATUSES, status),
+            "created_at": _timestamps(created),
+        })
+
+        # Trades: every fill of an order at its average price, splitting the filled quantity
+        t_inst = inst[fill_order]
+        t_side = side[fill_order]
+        t_qty = np.round(filled_qty[fill_order] / np.maximum(fills[fill_order], 1), 8)
+        t_price = _round(avg_px[fill_order], self.precision[t_inst])
+        executed = np.minimum(created[fill_order] + (rng.exponential(2.0, n_t) * US_PER_SECOND).astype(np.int64),
+                              self.end_us)
+
+        # Positions: each trade joins a random position of its instrument (-1 if it has none)
+        p_inst = rng.integers(0, n_instruments, n_p)
+        by_instrument = np.argsort(p_inst, kind="stable")
+        per_instrument = np.bincount(p_inst, minlength=n_instruments)
+        offsets = np.cumsum(per_instrument) - per_instrument
+        pick = (rng.random(n_t) * per_instrument[t_inst]).astype(np.int64)
+        t_pos = np.full(n_t, -1)
+        has_position = per_instrument[t_inst] > 0
+        t_pos[has_position] = by_instrument[offsets[t_inst[has_position]] + pick[has_position]]
+
+        held = t_pos >= 0
+        pos_of, signed = t_pos[held], np.where(t_side[held] == 0, 1.0, -1.0)
+        notional = t_qty[held] * t_price[held]
+        buy_qty = np.bincount(pos_of, weights=t_qty[held] * (signed > 0), minlength=n_p)
+        sell_qty = np.bincount(pos_of, weights=t_qty[held] * (signed < 0), minlength=n_p)
+        buy_value = np.bincount(pos_of, weights=notional * (signed > 0), minlength=n_p)
+        sell_value = np.bincount(pos_of, weights=notional * (signed < 0), minlength=n_p)
+        opened = np.full(n_p, np.iinfo(np.int64).max)
+        np.minimum.at(opened, pos_of, executed[held])
+        last = np.full(n_p, self.start_us)
+        np.maximum.at(last, pos_of, executed[held])
+
+        traded = (buy_qty + sell_qty) > 0
+        # Positions no trade landed in still get a plausible opening fill
+        synthetic_qty = np.round(rng.uniform(self.qty_low[p_inst], self.qty_high[p_inst]), 8)
+        synthetic_open = self.start_us + rng.integers(0, window, n_p)
+        synthetic_side = rng.integers(0, 2, n_p)
+        opened = np.where(traded, opened, synthetic_open)
+        last = np.where(traded, last, synthetic_open)
+        synthetic_px = self.mid_at(p_inst, synthetic_open)
+        buy_qty = np.where(traded, buy_qty, np.where(synthetic_side == 0, synthetic_qty, 0.0))
+        sell_qty = np.where(traded, sell_qty, np.where(synthetic_side == 1, synthetic_qty, 0.0))
+        buy_value = np.where(traded, buy_value, buy_qty * synthetic_px)
+        sell_value = np.where(traded, sell_value, sell_qty * synthetic_px)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            buy_vwap = buy_value / buy_qty
+            sell_vwap = sell_value / sell_qty
+        net = buy_qty - sell_qty
+        matched = np.minimum(buy_qty, sell_qty)
+        matched_pnl = np.where(matched > 0, (sell_vwap - buy_vwap) * matched, 0.0)
+        entry = np.where(net >= 0, buy_vwap, sell_vwap)
+        entry = np.where(np.isnan(entry), np.where(np.isnan(buy_vwap), sell_vwap, buy_vwap), entry)
+
+        closed = rng.random(n_p) < CLOSED_POSITION_RATE
+        closed_at = np.minimum(last + rng.integers(1, 721, n_p) * 3600 * US_PER_SECOND, self.end_us)
+        exit_px = self.mid_at(p_inst, np.where(closed, closed_at, self.end_us))
+        mark_pnl = (exit_px - entry) * net
+        realized = matched_pnl + np.where(closed, mark_pnl, 0.0)
+        unrealized = np.where(closed, 0.0, mark_pnl)
+        position_side = np.where(closed | (net == 0), 2, np.where(net > 0, 0, 1))
+
+        positions_table = pa.table({
+            "position_id": _ids("TEST-P-", position_lo, n_p),
+            "instrument_id": _strings(self.instrument_ids, p_inst),
+            "side": _strings(POSITION_SIDES, position_side),
+            "quantity": pa.array(np.where(closed, 0.0, np.round(np.abs(net), 8))),
+            "entry_price": _decimals(entry, self.precision[p_inst]),
+            "current_price": _decimals(exit_px, self.precision[p_inst]),
+            "unrealized_pnl": _decimals(unrealized, 2),
+            "realized_pnl": _decimals(realized, 2),
+            "status": _strings(POSITION_STATUSES, closed.astype(np.int64)),
+            "opened_at": _timestamps(opened),
+            "closed_at": pa.array(np.where(closed, closed_at, 0).astype("datetime64[us]"),
+                                  mask=~closed),
+        })
+
+        # A position's realized P&L is booked on its last trade
+        t_realized = np.zeros(n_t)
+        if held.any():
+            held_index = np.flatnonzero(held)
+            order = np.lexsort((executed[held_index], t_pos[held_index]))
+            ordered_pos = t_pos[held_index][order]
+            is_last = np.append(ordered_pos[1:] != ordered_pos[:-1], True)
+            last_trades = held_index[order][is_last]
+            t_realized[last_trades] = realized[t_pos[last_trades]]
+
+        trades_table = pa.table({
+            "trade_id": _ids("TEST-T-", trade_lo, n_t),
+            "order_id": pc.binary_join_element_wise(
+                "TEST-O-", pc.utf8_lpad(pc.cast(pa.array(order_lo + fill_order + 1), pa.string()), 4, "0"), ""),
+            "instrument_id": _strings(self.instrument_ids, t_inst),
+            "side": _strings(ORDER_SIDES, t_side),
+            "quantity": pa.array(t_qty),
+            "price": pa.array(t_price),
+            "commission": _decimals(t_qty * t_price * COMMISSION_RATE, 2),
+            "realized_pnl": _decimals(t_realized, 2),
+            "executed_at": _timestamps(executed),
+        })
+        return {"orders": orders_table, "trades": trades_table, "positions": positions_table}
+
+    # Partitioning
+    def tick_plan(self, stream: str, count: Optional[int], interval: Union[float, timedelta],
+                  instruments: Optional[Sequence[str]] = None) -> List[Tuple[int, int, int]]:
+        """(instrument index, first tick, tick count) per instrument; ticks end at the window end"""
+        interval_us = self._interval_us(interval)
+        available = (self.end_us - self.start_us) // interval_us
+        selected = self._selected(instruments)
+        plan = []
+        for i, k in enumerate(selected):
+            if count is None:
+                n = available
+            else:
+                n = count // len(selected) + (1 if i < count % len(selected) else 0)
+            if n > available:
+                raise ValueError(
+                    f"{stream}: {n} ticks at {interval_us / US_PER_SECOND}s need a window of "
+                    f"{n * interval_us / US_PER_SECOND / 86400:.1f} days; increase days"
+                )
+            plan.append((k, available - n, n))
+        return plan
+
+    def chunks(self, first: int, count: int, interval: Union[float, timedelta],
+               chunk_rows: int) -> List[ChunkSpec]:
+        """
+        (chunk id, first, last) tick ranges of about chunk_rows covering [first, first + count)
+
+        Boundaries sit on fixed multiples of chunk_rows counted from the window start,
+        so a chunk id always denotes the same ticks.
+        """
+        per_step = max(REFERENCE_STEP * US_PER_SECOND // self._interval_us(interval), 1)
+        size = max(chunk_rows // per_step, 1) * per_step
+        specs = []
+        position, end = first, first + count
+        while position < end:
+            chunk_id = position // size
+            stop = min((chunk_id + 1) * size, end)
+            specs.append((chunk_id, position, stop))
+            position = stop
+        return specs
+
+    # Internals
+    def _rng(self, stream: str, *keys: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, STREAMS.index(stream), *keys])
+
+    def _selected(self, instruments: Optional[Sequence[str]]) -> List[int]:
+        if instruments is None:
+            return list(range(len(self.instruments)))
+        unknown = set(instruments) - set(self.instrument_ids)
+        if unknown:
+            raise ValueError(f"Unknown instruments: {', '.join(sorted(unknown))}")
+        return [self.instrument_ids.index(instrument_id) for instrument_id in instruments]
+
+    def _interval_us(self, interval: Union[float, timedelta]) -> int:
+        interval_us = int(round(_seconds(interval) * US_PER_SECOND))
+        step_us = REFERENCE_STEP * US_PER_SECOND
+        if interval_us <= 0 or (step_us % interval_us and interval_us % step_us):
+            raise ValueError(f"Interval must divide {REFERENCE_STEP}s or be a multiple of it")
+        return interval_us
+
+    def _step_sigma(self, k: int, seconds: float) -> float:
+        sigma = self.volatility[k] * math.sqrt(seconds / SECONDS_PER_YEAR)
+        # The random walk moves in price units scaled to the starting price
+        return sigma if self.model == "gbm" else sigma * self.start_prices[k]
+
+    def _to_model(self, k: int, price: float) -> float:
+        return math.log(price) if self.model == "gbm" else price
+
+    def _to_price(self, values: np.ndarray, k: Union[int, np.ndarray]) -> np.ndarray:
+        if self.model == "gbm":
+            return np.exp(values)
+        return np.maximum(values, self.start_prices[k] * 0.01)
+
+    def _bridge(self, k: int, first: int, last: int, interval_us: int,
+                rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mid prices of ticks [first, last) and their timestamps
+
+        Within each reference step the path is a Brownian bridge between the two grid
+        points, so ticks generated in separate chunks still line up with each other.
+        """
+        step_us = REFERENCE_STEP * US_PER_SECOND
+        micros = self.start_us + np.arange(first, last, dtype=np.int64) * interval_us
+        ref = self.reference()[k]
+        if interval_us >= step_us:
+            return self._to_price(ref[(micros - self.start_us) // step_us], k), micros
+
+        m = step_us // interval_us
+        seg_lo, seg_hi = first // m, math.ceil(last / m)
+        shocks = rng.standard_normal((seg_hi - seg_lo, m), dtype=np.float32)
+        shocks *= np.float32(self._step_sigma(k, interval_us / US_PER_SECOND))
+        walk = np.cumsum(shocks, axis=1)
+        r = np.arange(m, dtype=np.float32) / m
+        bridge = np.empty_like(walk)
+        bridge[:, 0] = 0
+        bridge[:, 1:] = walk[:, :-1]
+        bridge -= r * walk[:, -1:]
+        path = ref[seg_lo:seg_hi, None] * (1 - r) + ref[seg_lo + 1:seg_hi + 1, None] * r + bridge
+        path = path.ravel()[first - seg_lo * m:last - seg_lo * m]
+        return self._to_price(path, k), micros
+
+    def _sizes(self, k: int, n: int, rng: np.random.Generator) -> np.ndarray:
+        return rng.uniform(self.qty_low[k], self.qty_high[k], n)
+
+
+def write_parquet(tables: Iterable[pa.Table], directory: str, prefix: str = "",
+                  row_group_size: int = 1_000_000) -> List[str]:
+    """
+    Write generated chunks into one Parquet file per instrument under directory
+
+    Chunks of an instrument must arrive together (as every generator here yields
+    them). Returns the written paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths: List[str] = []
+    writer = None
+    current = None
+    try:
+        for table in tables:
+            if table.num_rows == 0:
+                continue
+            instrument_id = table.column("instrument_id")[0].as_py()
+            if instrument_id != current:
+                if writer is not None:
+                    writer.close()
+                name = instrument_id.replace("/", "").replace(".", "_")
+                paths.append(os.path.join(directory, f"{prefix}{name}.parquet"))
+                writer = pq.ParquetWriter(paths[-1], table.schema, compression="zstd")
+                current = instrument_id
+            writer.write_table(table, row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+    return paths
+
+
+def wrangler_frame(tables: Iterable[pa.Table]) -> "pd.DataFrame":
+    """
+    pandas frame for QuoteTickDataWrangler.process(): bid/ask price and size columns
+    indexed by a UTC timestamp
+    """
+    if not PANDAS_AVAILABLE:
+        raise RuntimeError("pandas is not installed")
+    table = pa.concat_tables(list(tables))
+    columns = ["bid_price", "ask_price", "bid_size", "ask_size"]
+    # Floats rather than Decimal objects: the wrangler converts columns with numpy
+    frame = pd.DataFrame({name: table.column(name).cast(pa.float64()).to_numpy() for name in columns})
+    frame.index = pd.DatetimeIndex(table.column("timestamp").to_numpy(), name="timestamp").tz_localize("UTC")
+    return frame
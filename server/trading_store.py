@@ -0,0 +1,377 @@
+"""
+Trading Store
+Indexed in-memory orders, positions and trades for filtered, cursor-paginated queries
+"""
+
+import base64
+import bisect
+import heapq
+import json
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Sort keys in every index are (time_ns, id), so ties on time still have a total order
+IndexKey = Tuple[int, str]
+
+
+def to_ns(value: Any) -> int:
+    """Nanoseconds since the epoch from an ISO string, datetime, epoch seconds (float) or ns (int)"""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value * 1_000_000_000)
+    if isinstance(value, str):
+        text = value.strip()
+        if text.lstrip("-").isdigit():
+            return int(text)
+        try:
+            value = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {value!r}")
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        # Integer arithmetic so microseconds survive without float rounding
+        delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+    raise ValueError(f"Invalid timestamp: {value!r}")
+
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    raw = json.dumps({"s": sort, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key = tuple(payload["k"])
+        cursor_sort = payload["s"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+    return key
+
+
+def _bounds(keys: List[IndexKey], start_ns: Optional[int], end_ns: Optional[int]) -> Tuple[int, int]:
+    """Index range of keys with start_ns <= time < end_ns"""
+    lo = bisect.bisect_left(keys, (start_ns, "")) if start_ns is not None else 0
+    hi = bisect.bisect_left(keys, (end_ns, "")) if end_ns is not None else len(keys)
+    return lo, hi
+
+
+class IndexedCollection:
+    """
+    Rows keyed by id, with (time, id)-sorted lists over all rows and per indexed value.
+
+    A time-sorted query walks the sorted list of its most selective filter outward
+    from the cursor, checks any other filters against the row and stops after
+    limit + 1 matches, so a page costs O(log n + rows walked) however many rows are
+    stored. Sorting on any other field falls back to sorting the matching rows.
+    """
+
+    def __init__(self, name: str, time_field: str, indexed_fields: Sequence[str], id_field: str = "id"):
+        self.name = name
+        self.id_field = id_field
+        self.time_field = time_field
+        self.indexed_fields = tuple(indexed_fields)
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, IndexKey] = {}
+        self._by_time: List[IndexKey] = []
+        self._indexes: Dict[str, Dict[Any, List[IndexKey]]] = {field: {} for field in self.indexed_fields}
+        # Every field any row has carried; sort fields are checked against it
+        self._fields: Set[str] = {id_field, time_field, *self.indexed_fields}
+        self._lock = threading.RLock()
+        # Bumped on every change; HTTP ETags are derived from it
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, row_id: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(row_id)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """All rows in time order"""
+        with self._lock:
+            return [self._rows[row_id] for _, row_id in self._by_time]
+
+    def upsert(self, row: Dict[str, Any]):
+        """Insert or replace a row, moving it only in the indexes whose value changed"""
+        row = dict(row)
+        row_id = row[self.id_field]
+        key = (to_ns(row.get(self.time_field)), row_id)
+        with self._lock:
+            old = self._rows.get(row_id)
+            if old == row:
+                return
+            old_key = self._keys.get(row_id)
+            self.version += 1
+            self._fields.update(row)
+            self._rows[row_id] = row
+            self._keys[row_id] = key
+
+            if old is None:
+                bisect.insort(self._by_time, key)
+                for field in self.indexed_fields:
+                    self._add(field, row.get(field), key)
+                return
+
+            if old_key != key:
+                self._discard(self._by_time, old_key)
+                bisect.insort(self._by_time, key)
+            for field in self.indexed_fields:
+                if old_key != key or old.get(field) != row.get(field):
+                    self._remove(field, old.get(field), old_key)
+                    self._add(field, row.get(field), key)
+
+    def upsert_many(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Bulk upsert: new rows are appended and each touched list is sorted once at the end.
+
+        Rows already stored (or repeated within the batch) are replaced afterwards with
+        upsert(), which bisects and so needs the lists sorted again first.
+        """
+        with self._lock:
+            dirty: Dict[int, List[IndexKey]] = {}
+            updates: List[Dict[str, Any]] = []
+            for row in rows:
+                row_id = row[self.id_field]
+                if row_id in self._rows:
+                    updates.append(row)
+                    continue
+                row = dict(row)
+                key = (to_ns(row.get(self.time_field)), row_id)
+                self.version += 1
+                self._fields.update(row)
+                self._rows[row_id] = row
+                self._keys[row_id] = key
+                self._by_time.append(key)
+                dirty[id(self._by_time)] = self._by_time
+                for field in self.indexed_fields:
+                    value = row.get(field)
+                    if value is not None:
+                        bucket = self._indexes[field].setdefault(value, [])
+                        bucket.append(key)
+                        dirty[id(bucket)] = bucket
+            for keys in dirty.values():
+                keys.sort()
+            for row in updates:
+                self.upsert(row)
+
+    def remove(self, row_id: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(row_id, None)
+            if row is None:
+                return False
+            key = self._keys.pop(row_id)
+            self.version += 1
+            self._discard(self._by_time, key)
+            for field in self.indexed_fields:
+                self._remove(field, row.get(field), key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._rows.clear()
+            self._keys.clear()
+            self._by_time.clear()
+            for index in self._indexes.values():
+                index.clear()
+
+    def query(self, filters: Optional[Dict[str, Any]] = None, start: Any = None, end: Any = None,
+              sort: Optional[str] = None, limit: int = 100, cursor: Optional[str] = None,
+              fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        One page of rows matching filters within [start, end) on the time field.
+
+        filters maps indexed fields to a value or a list of accepted values. sort is a
+        field name, "-" prefixed for descending (default: newest first); rows without
+        the field come last either way. Pass the returned next_cursor back with the
+        same sort for the following page.
+        """
+        sort = sort or f"-{self.time_field}"
+        descending = sort.startswith("-")
+        sort_field = sort.lstrip("-")
+        limit = max(1, limit)
+        if sort_field not in self._fields:
+            raise ValueError(f"Cannot sort {self.name} on '{sort_field}', fields are {sorted(self._fields)}")
+
+        filters = {field: self._accepted(values) for field, values in (filters or {}).items() if values is not None}
+        for field in filters:
+            if field not in self._indexes:
+                raise ValueError(f"Cannot filter {self.name} on '{field}', indexed fields are {list(self.indexed_fields)}")
+        start_ns = to_ns(start) if start is not None else None
+        end_ns = to_ns(end) if end is not None else None
+        after = decode_cursor(cursor, sort) if cursor else None
+
+        with self._lock:
+            # Walk the smallest candidate list; the other filters are checked per row
+            lists, walked = self._candidate_lists(filters)
+            residual = {field: values for field, values in filters.items() if field != walked}
+            total = None if residual else sum(self._count_window(lst, start_ns, end_ns) for lst in lists)
+
+            if sort_field == self.time_field:
+                if after is not None:
+                    after = (int(after[0]), str(after[1]))
+                keys = self._walk(lists, start_ns, end_ns, descending, after)
+                page = list(islice(self._matching(keys, residual), limit + 1))
+                last_key = lambda row: self._keys[row[self.id_field]]
+            else:
+                keys = self._walk(lists, start_ns, end_ns, descending, None)
+                present, missing = [], []
+                for row in self._matching(keys, residual):
+                    (missing if row.get(sort_field) is None else present).append(row)
+                sort_key = lambda row: (row[sort_field], row[self.id_field])
+                present.sort(key=sort_key, reverse=descending)
+                missing.sort(key=lambda row: row[self.id_field], reverse=descending)
+                if after is not None:
+                    after_id = str(after[1])
+                    past = (lambda key, cursor: key < cursor) if descending else (lambda key, cursor: key > cursor)
+                    if after[0] is None:
+                        # The cursor is already among the rows missing the field
+                        present = []
+                        missing = [row for row in missing if past(row[self.id_field], after_id)]
+                    else:
+                        present = [row for row in present if past(sort_key(row), (after[0], after_id))]
+                page = (present + missing)[:limit + 1]
+                last_key = lambda row: (row.get(sort_field), row[self.id_field])
+
+        has_more = len(page) > limit
+        page = page[:limit]
+        next_cursor = encode_cursor(sort, last_key(page[-1])) if has_more and page else None
+        if fields:
+            page = [{field: row.get(field) for field in fields} for row in page]
+
+        return {
+            "rows": page,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+            "total": total,
+            "sort": sort,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self._rows),
+            "version": self.version,
+            "indexes": {field: len(values) for field, values in self._indexes.items()},
+        }
+
+    @staticmethod
+    def _accepted(values: Any) -> List[Any]:
+        return list(values) if isinstance(values, (list, tuple, set)) else [values]
+
+    def _add(self, field: str, value: Any, key: IndexKey):
+        if value is None:
+            return
+        bisect.insort(self._indexes[field].setdefault(value, []), key)
+
+    def _remove(self, field: str, value: Any, key: IndexKey):
+        bucket = self._indexes[field].get(value)
+        if bucket is None:
+            return
+        self._discard(bucket, key)
+        if not bucket:
+            del self._indexes[field][value]
+
+    @staticmethod
+    def _discard(keys: List[IndexKey], key: IndexKey):
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    def _candidate_lists(self, filters: Dict[str, List[Any]]) -> Tuple[List[List[IndexKey]], Optional[str]]:
+        best_lists, best_field, best_size = [self._by_time], None, len(self._by_time)
+        for field, values in filters.items():
+            lists = [self._indexes[field].get(value, []) for value in values]
+            size = sum(len(lst) for lst in lists)
+            if size <= best_size:
+                best_lists, best_field, best_size = lists, field, size
+        return best_lists, best_field
+
+    def _count_window(self, keys: List[IndexKey], start_ns: Optional[int], end_ns: Optional[int]) -> int:
+        lo, hi = _bounds(keys, start_ns, end_ns)
+        return max(0, hi - lo)
+
+    def _walk(self, lists: List[List[IndexKey]], start_ns: Optional[int], end_ns: Optional[int],
+              descending: bool, after: Optional[IndexKey]) -> Iterator[IndexKey]:
+        """Keys in sort order from every list, clipped to the window and resumed after the cursor"""
+        iterators = []
+        for keys in lists:
+            lo, hi = _bounds(keys, start_ns, end_ns)
+            if after is not None:
+                if descending:
+                    hi = min(hi, bisect.bisect_left(keys, after))
+                else:
+                    lo = max(lo, bisect.bisect_right(keys, after))
+            indices = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+            iterators.append(map(keys.__getitem__, indices))
+        if len(iterators) == 1:
+            return iterators[0]
+        return heapq.merge(*iterators, reverse=descending)
+
+    def _matching(self, keys: Iterator[IndexKey], residual: Dict[str, List[Any]]) -> Iterator[Dict[str, Any]]:
+        rows = self._rows
+        if not residual:
+            return (rows[row_id] for _, row_id in keys)
+        checks = [(field, set(values)) for field, values in residual.items()]
+        return (
+            row for row in (rows[row_id] for _, row_id in keys)
+            if all(row.get(field) in values for field, values in checks)
+        )
+
+
+class TradingStore:
+    """Orders, positions, trades and strategies as indexed collections"""
+
+    def __init__(self):
+        self.strategies = IndexedCollection("strategies", "created_at", ("status",))
+        self.orders = IndexedCollection("orders", "created_at", ("strategy_id", "instrument_id", "status", "side"))
+        self.positions = IndexedCollection("positions", "opened_at", ("strategy_id", "instrument_id", "side"))
+        self.trades = IndexedCollection("trades", "timestamp", ("strategy_id", "order_id", "instrument_id", "side"))
+
+    def upsert_order(self, order: Dict[str, Any]):
+        self.orders.upsert(order)
+
+    def upsert_position(self, position: Dict[str, Any]):
+        self.positions.upsert(position)
+
+    def upsert_trade(self, trade: Dict[str, Any]):
+        """Trades inherit strategy_id from their order so they can be filtered by strategy"""
+        if trade.get("strategy_id") is None:
+            order = self.orders.get(trade.get("order_id"))
+            if order is not None:
+                trade = {**trade, "strategy_id": order.get("strategy_id")}
+        self.trades.upsert(trade)
+
+    def load(self, orders: Iterable[Dict[str, Any]], positions: Iterable[Dict[str, Any]],
+             trades: Iterable[Dict[str, Any]], strategies: Iterable[Dict[str, Any]] = ()):
+        """Replace the contents of all collections"""
+        for collection in self.collections():
+            collection.clear()
+        self.strategies.upsert_many(strategies)
+        self.orders.upsert_many(orders)
+        self.positions.upsert_many(positions)
+        for trade in trades:
+            self.upsert_trade(trade)
+
+    def collections(self) -> List[IndexedCollection]:
+        return [self.strategies, self.orders, self.positions, self.trades]
+
+    @property
+    def version(self) -> Tuple[int, ...]:
+        """Changes whenever any collection changes"""
+        return tuple(collection.version for collection in self.collections())
+
+    def stats(self) -> Dict[str, Any]:
+        return {collection.name: collection.stats() for collection in self.collections()}
@@ -0,0 +1,231 @@
+"""
+Wire Format
+JSON and MessagePack encoders shared by the FastAPI bridge, the WebSocket broadcaster
+and the Python worker
+
+JSON goes through orjson when it is installed (stdlib json otherwise). MessagePack is
+offered to clients that ask for it, either with "Accept: application/msgpack" on REST
+or the "nautilus.msgpack" WebSocket subprotocol. Datetimes travel as msgpack
+Timestamp extension values instead of ISO strings; naive datetimes are taken as UTC.
+"""
+
+import json
+import math
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+MEDIA_TYPES = {JSON: "application/json", MSGPACK: "application/msgpack"}
+
+# Also accepted in Accept headers; several msgpack clients still send the x- form
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# WebSocket subprotocols offered by clients (Sec-WebSocket-Protocol)
+WS_SUBPROTOCOLS = {"nautilus.msgpack": MSGPACK, "nautilus.json": JSON}
+
+if ORJSON_AVAILABLE:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Format chosen for the current HTTP request by WireFormatMiddleware
+_request_format: ContextVar[str] = ContextVar("wire_format", default=JSON)
+
+
+def _to_builtin(value: Any) -> Any:
+    """Fallback for values neither encoder handles natively (Decimal, numpy/pandas scalars, sets)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict") and callable(value.dict):
+        return value.dict()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return _to_builtin(value)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # msgpack packs aware datetimes itself; naive ones land here and are taken as UTC
+        return value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return value.isoformat()
+    return _to_builtin(value)
+
+
+def _finite(value: Any) -> Any:
+    """Copy of value with NaN and infinities as None, matching what orjson writes"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return _finite(_json_default(value))
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Encode to UTF-8 JSON bytes; non-finite floats become null so JSON.parse accepts them"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=_json_default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # Integers beyond 64 bits and similar edge cases: stdlib handles them
+            pass
+    try:
+        return json.dumps(obj, default=_json_default, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    except ValueError:
+        # Bare NaN / Infinity are not JSON; only walk the object when one is present
+        return json.dumps(_finite(obj), default=_json_default, separators=(",", ":"),
+                          allow_nan=False).encode("utf-8")
+
+
+def loads_json(data: Any) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_msgpack(obj: Any) -> bytes:
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True, datetime=True)
+
+
+def loads_msgpack(data: bytes) -> Any:
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.unpackb(data, raw=False, timestamp=3, strict_map_key=False)
+
+
+def dumps(obj: Any, fmt: str = JSON) -> bytes:
+    return dumps_msgpack(obj) if fmt == MSGPACK else dumps_json(obj)
+
+
+def loads(data: Any, fmt: str = JSON) -> Any:
+    return loads_msgpack(data) if fmt == MSGPACK else loads_json(data)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response format from an Accept header; JSON unless msgpack is preferred"""
+    if not accept or not MSGPACK_AVAILABLE:
+        return JSON
+
+    best_format, best_q = JSON, -1.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            fmt = MSGPACK
+        elif media_type in ("application/json", "application/*", "*/*"):
+            fmt = JSON
+        else:
+            continue
+        # Ties go to the earlier entry, as listed by the client
+        if q > best_q:
+            best_format, best_q = fmt, q
+    return best_format if best_q > 0 else JSON
+
+
+def negotiate_subprotocol(offered: Any) -> Optional[str]:
+    """First WebSocket subprotocol from the client's list that we speak, or None"""
+    for subprotocol in offered or ():
+        fmt = WS_SUBPROTOCOLS.get(subprotocol)
+        if fmt == MSGPACK and not MSGPACK_AVAILABLE:
+            continue
+        if fmt is not None:
+            return subprotocol
+    return None
+
+
+def current_format() -> str:
+    return _request_format.get()
+
+
+def encoder_info() -> Dict[str, Any]:
+    return {
+        "json": "orjson" if ORJSON_AVAILABLE else "json",
+        "msgpack": MSGPACK_AVAILABLE,
+        "ws_subprotocols": [p for p, f in WS_SUBPROTOCOLS.items() if f != MSGPACK or MSGPACK_AVAILABLE],
+    }
+
+
+class WireFormatMiddleware:
+    """ASGI middleware recording the negotiated format for the response class to pick up"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept":
+                accept = value.decode("latin-1")
+                break
+        token = _request_format.set(negotiate(accept))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_format.reset(token)
+
+
+try:
+    from starlette.responses import Response
+
+    class NegotiatedResponse(Response):
+        """Renders JSON or MessagePack according to the request's Accept header"""
+
+        media_type = MEDIA_TYPES[JSON]
+
+        def __init__(self, content: Any = None, *args, **kwargs):
+            self.wire_format = current_format()
+            self.media_type = MEDIA_TYPES[self.wire_format]
+            super().__init__(content, *args, **kwargs)
+            self.headers.setdefault("vary", "Accept")
+
+        def render(self, content: Any) -> bytes:
+            return dumps(content, self.wire_format)
+except ImportError:
+    # The worker process imports this module without FastAPI installed
+    pass
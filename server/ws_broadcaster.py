@@ -0,0 +1,224 @@
+"""
+WebSocket Broadcaster
+Fan-out to WebSocket clients through bounded per-client queues drained by per-client sender tasks
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+try:
+    from server.wire_format import JSON, MSGPACK, dumps
+except ImportError:
+    from wire_format import JSON, MSGPACK, dumps
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# Close code sent to clients that fall too far behind under the "disconnect" policy
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class ClientConnection:
+    """
+    One subscriber: a bounded queue of encoded frames and the task that sends them.
+
+    The publisher only appends to the queue; all socket writes happen in the sender
+    task, so a slow client delays nobody but itself.
+    """
+
+    def __init__(self, websocket, client_id: int, max_queue: int, policy: str, send_timeout: float,
+                 wire_format: str = JSON):
+        self.websocket = websocket
+        self.id = client_id
+        self.wire_format = wire_format
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.connected_at = time.time()
+        # Entries are [coalesce_key, payload] lists so coalescing can swap a payload in place
+        self._queue: Deque[List[Any]] = deque()
+        self._pending_keys: Dict[str, List[Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._sender(), name=f"ws-sender-{self.id}")
+
+    def offer(self, payload: Any, key: Optional[str] = None, coalesce: bool = False):
+        """
+        Queue a frame without waiting, applying the overflow policy when full.
+
+        payload is an encoded frame or a callable that builds one when the sender
+        reaches it (returning None skips it). coalesce=True always replaces an unsent
+        frame with the same key, whatever the overflow policy.
+        """
+        if self.closed:
+            return
+
+        if key is not None and (coalesce or self.policy == "coalesce") and key in self._pending_keys:
+            # A newer snapshot of the same stream replaces the unsent one
+            self._pending_keys[key][1] = payload
+            self.coalesced += 1
+            return
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == "disconnect":
+                self.dropped += len(self._queue) + 1
+                self._shutdown()
+                asyncio.create_task(self._close_socket(CLOSE_TRY_AGAIN_LATER, "Client too slow"))
+                return
+            oldest = self._queue.popleft()
+            if oldest[0] is not None and self._pending_keys.get(oldest[0]) is oldest:
+                del self._pending_keys[oldest[0]]
+            self.dropped += 1
+
+        entry = [key, payload]
+        self._queue.append(entry)
+        if key is not None:
+            self._pending_keys[key] = entry
+        self._wakeup.set()
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        """Stop the sender and close the socket"""
+        if self.closed:
+            return
+        self._shutdown()
+        await self._close_socket(code, reason)
+
+    def _shutdown(self):
+        self.closed = True
+        self._queue.clear()
+        self._pending_keys.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    async def _close_socket(self, code: int, reason: str):
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "wire_format": self.wire_format,
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+        }
+
+    async def _sender(self):
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                entry = self._queue.popleft()
+                key, payload = entry
+                if key is not None and self._pending_keys.get(key) is entry:
+                    del self._pending_keys[key]
+                if callable(payload):
+                    payload = payload()
+                    if payload is None:
+                        continue
+                await asyncio.wait_for(self._send(payload), timeout=self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Send failed or timed out: the client is gone or stuck
+            await self.close(CLOSE_TRY_AGAIN_LATER, "Send failed")
+
+    async def _send(self, payload: Any):
+        if isinstance(payload, bytes):
+            await self.websocket.send_bytes(payload)
+        else:
+            await self.websocket.send_text(payload)
+
+
+class Broadcaster:
+    """Registry of connected clients; broadcast() encodes once per wire format and enqueues everywhere"""
+
+    def __init__(self, max_queue: int = 256, policy: str = "drop_oldest", send_timeout: float = 10.0):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}', expected one of {OVERFLOW_POLICIES}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._clients: Dict[int, ClientConnection] = {}
+        self._next_id = 1
+        self.broadcasts = 0
+
+    def register(self, websocket, wire_format: str = JSON) -> ClientConnection:
+        """Track an accepted websocket and start its sender task"""
+        client = ClientConnection(
+            websocket, self._next_id, self.max_queue, self.policy, self.send_timeout, wire_format
+        )
+        self._next_id += 1
+        self._clients[client.id] = client
+        client.start()
+        return client
+
+    async def unregister(self, client: ClientConnection):
+        self._clients.pop(client.id, None)
+        await client.close()
+
+    def send(self, client: ClientConnection, message: Dict[str, Any]):
+        """Queue a message for one client"""
+        client.offer(self.encode(message, client.wire_format))
+
+    def broadcast(self, message: Dict[str, Any], coalesce_key: Optional[str] = None) -> int:
+        """
+        Queue a message for every client and return how many received it.
+
+        coalesce_key defaults to the message "type": under the coalesce policy an
+        unsent frame with the same key is replaced by this one.
+        """
+        self.broadcasts += 1
+        payloads: Dict[str, Any] = {}
+        key = coalesce_key if coalesce_key is not None else message.get("type")
+        delivered = 0
+        for client_id, client in list(self._clients.items()):
+            if client.closed:
+                self._clients.pop(client_id, None)
+                continue
+            if client.wire_format not in payloads:
+                payloads[client.wire_format] = self.encode(message, client.wire_format)
+            client.offer(payloads[client.wire_format], key)
+            delivered += 1
+        return delivered
+
+    def encode(self, message: Dict[str, Any], wire_format: str = JSON) -> Any:
+        """Text frame for JSON clients, binary frame for MessagePack clients"""
+        if wire_format == MSGPACK:
+            return dumps(message, MSGPACK)
+        return dumps(message, JSON).decode("utf-8")
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def stats(self) -> Dict[str, Any]:
+        clients = [client.stats() for client in self._clients.values()]
+        return {
+            "clients": len(clients),
+            "policy": self.policy,
+            "max_queue": self.max_queue,
+            "broadcasts": self.broadcasts,
+            "queued": sum(c["queued"] for c in clients),
+            "dropped": sum(c["dropped"] for c in clients),
+            "coalesced": sum(c["coalesced"] for c in clients),
+            "per_client": clients,
+        }
+
+    async def close_all(self):
+        for client in list(self._clients.values()):
+            await self.unregister(client)
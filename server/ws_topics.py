@@ -0,0 +1,221 @@
+"""
+WebSocket Topics
+Topic subscriptions with snapshot-then-delta updates on top of the WebSocket broadcaster
+
+Client -> server (JSON text frames):
+    {"action": "subscribe", "topics": ["orders", "positions:strategy-001"], "ack": false}
+    {"action": "unsubscribe", "topics": ["orders"]}
+    {"action": "ack", "topic": "orders", "version": 12}
+    {"action": "resync", "topic": "orders"}
+
+Server -> client:
+    {"type": "snapshot", "topic": "orders", "version": 12, "data": {...}}
+    {"type": "delta", "topic": "orders", "base_version": 11, "version": 12, "ops": [...]}
+
+Delta ops follow JSON Patch (RFC 6902) add / remove / replace with JSON Pointer paths
+and apply to the state at base_version. Without "ack" that is simply the last version
+the server sent; with "ack": true it is the last version the client acknowledged, so
+deltas keep targeting that state until a newer ack arrives. A client that holds a
+different base sends "resync" to get a fresh snapshot.
+"""
+
+import copy
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Topic families clients may subscribe to; "<family>:<strategy_id>" narrows per strategy
+TOPIC_FAMILIES = ("orders", "positions", "trades", "strategies", "system_status", "system_metrics", "components")
+
+# Past versions kept per topic so deltas can be computed from a client's acked version
+HISTORY_VERSIONS = 32
+
+
+def _escape(token: str) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON-patch ops turning old into new; dicts are walked, anything else is replaced whole"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class Topic:
+    """Current state of one topic plus a short history of earlier versions"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version = 0
+        self.state: Any = None
+        self.history: "OrderedDict[int, Any]" = OrderedDict()
+        self.frames: Dict[Any, Any] = {}  # (base_version, version, wire_format) -> encoded frame, this version only
+        self.last_ops: List[Dict[str, Any]] = []  # diff from version - 1, reused for in-step clients
+
+
+class Subscription:
+    def __init__(self, client, topic: str, explicit_ack: bool):
+        self.client = client
+        self.topic = topic
+        self.explicit_ack = explicit_ack
+        self.sent: Optional[int] = None
+        self.acked: Optional[int] = None
+
+    @property
+    def base(self) -> Optional[int]:
+        return self.acked if self.explicit_ack else self.sent
+
+
+class TopicHub:
+    """
+    Tracks topic state and each client's position in it.
+
+    publish() stores the new state and queues a lightweight marker per subscriber
+    (coalesced, so at most one is pending per topic per client). The frame itself is
+    built when the client's sender task reaches the marker: a delta from the client's
+    base version, or a snapshot if that version has aged out. Frames are cached per
+    (base, version, wire format), so clients in step share one diff and one encode.
+    """
+
+    def __init__(self, broadcaster, history_versions: int = HISTORY_VERSIONS):
+        self.broadcaster = broadcaster
+        self.history_versions = history_versions
+        self._topics: Dict[str, Topic] = {}
+        self._subscriptions: Dict[int, Dict[str, Subscription]] = {}
+        self._subscribers: Dict[str, Set[int]] = {}
+
+    def publish(self, topic_name: str, state: Any) -> int:
+        """Set a topic's state; subscribers are notified only if something changed"""
+        topic = self._topics.setdefault(topic_name, Topic(topic_name))
+        # Copy first so later mutation by the caller cannot leak into history or cached ops
+        state = copy.deepcopy(state)
+        ops = diff(topic.state, state) if topic.version else []
+        if topic.version and not ops:
+            return topic.version
+
+        topic.last_ops = ops
+        topic.version += 1
+        topic.state = state
+        topic.history[topic.version] = topic.state
+        while len(topic.history) > self.history_versions:
+            topic.history.popitem(last=False)
+        topic.frames = {}
+
+        for client_id in self._subscribers.get(topic_name, ()):
+            self._notify(self._subscriptions[client_id][topic_name])
+        return topic.version
+
+    def handle(self, client, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply a client control message; returns a reply to send, if any"""
+        action = message.get("action")
+        if action == "subscribe":
+            topics = message.get("topics") or []
+            invalid = [t for t in topics if not self.valid_topic(t)]
+            accepted = [t for t in topics if self.valid_topic(t)]
+            for topic in accepted:
+                self.subscribe(client, topic, bool(message.get("ack", False)))
+            return {"type": "subscribed", "topics": accepted, "invalid": invalid}
+        if action == "unsubscribe":
+            topics = message.get("topics") or []
+            for topic in topics:
+                self.unsubscribe(client, topic)
+            return {"type": "unsubscribed", "topics": topics}
+        if action == "ack":
+            subscription = self._subscriptions.get(client.id, {}).get(message.get("topic"))
+            if subscription is not None and isinstance(message.get("version"), int):
+                subscription.acked = message["version"]
+            return None
+        if action == "resync":
+            subscription = self._subscriptions.get(client.id, {}).get(message.get("topic"))
+            if subscription is None:
+                return {"type": "error", "error": f"Not subscribed to '{message.get('topic')}'"}
+            subscription.sent = subscription.acked = None
+            self._notify(subscription)
+            return None
+        return {"type": "error", "error": f"Unknown action '{action}'"}
+
+    def subscribe(self, client, topic: str, explicit_ack: bool = False):
+        subscription = Subscription(client, topic, explicit_ack)
+        self._subscriptions.setdefault(client.id, {})[topic] = subscription
+        self._subscribers.setdefault(topic, set()).add(client.id)
+        if topic not in self._topics:
+            # e.g. "orders:strategy-003" with no rows yet: start it empty so the client
+            # gets a snapshot now rather than silence until the first row appears
+            self.publish(topic, {})
+        else:
+            self._notify(subscription)
+
+    def unsubscribe(self, client, topic: str):
+        self._subscriptions.get(client.id, {}).pop(topic, None)
+        self._subscribers.get(topic, set()).discard(client.id)
+
+    def remove_client(self, client):
+        for topic in self._subscriptions.pop(client.id, {}):
+            self._subscribers.get(topic, set()).discard(client.id)
+
+    def valid_topic(self, topic: Any) -> bool:
+        return isinstance(topic, str) and topic.split(":", 1)[0] in TOPIC_FAMILIES
+
+    def topic_names(self) -> List[str]:
+        return list(self._topics)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"version": topic.version, "subscribers": len(self._subscribers.get(name, ()))}
+            for name, topic in self._topics.items()
+        }
+
+    def _notify(self, subscription: Subscription):
+        topic = self._topics.get(subscription.topic)
+        if topic is None or topic.version == 0:
+            return  # Nothing published yet; the first publish sends the snapshot
+        subscription.client.offer(
+            self._frame_builder(subscription), key=f"topic:{subscription.topic}", coalesce=True
+        )
+
+    def _frame_builder(self, subscription: Subscription) -> Callable[[], Any]:
+        return lambda: self._build_frame(subscription)
+
+    def _build_frame(self, subscription: Subscription) -> Any:
+        """Runs in the client's sender task, just before the frame is written"""
+        topic = self._topics[subscription.topic]
+        base = subscription.base
+        if base == topic.version:
+            return None
+        wire_format = subscription.client.wire_format
+
+        if base is None or base not in topic.history:
+            key = (None, topic.version, wire_format)
+            if key not in topic.frames:
+                topic.frames[key] = self.broadcaster.encode({
+                    "type": "snapshot",
+                    "topic": topic.name,
+                    "version": topic.version,
+                    "data": topic.state,
+                }, wire_format)
+        else:
+            key = (base, topic.version, wire_format)
+            if key not in topic.frames:
+                topic.frames[key] = self.broadcaster.encode({
+                    "type": "delta",
+                    "topic": topic.name,
+                    "base_version": base,
+                    "version": topic.version,
+                    "ops": topic.last_ops if base == topic.version - 1
+                           else diff(topic.history[base], topic.state),
+                }, wire_format)
+
+        subscription.sent = topic.version
+        return topic.frames[key]
@@ -0,0 +1,236 @@
+"""
+Unit Tests for the Backtest Parameter Sweep
+Tests result table building, single runs and the background sweep jobs
+"""
+
+import sys
+import os
+import json
+import threading
+import types
+from datetime import datetime
+
+import pytest
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+import backtest_sweep
+from backtest_sweep import _run_one, parameter_grid, results_table
+
+
+def test_parameter_grid_skips_invalid_ema_pairs():
+    configs = parameter_grid({"fast_ema_period": [10, 30], "slow_ema_period": [20]})
+    assert configs == [{"fast_ema_period": 10, "slow_ema_period": 20}]
+
+
+def test_results_table_keeps_columns_of_failed_and_succeeded_runs():
+    rows = [
+        {"run": 0, "fast_ema_period": 5, "success": False, "error": "boom", "seconds": 0.1},
+        {"run": 1, "fast_ema_period": 10, "success": True, "pnl": 12.5, "sharpe_ratio": 1.2, "seconds": 2.0},
+    ]
+    table = results_table(rows)
+    assert table.column_names == ["run", "fast_ema_period", "success", "error", "seconds", "pnl", "sharpe_ratio"]
+    assert table.column("pnl").to_pylist() == [None, 12.5]
+    assert table.column("error").to_pylist() == ["boom", None]
+
+
+class _Stub:
+    """Accepts any constructor arguments; attribute access yields more stubs"""
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __getattr__(self, name):
+        return _Stub()
+
+
+class _FakeAnalyzer:
+    def get_performance_stats_returns(self):
+        return {"Sharpe Ratio (252 days)": 1.5, "Volatility": float("nan")}
+
+    def get_performance_stats_general(self):
+        return {"Win Rate": 0.6, "Label": "ignored"}
+
+
+class _FakeEngine:
+    disposed = False
+
+    def __init__(self, config=None):
+        self.strategies = []
+        self.portfolio = types.SimpleNamespace(
+            account=lambda venue: types.SimpleNamespace(
+                balance_total=lambda currency: types.SimpleNamespace(as_double=lambda: 1_000_250.0)
+            ),
+            analyzer=_FakeAnalyzer(),
+        )
+        self.trader = types.SimpleNamespace(
+            generate_order_fills_report=lambda: [1, 2, 3],
+            generate_positions_report=lambda: [1],
+        )
+
+    def add_venue(self, **kwargs):
+        pass
+
+    def add_instrument(self, instrument):
+        pass
+
+    def add_data(self, data):
+        pass
+
+    def add_strategy(self, strategy):
+        self.strategies.append(strategy)
+
+    def run(self):
+        pass
+
+    def dispose(self):
+        _FakeEngine.disposed = True
+
+
+def _install_fake_nautilus(monkeypatch):
+    modules = {
+        "nautilus_trader": {},
+        "nautilus_trader.backtest": {},
+        "nautilus_trader.backtest.engine": {"BacktestEngine": _FakeEngine},
+        "nautilus_trader.config": {"BacktestEngineConfig": _Stub, "LoggingConfig": _Stub},
+        "nautilus_trader.model": {},
+        "nautilus_trader.model.currencies": {"USD": "USD"},
+        "nautilus_trader.model.enums": {"AccountType": _Stub(), "OmsType": _Stub()},
+        "nautilus_trader.model.identifiers": {"TraderId": _Stub, "Venue": _Stub},
+        "nautilus_trader.model.objects": {"Money": _Stub},
+        "nautilus_trader.model.data": {"BarType": types.SimpleNamespace(from_str=lambda value: value)},
+        "nautilus_trader.examples": {},
+        "nautilus_trader.examples.strategies": {},
+        "nautilus_trader.examples.strategies.ema_cross": {"EMACross": _Stub, "EMACrossConfig": _Stub},
+    }
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        monkeypatch.setitem(sys.modules, name, module)
+
+
+def test_run_one_reports_engine_results(monkeypatch):
+    _install_fake_nautilus(monkeypatch)
+    monkeypatch.setattr(backtest_sweep, "_worker", {
+        "starting_balance": 1_000_000,
+        "trade_size": 100_000,
+        "instrument": types.SimpleNamespace(id="EUR/USD.SIM"),
+        "ticks": [],
+    })
+    _FakeEngine.disposed = False
+
+    result = _run_one((3, {"fast_ema_period": 5, "slow_ema_period": 20}))
+
+    assert result["success"] is True, result.get("traceback")
+    assert result["run"] == 3
+    assert result["fast_ema_period"] == 5
+    assert result["pnl"] == 250.0
+    assert result["fills"] == 3
+    assert result["positions"] == 1
+    assert result["returns_sharpe_ratio_252_days"] == 1.5
+    assert "returns_volatility" not in result
+    assert result["win_rate"] == 0.6
+    assert "label" not in result
+    assert _FakeEngine.disposed
+
+
+def test_run_one_reports_worker_setup_failure(monkeypatch):
+    monkeypatch.setattr(backtest_sweep, "_worker", {"error": "Worker setup failed: no data"})
+    result = _run_one((0, {"fast_ema_period": 5, "slow_ema_period": 20}))
+    assert result["success"] is False
+    assert result["error"] == "Worker setup failed: no data"
+    assert result["fast_ema_period"] == 5
+
+
+def test_run_one_on_the_real_engine(monkeypatch, tmp_path):
+    pytest.importorskip("nautilus_trader", reason="nautilus_trader is not installed; the engine path needs it")
+    sweep = backtest_sweep.ParameterSweep(
+        start=datetime(2024, 1, 1), end=datetime(2024, 1, 3), base_path=str(tmp_path), workers=1,
+    )
+    # The initializer points stdout at stderr for the pool child; keep pytest's stdout
+    monkeypatch.setattr(os, "dup2", lambda fd, fd2: None)
+    monkeypatch.setattr(backtest_sweep, "_worker", {})
+    backtest_sweep._init_sweep_worker(sweep.prepare_data(), "EUR/USD", sweep.starting_balance, sweep.trade_size)
+    assert "error" not in backtest_sweep._worker, backtest_sweep._worker.get("error")
+
+    result = _run_one((0, {"fast_ema_period": 10, "slow_ema_period": 20}))
+
+    assert result["success"] is True, result.get("traceback")
+    assert result["final_balance"] > 0
+    assert result["pnl"] == pytest.approx(result["final_balance"] - sweep.starting_balance)
+
+
+def _fake_run(fail_runs=(), gate=None):
+    def run(self, configs, on_result=None, cancelled=None):
+        rows = []
+        for run_id, params in enumerate(configs):
+            if gate is not None:
+                gate.wait(5)
+            row = {"run": run_id, **params, "success": run_id not in fail_runs}
+            if row["success"]:
+                row["pnl"] = float(run_id)
+            rows.append(row)
+            on_result(row)
+            if cancelled():
+                break
+        return results_table(rows)
+    return run
+
+
+def _wait(job_id, base_path):
+    backtest_sweep._jobs[job_id]._thread.join(5)
+    return backtest_sweep.get_parameter_sweep_status(job_id, str(base_path))
+
+
+def test_sweep_runs_as_a_background_job(monkeypatch, tmp_path):
+    monkeypatch.setattr(backtest_sweep.ParameterSweep, "run", _fake_run(fail_runs={1}))
+    started = backtest_sweep.start_parameter_sweep(
+        grid={"fast_ema_period": [5, 10, 15], "slow_ema_period": [20]}, save=False, base_path=str(tmp_path),
+    )
+    assert started["state"] in ("pending", "running")
+    assert started["runs"] == 3
+
+    status = _wait(started["id"], tmp_path)
+    assert status["state"] == "completed"
+    assert (status["completed"], status["failed"], status["progress"]) == (3, 1, 1.0)
+    assert status["result"]["best"]["fast_ema_period"] == 15
+
+    # Another worker process only sees the status file
+    monkeypatch.setattr(backtest_sweep, "_jobs", {})
+    from_file = backtest_sweep.get_parameter_sweep_status(started["id"], str(tmp_path))
+    assert from_file["state"] == "completed"
+    assert from_file["result"]["runs"] == 3
+    listed = backtest_sweep.get_parameter_sweep_status(None, str(tmp_path))
+    assert [job["id"] for job in listed] == [started["id"]]
+    assert "result" not in listed[0]
+    assert "error" in backtest_sweep.get_parameter_sweep_status("../../etc", str(tmp_path))
+
+
+def test_sweep_cancelled_from_another_process(monkeypatch, tmp_path):
+    gate = threading.Event()
+    monkeypatch.setattr(backtest_sweep.ParameterSweep, "run", _fake_run(gate=gate))
+    started = backtest_sweep.start_parameter_sweep(
+        grid={"fast_ema_period": [1, 2, 3, 4], "slow_ema_period": [20]}, save=False, base_path=str(tmp_path),
+    )
+    job = backtest_sweep._jobs.pop(started["id"])
+    assert backtest_sweep.cancel_parameter_sweep(started["id"], str(tmp_path))["cancel_requested"] is True
+    gate.set()
+    job._thread.join(5)
+
+    status = backtest_sweep.get_parameter_sweep_status(started["id"], str(tmp_path))
+    assert status["state"] == "cancelled"
+    assert status["completed"] == 1
+    assert not os.path.exists(job.cancel_path)
+
+
+def test_sweep_of_a_dead_worker_is_reported_failed(tmp_path):
+    jobs = tmp_path / "sweeps" / "jobs"
+    jobs.mkdir(parents=True)
+    (jobs / "0123456789ab.json").write_text(json.dumps({
+        "id": "0123456789ab", "state": "running", "pid": 2 ** 22 + 1, "started_at": None, "error": None,
+    }))
+    status = backtest_sweep.get_parameter_sweep_status("0123456789ab", str(tmp_path))
+    assert status["state"] == "failed"
+    assert "exited" in status["error"]
@@ -0,0 +1,149 @@
+"""
+Unit Tests for Response Compression
+Tests Accept-Encoding negotiation and CompressionMiddleware
+"""
+
+import sys
+import os
+import asyncio
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+import compression
+from compression import ENCODERS, CompressionMiddleware, choose_encoding
+
+BIG = {"rows": [{"id": i, "symbol": "EURUSD", "price": 1.0845} for i in range(200)]}
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br, zstd", "zstd" if "zstd" in ENCODERS else "br" if "br" in ENCODERS else "gzip"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("zstd;q=0, gzip", "gzip"),
+    ("*;q=0.1", next(c for c in compression.ENCODING_PREFERENCE if c in ENCODERS)),
+    ("gzip;q=bogus", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_respects_allowed():
+    assert choose_encoding("zstd, br, gzip", {"gzip": 1}) == "gzip"
+    assert choose_encoding("zstd, br", {"gzip": 1}) is None
+
+
+def _client(**kwargs):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **kwargs)
+
+    @app.get("/big")
+    async def big():
+        return JSONResponse(BIG, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+    @app.get("/exports/big")
+    async def export():
+        return JSONResponse(BIG)
+
+    return TestClient(app)
+
+
+def test_large_json_is_compressed_with_weak_etag():
+    response = _client(minimum_size=512).get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.json() == BIG
+
+
+def test_small_and_binary_bodies_pass_through():
+    client = _client(minimum_size=512)
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/png", headers={"Accept-Encoding": "gzip"}).headers
+
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip"),
+    ("/big", "identity"),
+    ("/big", ""),
+])
+def test_identity_responses_still_vary_on_accept_encoding(path, accept_encoding):
+    response = _client(minimum_size=512).get(path, headers={"Accept-Encoding": accept_encoding})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_existing_vary_is_extended_once():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=512)
+
+    @app.get("/negotiated")
+    async def negotiated():
+        return JSONResponse(BIG, headers={"Vary": "Accept"})
+
+    client = TestClient(app)
+    assert client.get("/negotiated", headers={"Accept-Encoding": "gzip"}).headers["vary"] == "Accept, Accept-Encoding"
+    assert client.get("/negotiated", headers={"Accept-Encoding": ""}).headers["vary"] == "Accept, Accept-Encoding"
+
+
+def test_route_levels_can_turn_compression_off():
+    client = _client(minimum_size=512, route_levels={"/exports": {}})
+    response = client.get("/exports/big", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    assert response.json() == BIG
+
+
+def test_streaming_body_is_flushed_per_chunk():
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield (f'{{"id": {i}}}\n' * 100).encode()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # No disconnect; cancelled once the response is done
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+        "query_string": b"", "headers": [(b"accept-encoding", b"gzip")], "scheme": "http",
+        "server": ("test", 80), "client": ("test", 1), "http_version": "1.1",
+    }
+    asyncio.run(CompressionMiddleware(app, minimum_size=64)(scope, receive, send))
+
+    bodies = [m for m in sent if m["type"] == "http.response.body"]
+    assert dict(sent[0]["headers"])[b"content-encoding"] == b"gzip"
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # Every chunk decodes on its own, without waiting for the end of the stream
+    for i, message in enumerate(bodies[:3]):
+        assert decoder.decompress(message["body"]) == (f'{{"id": {i}}}\n' * 100).encode()
+    assert bodies[-1]["more_body"] is False
@@ -0,0 +1,139 @@
+"""
+Unit Tests for the COPY Loader
+Tests the PostgreSQL binary numeric encoding and the CSV / binary COPY buffers
+"""
+
+import sys
+import os
+import struct
+from datetime import datetime
+from decimal import Decimal
+
+import pyarrow as pa
+import pytest
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from populate_database import (
+    CopyLoader, TABLE_COLUMNS, _BINARY_HEADER, _BINARY_TRAILER, _binary_numeric, _binary_timestamp
+)
+
+
+def decode_numeric(data: bytes) -> Decimal:
+    """Inverse of the numeric wire format, as the server would read it"""
+    length, count, weight, sign, dscale = struct.unpack('!ihhHH', data[:12])
+    assert length == len(data) - 4
+    digits = struct.unpack(f'!{count}H', data[12:])
+    assert all(0 <= d < 10000 for d in digits)
+    value = sum((Decimal(d) * Decimal(10000) ** (weight - i) for i, d in enumerate(digits)), Decimal(0))
+    value = value.quantize(Decimal(1).scaleb(-dscale))
+    return -value if sign == 0x4000 else value
+
+
+@pytest.mark.parametrize("value", [
+    0, 1, -1, 9999, 10000, 123456789, 0.5, -0.0001, 1.0845, 65432.1, 0.000012345,
+    1e-7, 2.5e16, "100000.00", Decimal("-12.3400"), 1234.56789012,
+])
+def test_binary_numeric_round_trips(value):
+    expected = Decimal(repr(value) if isinstance(value, float) else str(value))
+    assert decode_numeric(_binary_numeric(value)) == expected
+
+
+def test_binary_numeric_zero_has_no_digits_and_no_sign():
+    assert _binary_numeric(-0.0) == struct.pack('!ihhHH', 8, 0, 0, 0, 1)
+
+
+def test_binary_timestamp_counts_from_2000():
+    assert _binary_timestamp(datetime(2000, 1, 1, 0, 0, 1, 5)) == struct.pack('!iq', 8, 1_000_005)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, statement, buffer, size=8192):
+        self.conn.copies.append((statement, buffer.read()))
+
+
+class FakeConn:
+    def __init__(self):
+        self.copies = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+ROW = ("TEST-O-0001", "EURUSD.SIM", "BUY", "LIMIT", 100000, 1.0845, None, None, "OPEN",
+       datetime(2024, 1, 2, 3, 4, 5))
+
+
+def test_csv_rows_write_none_as_empty_fields():
+    conn = FakeConn()
+    result = CopyLoader(conn, format="csv").load("orders", [ROW])
+    statement, body = conn.copies[0]
+    assert statement.startswith("COPY orders (order_id, instrument_id,")
+    assert statement.endswith("WITH (FORMAT csv)")
+    assert body == b"TEST-O-0001,EURUSD.SIM,BUY,LIMIT,100000,1.0845,,,OPEN,2024-01-02 03:04:05\n"
+    assert result["rows"] == 1
+    assert result["bytes"] == len(body)
+
+
+def test_binary_rows_are_framed_per_field():
+    conn = FakeConn()
+    CopyLoader(conn, format="binary").load("orders", [ROW, ROW])
+    _, body = conn.copies[0]
+    assert body.startswith(_BINARY_HEADER) and body.endswith(_BINARY_TRAILER)
+
+    offset = len(_BINARY_HEADER)
+    for _ in range(2):
+        (fields,) = struct.unpack_from('!h', body, offset)
+        assert fields == len(TABLE_COLUMNS["orders"])
+        offset += 2
+        values = []
+        for _ in range(fields):
+            (length,) = struct.unpack_from('!i', body, offset)
+            offset += 4
+            values.append(None if length == -1 else body[offset:offset + length])
+            offset += max(length, 0)
+        assert values[0] == b"TEST-O-0001"
+        assert decode_numeric(struct.pack('!i', len(values[5])) + values[5]) == Decimal("1.0845")
+        assert values[6] is None and values[7] is None
+    assert offset == len(body) - len(_BINARY_TRAILER)
+
+
+def test_batches_and_commits():
+    conn = FakeConn()
+    loader = CopyLoader(conn, format="csv", batch_rows=2, commit_rows=4)
+    loader.load("orders", [ROW] * 5)
+    # Buffers of 2, 2 and 1 rows; a commit once 4 rows are uncommitted and one at the end
+    assert len(conn.copies) == 3
+    assert conn.commits == 2
+    assert loader.summary()[0]["rows"] == 5
+
+
+def test_arrow_csv_matches_row_csv():
+    names = [name for name, _ in TABLE_COLUMNS["orders"]]
+    table = pa.table({name: [value] for name, value in zip(names, ROW)})
+    arrow_conn, rows_conn = FakeConn(), FakeConn()
+    CopyLoader(arrow_conn, format="csv").load_arrow("orders", [table])
+    CopyLoader(rows_conn, format="csv").load("orders", [ROW])
+    arrow_fields = arrow_conn.copies[0][1].decode().strip().split(",")
+    row_fields = rows_conn.copies[0][1].decode().strip().split(",")
+    assert [f.strip('"') for f in arrow_fields[:6]] == row_fields[:6]
+    assert arrow_fields[6:8] == ["", ""]
+
+
+def test_unsupported_format_is_rejected():
+    with pytest.raises(ValueError):
+        CopyLoader(FakeConn(), format="text")
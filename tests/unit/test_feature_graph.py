@@ -0,0 +1,79 @@
+"""
+Unit Tests for the Feature Dependency Graph
+Tests transitive closures, startup order and cycle detection
+"""
+
+import sys
+import os
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from feature_graph import DependencyGraph, build_feature_graph
+
+
+def _chain_graph():
+    # Kernel -> MessageBus -> Logger, DataEngine -> MessageBus, Cache -> Redis (optional)
+    return DependencyGraph([
+        ("Kernel", "MessageBus", False),
+        ("MessageBus", "Logger", False),
+        ("DataEngine", "MessageBus", False),
+        ("DataEngine", "Cache", False),
+        ("Cache", "Redis", True),
+    ])
+
+
+def test_requirements_and_impact_are_transitive():
+    graph = _chain_graph()
+    assert graph.requirements("Kernel") == ["Logger", "MessageBus"]
+    assert set(graph.impact("Logger")) == {"MessageBus", "Kernel", "DataEngine"}
+    assert set(graph.direct_dependencies("DataEngine")) == {"MessageBus", "Cache"}
+    assert graph.requirements("Unknown") == []
+
+
+def test_optional_dependencies_stay_out_of_closures():
+    graph = _chain_graph()
+    assert "Redis" not in graph.requirements("DataEngine")
+    assert graph.impact("Redis") == []
+    assert graph.stats()["optional_edges"] == 1
+
+
+def test_startup_order_puts_dependencies_first():
+    graph = _chain_graph()
+    order = graph.startup_order()
+    for dependent, dependency in (("Kernel", "MessageBus"), ("MessageBus", "Logger"), ("DataEngine", "Cache")):
+        assert order.index(dependency) < order.index(dependent)
+    assert graph.startup_order(["Kernel"]) == ["Logger", "MessageBus", "Kernel"]
+
+
+def test_closures_within_mask():
+    graph = _chain_graph()
+    disabled = graph.mask(["Logger", "NotANode"])
+    assert graph.requirements_within("Kernel", disabled) == ["Logger"]
+    assert graph.impact_within("MessageBus", ~graph.mask(["Kernel"])) == ["DataEngine"]
+
+
+def test_cycles_are_reported_and_closed_over():
+    graph = DependencyGraph([
+        ("A", "B", False),
+        ("B", "C", False),
+        ("C", "A", False),
+        ("D", "A", False),
+        ("E", "E", False),
+    ])
+    assert sorted(graph.cycles) == [["A", "B", "C"], ["E"]]
+    assert graph.stats()["cycle_count"] == 2
+    # A node is never its own requirement, even inside a cycle
+    assert set(graph.requirements("A")) == {"B", "C"}
+    assert set(graph.impact("A")) == {"B", "C", "D"}
+    assert graph.requirements("E") == []
+
+
+def test_build_feature_graph_marks_shared_names():
+    graph = build_feature_graph(
+        [{"name": "MessageBus", "dependencies": ["Logger"], "required_for": ["Kernel"]}],
+        [{"name": "MessageBus", "dependencies": ["Clock"]}, {"name": "Cache", "dependencies": ["Redis (optional)"]}],
+    )
+    assert graph.kinds[graph.index["MessageBus"]] == "feature+component"
+    assert set(graph.requirements("Kernel")) == {"MessageBus", "Logger", "Clock"}
+    assert graph.requirements("Cache") == []
@@ -0,0 +1,99 @@
+"""
+Unit Tests for Feature Management
+Tests that toggles are checked against the feature dependency graph
+"""
+
+import sys
+import os
+import json
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+import feature_manager
+from feature_manager import FeatureRegistry
+
+BRIDGE_FEATURES = [
+    {"id": "common_1", "name": "Clock", "category": "Common", "enabled": True},
+    {"id": "common_2", "name": "Logger", "category": "Common", "enabled": True},
+    {"id": "common_3", "name": "MessageBus", "category": "Common", "enabled": True},
+    {"id": "infra_1", "name": "Kernel", "category": "Infrastructure", "enabled": True},
+    {"id": "indicator_3", "name": "RSI", "category": "Indicators", "enabled": True},
+]
+
+
+def _bridge_registry(monkeypatch, tmp_path):
+    """Registry fed by a stand-in nautilus_bridge, whose features carry no dependency lists"""
+    monkeypatch.setattr(feature_manager, "BRIDGE_AVAILABLE", True)
+    monkeypatch.setattr(feature_manager, "_get_all_features_real", lambda: BRIDGE_FEATURES, raising=False)
+    monkeypatch.setattr(
+        feature_manager, "_toggle_feature_real",
+        lambda feature_id, enabled: {"success": True, "feature_id": feature_id, "enabled": enabled},
+        raising=False,
+    )
+    return FeatureRegistry(
+        dependencies_path=str(tmp_path / "missing.json"),
+        overrides_path=str(tmp_path / "overrides.json"),
+    )
+
+
+def test_bridge_source_still_gets_component_edges(monkeypatch, tmp_path):
+    registry = _bridge_registry(monkeypatch, tmp_path)
+    assert registry.all()["total"] == len(BRIDGE_FEATURES)
+    assert registry.source == "bridge"
+    assert registry.graph().stats()["edges"] > 0
+    assert "Kernel" in registry.impact("common_3")["dependents"]
+
+
+def test_disabling_required_feature_is_refused(monkeypatch, tmp_path):
+    registry = _bridge_registry(monkeypatch, tmp_path)
+    result = registry.toggle("common_3", False)
+    assert result["success"] is False
+    assert "Kernel" in result["blocked_by"]
+    assert not os.path.exists(registry.overrides_path)
+
+    forced = registry.toggle("common_3", False, force=True)
+    assert forced["success"] is True
+    assert registry.get("common_3")["enabled"] is False
+
+
+def test_disabling_unused_feature_is_allowed(monkeypatch, tmp_path):
+    registry = _bridge_registry(monkeypatch, tmp_path)
+    result = registry.toggle("indicator_3", False)
+    assert result["success"] is True
+    assert result["blocked_by"] == []
+    with open(registry.overrides_path) as f:
+        assert json.load(f) == {"indicator_3": False}
+
+
+def test_enabling_needs_enabled_requirements(monkeypatch, tmp_path):
+    registry = _bridge_registry(monkeypatch, tmp_path)
+    registry.toggle("infra_1", False)
+    registry.toggle("common_3", False, force=True)
+    result = registry.toggle("infra_1", True)
+    assert result["success"] is False
+    assert result["blocked_by"] == ["MessageBus"]
+
+
+def test_file_source_uses_dependency_lists(monkeypatch, tmp_path):
+    monkeypatch.setattr(feature_manager, "BRIDGE_AVAILABLE", False)
+    dependencies = tmp_path / "dependencies.json"
+    dependencies.write_text(json.dumps({
+        "Data": {
+            "Bars": {"status": "available", "dependencies": ["Ticks"], "services": ["bar_service"]},
+            "Ticks": {"status": "available", "dependencies": [], "required_for": ["Orders"]},
+        },
+    }))
+    registry = FeatureRegistry(dependencies_path=str(dependencies), overrides_path=str(tmp_path / "o.json"))
+    assert registry.all()["total"] == 2
+    assert registry.source == "file"
+    assert set(registry.impact("data_ticks")["dependents"]) == {"Bars", "Orders"}
+    assert registry.toggle("data_ticks", False)["success"] is False
+
+
+def test_unknown_feature_is_not_toggled(monkeypatch, tmp_path):
+    registry = _bridge_registry(monkeypatch, tmp_path)
+    result = registry.toggle("no_such_feature", False)
+    assert result["success"] is False
+    assert "Unknown feature" in result["error"]
+    assert not os.path.exists(registry.overrides_path)
@@ -0,0 +1,115 @@
+"""
+Unit Tests for the HTTP Response Cache
+Tests ETags, 304 replies and cached bodies of ResponseCache
+"""
+
+import sys
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from http_cache import ResponseCache, _etag_matches
+
+
+def _app(cache, state):
+    app = FastAPI()
+
+    def build():
+        state["builds"] += 1
+        return {"value": state["value"]}
+
+    @app.get("/versioned")
+    async def versioned(request: Request):
+        return await cache.respond(request, build, version=state["version"])
+
+    @app.get("/timed")
+    async def timed(request: Request):
+        return await cache.respond(request, build, ttl=60)
+
+    return app
+
+
+def test_etag_matching_is_weak_and_list_aware():
+    assert _etag_matches('W/"abc"', '"abc"')
+    assert _etag_matches('"x", "abc"', 'W/"abc"')
+    assert _etag_matches("*", '"abc"')
+    assert not _etag_matches(None, '"abc"')
+    assert not _etag_matches('"abcd"', '"abc"')
+
+
+def test_versioned_etag_answers_304_without_building():
+    cache = ResponseCache()
+    state = {"builds": 0, "value": 1, "version": 7}
+    client = TestClient(_app(cache, state))
+
+    first = client.get("/versioned")
+    assert first.status_code == 200
+    assert first.json() == {"value": 1}
+    assert first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+
+    again = client.get("/versioned", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.headers["vary"] == first.headers["vary"] == "Accept"
+    assert state["builds"] == 1
+
+    # Another poller without the tag gets the cached body
+    assert client.get("/versioned").json() == {"value": 1}
+    assert state["builds"] == 1
+
+
+def test_new_version_rebuilds_and_changes_etag():
+    cache = ResponseCache()
+    state = {"builds": 0, "value": 1, "version": 1}
+    client = TestClient(_app(cache, state))
+    etag = client.get("/versioned").headers["etag"]
+
+    state.update(value=2, version=2)
+    changed = client.get("/versioned", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json() == {"value": 2}
+    assert changed.headers["etag"] != etag
+    assert state["builds"] == 2
+
+
+def test_unversioned_body_is_reused_within_ttl():
+    cache = ResponseCache()
+    state = {"builds": 0, "value": 1, "version": None}
+    client = TestClient(_app(cache, state))
+
+    first = client.get("/timed")
+    assert first.headers["cache-control"] == "private, max-age=60"
+    state["value"] = 2
+    second = client.get("/timed", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.headers["vary"] == "Accept"
+    assert state["builds"] == 1
+    assert cache.stats()["hits"] == 1
+
+    cache.invalidate("/timed")
+    assert client.get("/timed").json() == {"value": 2}
+
+
+def test_entries_are_keyed_by_query_and_bounded():
+    cache = ResponseCache(max_entries=2)
+    state = {"builds": 0, "value": 1, "version": 1}
+    client = TestClient(_app(cache, state))
+    for page in range(3):
+        client.get(f"/versioned?page={page}")
+    assert state["builds"] == 3
+    assert cache.stats()["entries"] == 2
+
+
+def test_bridge_status_is_not_frozen_by_the_cache():
+    from nautilus_fastapi_bridge import app
+
+    client = TestClient(app)
+    first = client.get("/api/nautilus/status")
+    assert first.status_code == 200
+    assert "etag" not in first.headers
+    assert client.get("/api/nautilus/status").json()["timestamp"] >= first.json()["timestamp"]
@@ -0,0 +1,142 @@
+"""
+Unit Tests for Database Population
+Tests that the parallel seeding tasks cover the requested row counts exactly
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+import populate_database as P
+from synthetic_data import SyntheticMarketData
+
+
+def _rows_per_table(data, tasks):
+    """Rows each task would COPY, generated exactly as _run_seed_task does"""
+    rows = {}
+    for task in tasks:
+        table = task[0]
+        if table == "activity":
+            chunk = data.activity_chunk(*task[1:])
+            tables = {name: chunk[name] for name in ("orders", "trades", "positions")}
+        elif table == "bars":
+            tables = {table: data.bar_chunk(task[1], task[2], P.BULK_BAR_INTERVAL)}
+        elif table == "quote_ticks":
+            tables = {table: data.quote_chunk(task[1], task[2], P.BULK_QUOTE_INTERVAL)}
+        else:
+            tables = {table: data.trade_tick_chunk(*task[1:])}
+        for name, arrow_table in tables.items():
+            rows[name] = rows.get(name, 0) + arrow_table.num_rows
+    return rows
+
+
+@pytest.mark.parametrize("counts, chunk_rows", [
+    ({"orders": 2500, "trades": 1200, "positions": 700, "bars": 900, "quote_ticks": 5003, "trade_ticks": 1999}, 1000),
+    ({"orders": 10, "trades": 30, "positions": 0, "bars": 0, "quote_ticks": 7, "trade_ticks": 0}, 4),
+    ({"orders": 0, "trades": 0, "positions": 15, "bars": 41, "quote_ticks": 0, "trade_ticks": 13}, 5),
+])
+def test_seeding_tasks_cover_counts(counts, chunk_rows):
+    data = SyntheticMarketData(seed=7, days=P.bulk_window_days(counts))
+    tasks = P.seeding_tasks(data, counts, chunk_rows)
+    rows = _rows_per_table(data, tasks)
+    assert {table: n for table, n in rows.items() if n} == {table: n for table, n in counts.items() if n}
+
+
+def test_trades_need_orders_in_the_same_run():
+    counts = {"orders": 0, "trades": 50, "positions": 0}
+    data = SyntheticMarketData(seed=7, days=30)
+    assert P.seeding_tasks(data, counts, 10) == []
+
+
+def test_tasks_are_deterministic_per_seed():
+    counts = {"orders": 300, "trades": 100, "positions": 50, "quote_ticks": 400}
+    first = SyntheticMarketData(seed=11, days=30)
+    second = SyntheticMarketData(seed=11, start=first.start, end=first.end)
+    tasks = P.seeding_tasks(first, counts, 100)
+    assert tasks == P.seeding_tasks(second, counts, 100)
+    activity = next(task for task in tasks if task[0] == "activity")
+    assert first.activity_chunk(*activity[1:])["orders"].equals(second.activity_chunk(*activity[1:])["orders"])
+
+
+def test_create_indexes_tolerates_already_rebuilt_indexes():
+    class Cursor:
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, statement):
+            self.statements.append(statement)
+
+    class Conn:
+        def commit(self):
+            pass
+
+    populator = P.DatabasePopulator.__new__(P.DatabasePopulator)
+    populator.cursor, populator.conn = Cursor(), Conn()
+    populator.create_indexes([
+        ("idx_orders_status", "CREATE INDEX idx_orders_status ON public.orders USING btree (status)"),
+        ("idx_bars_key", "CREATE UNIQUE INDEX idx_bars_key ON public.bars USING btree (instrument_id, ts)"),
+    ])
+    assert populator.cursor.statements == [
+        "CREATE INDEX IF NOT EXISTS idx_orders_status ON public.orders USING btree (status)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_bars_key ON public.bars USING btree (instrument_id, ts)",
+    ]
+
+
+class _FailingPool:
+    def __init__(self, events):
+        self.events = events
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.events.append("pool exited")
+        return False
+
+    def imap_unordered(self, fn, tasks):
+        raise RuntimeError("COPY failed")
+
+    def terminate(self):
+        self.events.append("terminate")
+
+    def join(self):
+        self.events.append("join")
+
+
+def _failing_load(monkeypatch, create_indexes):
+    events = []
+    monkeypatch.setattr(P.multiprocessing, "Pool", lambda *args, **kwargs: _FailingPool(events))
+    populator = P.DatabasePopulator.__new__(P.DatabasePopulator)
+    populator.settings = {}
+    populator.conn = type("Conn", (), {"rollback": lambda self: events.append("rollback")})()
+    indexes = [("idx_orders_status", "CREATE INDEX idx_orders_status ON public.orders USING btree (status)")]
+    monkeypatch.setattr(populator, "secondary_indexes", lambda tables: list(indexes))
+    monkeypatch.setattr(populator, "drop_indexes", lambda indexes: events.append("drop"))
+    monkeypatch.setattr(populator, "create_indexes", lambda indexes: create_indexes(events, indexes))
+    return populator, events
+
+
+def test_failed_load_restores_indexes_after_the_pool_exits(monkeypatch):
+    def create_indexes(events, indexes):
+        events.append(("create", [name for name, _ in indexes]))
+
+    populator, events = _failing_load(monkeypatch, create_indexes)
+    with pytest.raises(RuntimeError, match="COPY failed"):
+        populator.parallel_populate({"orders": 10, "trades": 0, "positions": 0}, workers=2)
+    assert events == ["drop", "terminate", "join", "pool exited", "rollback", ("create", ["idx_orders_status"])]
+
+
+def test_failed_restore_does_not_hide_the_load_error(monkeypatch, capsys):
+    def create_indexes(events, indexes):
+        raise RuntimeError("lock timeout")
+
+    populator, _ = _failing_load(monkeypatch, create_indexes)
+    with pytest.raises(RuntimeError, match="COPY failed"):
+        populator.parallel_populate({"orders": 10, "trades": 0, "positions": 0}, workers=2)
+    output = capsys.readouterr().out
+    assert "Could not restore 1 indexes (lock timeout)" in output
+    assert "CREATE INDEX idx_orders_status ON public.orders USING btree (status);" in output
@@ -0,0 +1,61 @@
+"""
+Unit Tests for Redis Bulk Delete
+Tests pattern deletes, the job index used for listing and cross-process status
+"""
+
+import sys
+import os
+
+import fakeredis
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+import redis_bulk_delete
+from redis_bulk_delete import JOB_INDEX_KEY, RedisBulkDeleter
+
+
+def _run(deleter, pattern, **kwargs):
+    status = deleter.start(pattern, max_keys_per_sec=0, **kwargs)
+    deleter._jobs[status["id"]]._thread.join(5)
+    return deleter.status(status["id"])
+
+
+def test_deletes_matching_keys_and_counts_what_scan_returned():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    for i in range(120):
+        client.set(f"cache:{i}", i)
+    client.set("keep", 1)
+    status = _run(RedisBulkDeleter(lambda: client), "cache:*", batch_size=25)
+    assert status["state"] == "completed"
+    assert status["deleted"] == status["matched"] == status["scanned"] == 120
+    assert 0 < status["progress_estimate"] <= 1.0
+    assert client.keys("cache:*") == []
+    assert client.get("keep") == "1"
+
+
+def test_other_processes_list_jobs_from_the_index(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    first = _run(RedisBulkDeleter(lambda: client), "a:*", dry_run=True)
+    second = _run(RedisBulkDeleter(lambda: client), "b:*", dry_run=True)
+
+    # Listing reads the index, never the keyspace
+    monkeypatch.setattr(client, "scan_iter", None)
+    other = RedisBulkDeleter(lambda: client)
+    assert [job["id"] for job in other.list()] == [second["id"], first["id"]]
+    assert other.status(first["id"])["pattern"] == "a:*"
+    assert other.status("index") is None
+
+    # Expired status keys drop out of the index
+    client.delete(f"{redis_bulk_delete.JOB_KEY_PREFIX}{first['id']}")
+    assert [job["id"] for job in other.list()] == [second["id"]]
+    assert client.zrange(JOB_INDEX_KEY, 0, -1) == [second["id"]]
+
+
+def test_index_is_capped(monkeypatch):
+    monkeypatch.setattr(redis_bulk_delete, "MAX_FINISHED_JOBS", 3)
+    client = fakeredis.FakeRedis(decode_responses=True)
+    deleter = RedisBulkDeleter(lambda: client)
+    for _ in range(5):
+        _run(deleter, "x:*", dry_run=True)
+    assert client.zcard(JOB_INDEX_KEY) == 3
@@ -0,0 +1,48 @@
+"""
+Unit Tests for the Redis Memory Analyzer
+Tests that regrouping only discards the cached report when the grouping changes
+"""
+
+import sys
+import os
+import time
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from redis_memory_analyzer import RedisMemoryAnalyzer
+
+
+def _analyzer():
+    analyzer = RedisMemoryAnalyzer(client_factory=lambda: None, segments=2, separator=":")
+    analyzer._report = {"analyzed_at_epoch": time.time(), "grouping": {"segments": 2, "separator": ":"}}
+    return analyzer
+
+
+def test_same_grouping_keeps_the_cached_report():
+    analyzer = _analyzer()
+    report = analyzer._report
+    assert analyzer.configure(2, ":") is False
+    assert analyzer.configure(None, None) is False
+    assert analyzer._report is report
+    assert analyzer.get_report()["status"] == "ready"
+    assert not analyzer.refreshing
+
+
+def test_new_grouping_discards_the_report():
+    analyzer = _analyzer()
+    assert analyzer.configure(3) is True
+    assert analyzer._report is None
+    assert (analyzer.segments, analyzer.separator) == (3, ":")
+    assert analyzer.configure(3, "/") is True
+    assert analyzer.configure(0, "/") is True
+    assert analyzer.segments == 1
+
+
+def test_report_from_an_older_grouping_is_dropped(monkeypatch):
+    analyzer = _analyzer()
+    analyzer._report = None
+    monkeypatch.setattr(analyzer, "analyze", lambda: {"grouping": {"segments": 2, "separator": ":"}})
+    analyzer.configure(3)
+    analyzer._refresh()
+    assert analyzer._report is None
@@ -0,0 +1,111 @@
+"""
+Unit Tests for Synthetic Market Data
+Tests determinism per seed and chunk, and the order / trade / position linkage
+"""
+
+import sys
+import os
+from collections import defaultdict
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from synthetic_data import SyntheticMarketData
+
+
+def _data(seed=5, **kwargs):
+    # Fixed end so two instances cover the same window
+    first = SyntheticMarketData(seed=seed, days=10, **kwargs)
+    return first, SyntheticMarketData(seed=seed, start=first.start, end=first.end, **kwargs)
+
+
+def test_same_seed_same_data():
+    a, b = _data()
+    assert pa.concat_tables(a.quote_ticks(500, chunk_rows=100)).equals(pa.concat_tables(b.quote_ticks(500, chunk_rows=100)))
+    assert pa.concat_tables(a.bars(120)).equals(pa.concat_tables(b.bars(120)))
+    assert pa.concat_tables(a.trade_ticks(300)).equals(pa.concat_tables(b.trade_ticks(300)))
+    for x, y in zip(a.trading_activity(200, 150, 30, chunk_rows=64), b.trading_activity(200, 150, 30, chunk_rows=64)):
+        assert all(x[name].equals(y[name]) for name in ("orders", "trades", "positions"))
+
+
+def test_different_seed_different_prices():
+    a, _ = _data(seed=1)
+    b, _ = _data(seed=2)
+    assert a.mid_at(np.array([0]), np.array([a.end_us]))[0] != b.mid_at(np.array([0]), np.array([b.end_us]))[0]
+
+
+def test_chunks_regenerate_independently():
+    data, _ = _data()
+    k, first, n = data.tick_plan("quotes", 1000, 1)[0]
+    specs = data.chunks(first, n, 1, 120)
+    assert sum(last - start for _, start, last in specs) == n
+    whole = pa.concat_tables(data.quote_chunk(k, spec, 1) for spec in specs)
+    # Any single chunk can be rebuilt on its own, e.g. by another worker
+    again = data.quote_chunk(k, specs[1], 1)
+    assert again.equals(whole.slice(specs[1][1] - first, specs[1][2] - specs[1][1]))
+    timestamps = whole.column("timestamp").to_pylist()
+    assert timestamps == sorted(timestamps) and len(set(timestamps)) == len(timestamps)
+
+
+def test_quotes_and_bars_are_consistent():
+    data, _ = _data()
+    quotes = pa.concat_tables(data.quote_ticks(400))
+    assert all(ask > bid for bid, ask in zip(quotes.column("bid_price").to_pylist(), quotes.column("ask_price").to_pylist()))
+
+    bars = next(data.bars(50, interval=60)).to_pylist()
+    for bar, following in zip(bars, bars[1:]):
+        assert bar["close"] == following["open"]
+    for bar in bars:
+        assert bar["low"] <= min(bar["open"], bar["close"]) <= max(bar["open"], bar["close"]) <= bar["high"]
+
+
+def test_activity_counts_and_ids_across_chunks():
+    data, _ = _data()
+    chunks = list(data.trading_activity(1000, 700, 90, chunk_rows=128))
+    orders = [row for chunk in chunks for row in chunk["orders"].to_pylist()]
+    trades = [row for chunk in chunks for row in chunk["trades"].to_pylist()]
+    positions = [row for chunk in chunks for row in chunk["positions"].to_pylist()]
+    assert (len(orders), len(trades), len(positions)) == (1000, 700, 90)
+    assert len({o["order_id"] for o in orders}) == 1000
+    assert len({t["trade_id"] for t in trades}) == 700
+    assert len({p["position_id"] for p in positions}) == 90
+
+
+@pytest.mark.parametrize("index", [0, 3])
+def test_trades_link_to_orders_of_their_chunk(index):
+    data, _ = _data()
+    chunk = data.activity_chunk(index, 4, 400, 300, 40)
+    orders = {o["order_id"]: o for o in chunk["orders"].to_pylist()}
+    fills = defaultdict(float)
+    for trade in chunk["trades"].to_pylist():
+        order = orders[trade["order_id"]]
+        assert trade["instrument_id"] == order["instrument_id"]
+        assert trade["side"] == order["side"]
+        assert trade["executed_at"] >= order["created_at"]
+        assert float(trade["price"]) == pytest.approx(float(order["avg_px"]))
+        fills[trade["order_id"]] += trade["quantity"]
+
+    for order_id, order in orders.items():
+        if order_id in fills:
+            assert order["status"] in ("FILLED", "PENDING")
+            assert fills[order_id] == pytest.approx(order["filled_qty"], rel=1e-6, abs=1e-7)
+        else:
+            assert order["status"] != "FILLED"
+            assert order["filled_qty"] == 0
+
+
+def test_positions_are_open_or_closed_consistently():
+    data, _ = _data()
+    positions = data.activity_chunk(0, 1, 300, 250, 60)["positions"].to_pylist()
+    for position in positions:
+        if position["status"] == "CLOSED":
+            assert position["side"] == "FLAT"
+            assert position["quantity"] == 0
+            assert position["closed_at"] is not None and position["closed_at"] >= position["opened_at"]
+            assert float(position["unrealized_pnl"]) == 0
+        else:
+            assert position["closed_at"] is None
@@ -0,0 +1,131 @@
+"""
+Unit Tests for the Trading Store
+Tests indexed filtering, cursor pagination and sorting of IndexedCollection
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from trading_store import IndexedCollection, TradingStore, to_ns
+
+
+def _orders(n=25):
+    return [
+        {
+            "id": f"O-{i:03d}",
+            "strategy_id": f"strategy-{i % 3}",
+            "status": "FILLED" if i % 2 else "OPEN",
+            "created_at": f"2024-01-01T00:{i:02d}:00",
+            "price": None if i % 5 == 0 else float(100 - i),
+        }
+        for i in range(n)
+    ]
+
+
+def _collection(rows=None):
+    collection = IndexedCollection("orders", "created_at", ("strategy_id", "status"))
+    collection.upsert_many(_orders() if rows is None else rows)
+    return collection
+
+
+def _all_pages(collection, **kwargs):
+    rows, cursor = [], None
+    while True:
+        page = collection.query(cursor=cursor, **kwargs)
+        rows.extend(page["rows"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            assert cursor is None
+            return rows
+
+
+def test_to_ns_accepts_common_timestamp_forms():
+    assert to_ns("1970-01-01T00:00:01Z") == 1_000_000_000
+    assert to_ns(1.5) == 1_500_000_000
+    assert to_ns("42") == 42
+    with pytest.raises(ValueError):
+        to_ns("yesterday")
+
+
+def test_time_pages_cover_every_row_once_newest_first():
+    rows = _all_pages(_collection(), limit=4)
+    assert [row["id"] for row in rows] == [f"O-{i:03d}" for i in range(24, -1, -1)]
+
+
+def test_filtered_pages_and_total():
+    collection = _collection()
+    first = collection.query({"strategy_id": "strategy-1"}, limit=3, sort="created_at")
+    assert first["total"] == 8
+    rows = _all_pages(collection, filters={"strategy_id": "strategy-1", "status": ["OPEN"]}, limit=2)
+    assert {row["id"] for row in rows} == {f"O-{i:03d}" for i in range(25) if i % 3 == 1 and i % 2 == 0}
+
+
+def test_time_window_is_half_open():
+    page = _collection().query(start="2024-01-01T00:05:00", end="2024-01-01T00:08:00", sort="created_at")
+    assert [row["id"] for row in page["rows"]] == ["O-005", "O-006", "O-007"]
+
+
+@pytest.mark.parametrize("sort", ["price", "-price"])
+def test_missing_values_sort_last_in_both_directions(sort):
+    rows = _all_pages(_collection(), sort=sort, limit=4)
+    assert len(rows) == 25
+    prices = [row["price"] for row in rows]
+    present = [p for p in prices if p is not None]
+    assert prices[:len(present)] == sorted(present, reverse=sort.startswith("-"))
+    assert all(p is None for p in prices[len(present):])
+
+
+def test_unknown_sort_field_is_rejected():
+    with pytest.raises(ValueError, match="Cannot sort orders on 'nope'"):
+        _collection().query(sort="-nope")
+
+
+def test_unknown_filter_and_mismatched_cursor_are_rejected():
+    collection = _collection()
+    with pytest.raises(ValueError):
+        collection.query({"price": 10.0})
+    cursor = collection.query(limit=1)["next_cursor"]
+    with pytest.raises(ValueError):
+        collection.query(sort="price", cursor=cursor)
+    with pytest.raises(ValueError):
+        collection.query(cursor="not-a-cursor")
+
+
+def test_upsert_moves_row_between_indexes():
+    collection = _collection()
+    version = collection.version
+    collection.upsert({**collection.get("O-000"), "status": "CANCELED"})
+    assert collection.version == version + 1
+    assert [row["id"] for row in collection.query({"status": "CANCELED"})["rows"]] == ["O-000"]
+    assert "O-000" not in {row["id"] for row in _all_pages(collection, filters={"status": "OPEN"})}
+
+
+def test_bulk_upsert_mixing_new_and_updated_rows():
+    collection = IndexedCollection("rows", "t", ("s",))
+    collection.upsert_many([{"id": "a", "t": 100, "s": "x"}, {"id": "b", "t": 200, "s": "x"}])
+    collection.upsert_many([
+        {"id": "d", "t": 50, "s": "x"},
+        {"id": "e", "t": 10, "s": "x"},
+        {"id": "b", "t": 400, "s": "y"},
+        {"id": "e", "t": 300, "s": "x"},
+    ])
+    assert len(collection) == 4
+    assert collection._by_time == [(50, "d"), (100, "a"), (300, "e"), (400, "b")]
+    assert [row["id"] for row in collection.query()["rows"]] == ["b", "e", "a", "d"]
+    assert [row["id"] for row in collection.query({"s": "x"})["rows"]] == ["e", "a", "d"]
+    assert [row["id"] for row in collection.query({"s": "y"})["rows"]] == ["b"]
+
+
+def test_trades_inherit_strategy_from_order():
+    store = TradingStore()
+    store.load(
+        orders=[{"id": "O-1", "strategy_id": "strategy-001", "created_at": "2024-01-01T00:00:00"}],
+        positions=[],
+        trades=[{"id": "T-1", "order_id": "O-1", "timestamp": "2024-01-01T00:00:01"}],
+    )
+    assert store.trades.query({"strategy_id": "strategy-001"})["rows"][0]["id"] == "T-1"
@@ -0,0 +1,47 @@
+"""
+Unit Tests for the Wire Format
+Tests that JSON output stays parseable by JSON.parse with and without orjson
+"""
+
+import sys
+import os
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+import wire_format
+from wire_format import dumps_json
+
+PAYLOAD = {
+    "pnl": float("nan"),
+    "limits": [float("inf"), -float("inf"), 1.5],
+    "nested": {"sharpe": (float("nan"), 2)},
+    "fee": Decimal("NaN"),
+    "series": np.array([1.0, np.nan]),
+}
+EXPECTED = {"pnl": None, "limits": [None, None, 1.5], "nested": {"sharpe": [None, 2]}, "fee": None,
+            "series": [1.0, None]}
+
+
+def _strict_loads(data):
+    # JSON.parse rejects NaN / Infinity; so does this
+    def reject(token):
+        raise ValueError(f"Not JSON: {token}")
+    return json.loads(data, parse_constant=reject)
+
+
+@pytest.mark.parametrize("orjson", [True, False])
+def test_non_finite_floats_become_null(monkeypatch, orjson):
+    if orjson and not wire_format.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(wire_format, "ORJSON_AVAILABLE", orjson)
+    assert _strict_loads(dumps_json(PAYLOAD)) == EXPECTED
+
+
+def test_stdlib_fallback_for_big_integers():
+    assert _strict_loads(dumps_json({"n": 2 ** 70, "x": float("nan")})) == {"n": 2 ** 70, "x": None}
@@ -0,0 +1,132 @@
+"""
+Unit Tests for WebSocket Topics
+Tests the snapshot-then-delta protocol of TopicHub
+"""
+
+import sys
+import os
+
+# Add server directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../server'))
+
+from ws_topics import TopicHub, diff
+
+
+class FakeBroadcaster:
+    def encode(self, message, wire_format):
+        return message
+
+
+class FakeClient:
+    """Builds queued frames immediately, like a sender task with nothing else to do"""
+
+    def __init__(self, client_id):
+        self.id = client_id
+        self.wire_format = "json"
+        self.frames = []
+
+    def offer(self, builder, key=None, coalesce=True):
+        frame = builder()
+        if frame is not None:
+            self.frames.append(frame)
+
+
+def apply(state, ops):
+    """Minimal JSON Patch apply for the add / remove / replace ops diff() emits"""
+    for op in ops:
+        if op["path"] == "":
+            state = op["value"]
+            continue
+        *parents, last = [t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]]
+        target = state
+        for token in parents:
+            target = target[token]
+        if op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return state
+
+
+def test_diff_touches_changed_rows_only():
+    ops = diff({"a": {"qty": 1}, "b": {"qty": 2}}, {"a": {"qty": 1}, "b": {"qty": 3}, "c/d": {"qty": 4}})
+    assert ops == [
+        {"op": "replace", "path": "/b/qty", "value": 3},
+        {"op": "add", "path": "/c~1d", "value": {"qty": 4}},
+    ]
+
+
+def test_snapshot_then_deltas():
+    hub = TopicHub(FakeBroadcaster())
+    hub.publish("orders", {"o1": {"status": "OPEN"}})
+    client = FakeClient(1)
+    hub.subscribe(client, "orders")
+
+    snapshot = client.frames[-1]
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["version"] == 1
+    state = snapshot["data"]
+
+    hub.publish("orders", {"o1": {"status": "FILLED"}, "o2": {"status": "OPEN"}})
+    hub.publish("orders", {"o2": {"status": "OPEN"}})
+    for frame in client.frames[1:]:
+        assert frame["type"] == "delta"
+        state = apply(state, frame["ops"])
+    assert client.frames[-1]["version"] == 3
+    assert state == {"o2": {"status": "OPEN"}}
+
+
+def test_unchanged_publish_sends_nothing():
+    hub = TopicHub(FakeBroadcaster())
+    client = FakeClient(1)
+    hub.publish("strategies", {"s1": {"status": "RUNNING"}})
+    hub.subscribe(client, "strategies")
+    assert hub.publish("strategies", {"s1": {"status": "RUNNING"}}) == 1
+    assert len(client.frames) == 1
+
+
+def test_subscribe_to_empty_topic_gets_empty_snapshot():
+    hub = TopicHub(FakeBroadcaster())
+    client = FakeClient(1)
+    hub.subscribe(client, "orders:strategy-003")
+    assert client.frames == [{"type": "snapshot", "topic": "orders:strategy-003", "version": 1, "data": {}}]
+
+    hub.publish("orders:strategy-003", {"o9": {"status": "OPEN"}})
+    assert client.frames[-1]["type"] == "delta"
+    assert client.frames[-1]["ops"] == [{"op": "add", "path": "/o9", "value": {"status": "OPEN"}}]
+
+
+def test_explicit_ack_keeps_base_until_acked():
+    hub = TopicHub(FakeBroadcaster())
+    client = FakeClient(1)
+    hub.publish("positions", {"p1": {"qty": 1}})
+    hub.handle(client, {"action": "subscribe", "topics": ["positions"], "ack": True})
+    hub.handle(client, {"action": "ack", "topic": "positions", "version": 1})
+    hub.publish("positions", {"p1": {"qty": 2}})
+    hub.publish("positions", {"p1": {"qty": 3}})
+    # Only the snapshot is acked, so both deltas target it
+    assert [f["base_version"] for f in client.frames[1:]] == [1, 1]
+
+    hub.handle(client, {"action": "ack", "topic": "positions", "version": 3})
+    hub.publish("positions", {"p1": {"qty": 4}})
+    assert client.frames[-1]["base_version"] == 3
+
+
+def test_resync_and_aged_out_base_send_snapshot():
+    hub = TopicHub(FakeBroadcaster(), history_versions=2)
+    client = FakeClient(1)
+    hub.publish("trades", {})
+    hub.handle(client, {"action": "subscribe", "topics": ["trades"], "ack": True})
+    hub.handle(client, {"action": "ack", "topic": "trades", "version": 1})
+    for qty in range(1, 4):
+        hub.publish("trades", {"t1": {"qty": qty}})
+    assert client.frames[-1]["type"] == "snapshot"
+
+    hub.handle(client, {"action": "resync", "topic": "trades"})
+    assert client.frames[-1] == {"type": "snapshot", "topic": "trades", "version": 4, "data": {"t1": {"qty": 3}}}
+
+
+def test_invalid_topics_are_reported():
+    hub = TopicHub(FakeBroadcaster())
+    reply = hub.handle(FakeClient(1), {"action": "subscribe", "topics": ["orders:strategy-001", "bogus", 3]})
+    assert reply == {"type": "subscribed", "topics": ["orders:strategy-001"], "invalid": ["bogus", 3]}